@@ -0,0 +1,95 @@
+"""Micro-benchmark of GPU utilisation backends: in-process NVML vs GPUtil (forks nvidia-smi) for NVIDIA, and
+amdgpu sysfs (kept-open files) vs pyadl (re-enumerates devices) for AMD
+
+usage: python -m benchmarks.gpu [--iterations 200] [--output results.json]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Callable
+
+import GPUtil  # type: ignore
+
+from vu1_monitor.metrics.amdgpu import AMDGPUBackend
+from vu1_monitor.metrics.nvml import NVMLBackend, NVMLError
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict:
+    """time `iterations` calls of func, returning per-call statistics (milliseconds)"""
+    timings = []
+    cpu_started = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    cpu_time = (time.process_time() - cpu_started) * 1000
+    return {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": statistics.median(timings),
+        "max_ms": max(timings),
+        "cpu_ms_per_call": cpu_time / iterations,
+    }
+
+
+def gputil_sample() -> float:
+    """the pre-NVML sampling path"""
+    return statistics.fmean(device.load * 100 for device in GPUtil.getGPUs())
+
+
+def pyadl_sample() -> float:
+    """the pre-sysfs AMD sampling path"""
+    from pyadl import ADLManager  # type: ignore
+
+    return statistics.fmean(device.getCurrentUsage() for device in ADLManager.getInstance().getDevices())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results: dict[str, dict | str] = {}
+
+    try:
+        backend = NVMLBackend()
+        results["nvml"] = measure(backend.utilisation, args.iterations)
+        backend.close()
+    except (OSError, NVMLError) as e:
+        results["nvml"] = f"unavailable: {e}"
+
+    if GPUtil.getGPUs():
+        results["gputil"] = measure(gputil_sample, args.iterations)
+    else:
+        results["gputil"] = "unavailable: no devices reported by nvidia-smi"
+
+    try:
+        amdgpu = AMDGPUBackend()
+        results["amdgpu"] = measure(amdgpu.utilisation, args.iterations)
+        amdgpu.close()
+    except OSError as e:
+        results["amdgpu"] = f"unavailable: {e}"
+
+    try:
+        results["pyadl"] = measure(pyadl_sample, args.iterations)
+    except Exception as e:
+        results["pyadl"] = f"unavailable: {e}"
+
+    for name, result in results.items():
+        if isinstance(result, dict):
+            print(
+                f"{name:>8}: mean {result['mean_ms']:.3f}ms, p50 {result['p50_ms']:.3f}ms, cpu {result['cpu_ms_per_call']:.3f}ms/call"
+            )
+        else:
+            print(f"{name:>8}: {result}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Micro-benchmark of system metric samplers: /proc read through kept-open files vs psutil
+
+Per-core CPU statistics are also measured against synthetic /proc/stat files with many CPUs, to
+show how the cost of a sample grows with the number of cores.
+
+usage: python -m benchmarks.procfs [--iterations 2000] [--cores 64,1024,4096] [--output results.json]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import psutil
+
+from vu1_monitor.metrics.cores import CoreCPU
+from vu1_monitor.metrics.procfs import (
+    CgroupCPU,
+    CgroupMemory,
+    ProcMeminfo,
+    ProcNetDev,
+    ProcStat,
+    ProcStatCores,
+    cgroup_dir,
+)
+from vu1_monitor.models.models import CPUStatistic
+
+
+def measure(func: Callable[[], object], iterations: int) -> dict:
+    """time `iterations` calls of func, returning per-call statistics (microseconds)"""
+    timings = []
+    cpu_started = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    cpu_time = (time.process_time() - cpu_started) * 1_000_000
+    return {
+        "iterations": iterations,
+        "mean_us": statistics.fmean(timings),
+        "p50_us": statistics.median(timings),
+        "max_us": max(timings),
+        "cpu_us_per_call": cpu_time / iterations,
+    }
+
+
+def fake_stat(root: Path, cores: int) -> None:
+    """write a /proc/stat with `cores` CPUs under root"""
+    (root / "proc").mkdir(parents=True, exist_ok=True)
+    lines = [f"cpu{cpu} {cpu * 7} 0 {cpu * 3} {cpu * 90} 12 0 5 0 0 0" for cpu in range(cores)]
+    text = "cpu  1 0 1 1 0 0 0 0 0 0\n" + "\n".join(lines) + "\nintr 1 2 3\nctxt 100\n"
+    (root / "proc" / "stat").write_text(text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--cores", default="64,1024,4096", help="CPU counts of the synthetic per-core runs")
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    if not sys.platform.startswith("linux"):
+        sys.exit("the procfs sampler is Linux only")
+
+    samplers: dict[str, dict[str, Callable[[], object]]] = {
+        "cpu": {"procfs": ProcStat().cpu_percent, "psutil": psutil.cpu_percent},
+        "memory": {"procfs": ProcMeminfo().memory_percent, "psutil": psutil.virtual_memory},
+        "network": {"procfs": ProcNetDev().counters, "psutil": lambda: psutil.net_io_counters(pernic=True)},
+    }
+    cgroup = cgroup_dir()
+    if cgroup is not None:
+        samplers["cpu"]["cgroup"] = CgroupCPU(cgroup).cpu_percent
+        samplers["memory"]["cgroup"] = CgroupMemory(cgroup).memory_percent
+
+    samplers["cpu_cores"] = {
+        "procfs": CoreCPU(CPUStatistic.P90, source=ProcStatCores()).cpu_percent,
+        "psutil": CoreCPU(CPUStatistic.P90).cpu_percent,
+    }
+
+    results = {
+        metric: {name: measure(func, args.iterations) for name, func in backends.items()}
+        for metric, backends in samplers.items()
+    }
+
+    for metric, backends in results.items():
+        for name, result in backends.items():
+            print(
+                f"{metric:>8} {name:>7}: mean {result['mean_us']:.1f}us, p50 {result['p50_us']:.1f}us, "
+                f"cpu {result['cpu_us_per_call']:.1f}us/call"
+            )
+        speedup = backends["psutil"]["cpu_us_per_call"] / backends["procfs"]["cpu_us_per_call"]
+        print(f"{metric:>8} procfs uses {speedup:.1f}x less CPU per sample than psutil")
+
+    results["synthetic_cores"] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for cores in (int(count) for count in args.cores.split(",")):
+            fake_stat(Path(directory), cores)
+            cpu = CoreCPU(CPUStatistic.P90, source=ProcStatCores(Path(directory)))
+            result = measure(cpu.cpu_percent, max(1, args.iterations // 10))
+            results["synthetic_cores"][str(cores)] = result
+            print(
+                f"{cores:>6} cores: mean {result['mean_us']:.1f}us, "
+                f"{result['cpu_us_per_call'] * 1000 / cores:.0f}ns/core per p90 sample"
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
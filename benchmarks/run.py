@@ -0,0 +1,204 @@
+"""End-to-end benchmarks of the dial update path against a stand-in VU Server
+
+Scenarios:
+    client  - drives VU1Client.set_dial as fast as the concurrency limit allows
+    monitor - runs start_monitoring for a fixed duration at a fixed interval, on live metrics or
+              replaying a recording (--replay, at --speed times real time) for repeatable runs
+
+usage: python -m benchmarks.run [--scenario all] [--latency 0.002] [--output bench_output.json]
+       python -m benchmarks.run --baseline previous.json   # exits 1 on regression
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from benchmarks.server import ServerConfig, running_server
+from vu1_monitor.config import settings
+from vu1_monitor.dials import DialWriter, VU1Client
+from vu1_monitor.handlers import dials as dial_handlers
+from vu1_monitor.models import DialType
+
+MONITORED = ["cpu", "memory", "network"]
+
+# metric path -> True when higher is better
+TRACKED = {
+    ("client", "updates_per_sec"): True,
+    ("client", "latency_ms", "p95"): False,
+    ("monitor", "write_latency_ms", "p95"): False,
+    ("monitor", "cpu_seconds"): False,
+}
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99 of samples (milliseconds)"""
+    if len(samples) < 2:
+        return {"p50": samples[0] if samples else 0.0, "p95": 0.0, "p99": 0.0}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def server_stats(port: int) -> dict:
+    """connection and request counters of the stand-in server (the probe's own connection excluded)"""
+    stats = httpx.get(f"http://127.0.0.1:{port}/_stats").json()
+    stats["connections"] -= 1
+    return stats
+
+
+async def bench_client(port: int, updates: int, concurrency: int) -> dict:
+    """push `updates` dial writes through one VU1Client"""
+    latencies: list[float] = []
+    limit = asyncio.Semaphore(concurrency)
+    before = server_stats(port)
+
+    async with VU1Client("127.0.0.1", port, settings.server.key) as client:
+        dials = list(client.dials)
+
+        async def update(index: int) -> None:
+            async with limit:
+                started = time.perf_counter()
+                await client.set_dial(dials[index % len(dials)], index % 100, force=True)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        cpu_started, started = time.process_time(), time.perf_counter()
+        results = await asyncio.gather(*(update(index) for index in range(updates)), return_exceptions=True)
+        wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+
+    after = server_stats(port)
+    errors = sum(isinstance(result, BaseException) for result in results)
+    return {
+        "updates": updates - errors,
+        "errors": errors,
+        "updates_per_sec": (updates - errors) / wall,
+        "latency_ms": percentiles(latencies),
+        "connections_opened": after["connections"] - before["connections"],
+        "cpu_seconds": cpu,
+    }
+
+
+async def bench_monitor(
+    port: int, duration: float, interval: float, replay: Path | None = None, speed: float = 1.0
+) -> dict:
+    """run start_monitoring for `duration` seconds (or to the end of a replay), timing each dial write and its lag"""
+    write_latencies: list[float] = []
+    writers: list[DialWriter] = []
+
+    class TimedWriter(DialWriter):
+        def __init__(self, send: Callable[[DialType, int], Awaitable[Any]], *args: Any, **kwargs: Any) -> None:
+            async def timed_send(dial: DialType, value: int) -> Any:
+                started = time.perf_counter()
+                try:
+                    return await send(dial, value)
+                finally:
+                    write_latencies.append((time.perf_counter() - started) * 1000)
+
+            super().__init__(timed_send, *args, **kwargs)
+            writers.append(self)
+
+    for dial in MONITORED:
+        settings.set(f"{dial}.interval", interval)
+    before = server_stats(port)
+    dial_handlers.DialWriter = TimedWriter  # type: ignore[misc]
+    try:
+        cpu_started, started = time.process_time(), time.perf_counter()
+        task = asyncio.create_task(
+            dial_handlers.start_monitoring(1, True, False, True, True, False, replay=replay, speed=speed)
+        )
+        await asyncio.wait({task}, timeout=duration)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        cpu, duration = time.process_time() - cpu_started, time.perf_counter() - started
+    finally:
+        dial_handlers.DialWriter = DialWriter  # type: ignore[misc]
+
+    after = server_stats(port)
+    updates = sum(after["updates"].values()) - sum(before["updates"].values())
+    mailboxes = [stats for writer in writers for stats in writer.stats.values()]
+    return {
+        "writes": len(write_latencies),
+        "updates": updates,
+        "updates_per_sec": updates / duration,
+        "write_latency_ms": percentiles(write_latencies),
+        "write_lag_ms": max((stats.lag * 1000 for stats in mailboxes), default=0.0),
+        "coalesced": sum(stats.coalesced for stats in mailboxes),
+        "dropped": sum(stats.dropped for stats in mailboxes),
+        "connections_opened": after["connections"] - before["connections"],
+        "cpu_seconds": cpu,
+        "cpu_percent": cpu / duration * 100,
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """tracked metrics that are worse than the baseline by more than `tolerance` (fraction)"""
+    found = []
+    for path, higher_is_better in TRACKED.items():
+        current_node: Any = results
+        previous_node: Any = baseline
+        try:
+            for key in path:
+                current_node, previous_node = current_node[key], previous_node[key]
+        except KeyError:
+            continue
+        current, previous = float(current_node), float(previous_node)
+        change = (current - previous) / previous if previous else 0.0
+        if (-change if higher_is_better else change) > tolerance:
+            found.append(f"{'.'.join(path)}: {previous:.3f} -> {current:.3f} ({change:+.0%})")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["client", "monitor", "all"], default="all")
+    parser.add_argument("--latency", type=float, default=0.002, help="server latency per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random server latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--dials", type=int, default=4, help="number of dials the server reports")
+    parser.add_argument("--updates", type=int, default=2000, help="client scenario: number of dial writes")
+    parser.add_argument("--concurrency", type=int, default=4, help="client scenario: in-flight writes")
+    parser.add_argument("--duration", type=float, default=10.0, help="monitor scenario: run time (seconds)")
+    parser.add_argument("--interval", type=float, default=0.1, help="monitor scenario: dial interval (seconds)")
+    parser.add_argument("--replay", type=Path, default=None, help="monitor scenario: recording to replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="monitor scenario: replay speed")
+    parser.add_argument("--output", default="bench_output.json", help="results file (JSON)")
+    parser.add_argument("--baseline", default=None, help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression (fraction)")
+    args = parser.parse_args()
+
+    logging.getLogger(settings.name).setLevel(logging.WARNING)
+    settings.set("server.cache.enabled", False)
+    config = ServerConfig(args.latency, args.jitter, args.error_rate, args.dials)
+
+    results: dict[str, Any] = {"server": config.__dict__}
+    with running_server(config) as port:
+        settings.set("server.hostname", "127.0.0.1")
+        settings.set("server.port", port)
+        if args.scenario in ("client", "all"):
+            results["client"] = asyncio.run(bench_client(port, args.updates, args.concurrency))
+        if args.scenario in ("monitor", "all"):
+            results["monitor"] = asyncio.run(
+                bench_monitor(port, args.duration, args.interval, args.replay, args.speed)
+            )
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            found = regressions(results, json.load(file), args.tolerance)
+        for regression in found:
+            print(f"regression: {regression}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
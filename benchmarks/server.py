@@ -0,0 +1,150 @@
+"""A stand-in VU Server for benchmarks
+
+Implements the subset of the VU Server API used by vu1-monitor over keep-alive HTTP/1.1, with
+configurable per-request latency, error rate and dial count. Run it in its own process with
+`running_server` so its CPU time is not attributed to the monitor being measured.
+"""
+
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, TypedDict
+from urllib.parse import parse_qs, urlsplit
+
+DIAL_NAMES = ["CPU", "GPU", "MEMORY", "NETWORK"]
+ROUTE = re.compile(r"^/api/v0/dial/(?P<uid>[^/]+)/(?P<action>set|backlight|image/set)$")
+
+
+class FakeDial(TypedDict):
+
+    uid: str
+    dial_name: str
+    value: int
+    backlight: dict[str, int]
+    image_file: str
+
+
+@dataclass
+class ServerConfig:
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    dials: int = 4
+
+
+@dataclass
+class ServerStats:
+
+    connections: int = 0
+    requests: int = 0
+    errors: int = 0
+    updates: dict[str, int] = field(default_factory=dict)
+
+
+class FakeVUServer:
+    """asyncio HTTP/1.1 server answering VU Server API requests"""
+
+    def __init__(self, config: ServerConfig) -> None:
+        self.config = config
+        self.stats = ServerStats()
+        self.dials: list[FakeDial] = [
+            {
+                "uid": f"{index:024X}",
+                "dial_name": DIAL_NAMES[index] if index < len(DIAL_NAMES) else f"EXTRA-{index}",
+                "value": 0,
+                "backlight": {"red": 0, "green": 0, "blue": 0},
+                "image_file": f"img_{index:024X}",
+            }
+            for index in range(config.dials)
+        ]
+        self._by_uid = {dial["uid"]: dial for dial in self.dials}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """serve requests on one connection until the client closes it"""
+        self.stats.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = dict(line.split(": ", 1) for line in header_lines if ": " in line)
+                length = int(headers.get("Content-Length", headers.get("content-length", 0)))
+                if length:
+                    await reader.readexactly(length)
+
+                status, body = await self.respond(method, target)
+                payload = json.dumps(body).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method: str, target: str) -> tuple[int, dict]:
+        """status and JSON body for a request"""
+        url = urlsplit(target)
+        if url.path == "/_stats":
+            return 200, self.stats.__dict__
+
+        self.stats.requests += 1
+        delay = self.config.latency + random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if random.random() < self.config.error_rate:
+            self.stats.errors += 1
+            return 500, {"status": "fail", "message": "injected error", "data": None}
+
+        if url.path == "/api/v0/dial/list":
+            return 200, {"status": "ok", "message": "", "data": self.dials}
+
+        match = ROUTE.match(url.path)
+        if match is None or match["uid"] not in self._by_uid:
+            return 404, {"status": "fail", "message": "not found", "data": None}
+
+        dial = self._by_uid[match["uid"]]
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if match["action"] == "set":
+            dial["value"] = int(query.get("value", 0))
+        elif match["action"] == "backlight":
+            dial["backlight"] = {colour: int(query.get(colour, 0)) for colour in ("red", "green", "blue")}
+        self.stats.updates[dial["dial_name"]] = self.stats.updates.get(dial["dial_name"], 0) + 1
+        return 200, {"status": "ok", "message": "Update queued", "data": None}
+
+
+def _serve(config: ServerConfig, conn) -> None:
+    """process entrypoint: serve on a free port and report it through `conn`"""
+
+    async def main() -> None:
+        server = FakeVUServer(config)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        conn.send(listener.sockets[0].getsockname()[1])
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(main())
+
+
+@contextlib.contextmanager
+def running_server(config: ServerConfig) -> Iterator[int]:
+    """Run a stand-in VU Server in a separate process
+
+    :param config: server behaviour
+    :return: port the server listens on
+    """
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve, args=(config, child), daemon=True)
+    process.start()
+    try:
+        yield parent.recv()
+    finally:
+        process.terminate()
+        process.join()
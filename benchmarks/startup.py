@@ -0,0 +1,126 @@
+"""Cold-start benchmark of the vu1-monitor CLI
+
+Runs each subcommand in a fresh interpreter under `python -X importtime`, against a stand-in VU
+Server, and reports its wall time, total import time and the heavy dependencies it loaded.
+
+usage: python -m benchmarks.startup [--runs 5] [--output startup_output.json]
+       python -m benchmarks.startup --baseline previous.json   # exits 1 on regression
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.server import ServerConfig, running_server
+
+COMMANDS = {
+    "help": ["--help"],
+    "stop": ["stop"],
+    "backlight": ["backlight", "--colour", "RED"],
+    "reset": ["reset", "dial"],
+    "image": ["image", str(Path("tests/fixtures/blank.png").resolve()), "--dial", "CPU"],
+}
+HEAVY = ["dynaconf", "httpx", "psutil", "PIL", "GPUtil", "pyadl"]
+IMPORT = re.compile(r"^import time:\s+\d+ \|\s+(?P<cumulative>\d+) \|(?P<indent> +)(?P<module>\S+)$")
+
+
+def parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """total import time (milliseconds) and top-level packages imported, from `-X importtime` output"""
+    total, packages = 0, set()
+    for line in stderr.splitlines():
+        match = IMPORT.match(line)
+        if match is None:
+            continue
+        packages.add(match["module"].split(".")[0])
+        if len(match["indent"]) == 1:
+            total += int(match["cumulative"])
+    return total / 1000, packages
+
+
+def run_command(args: list[str], env: dict[str, str], cwd: str) -> tuple[float, float, set[str]]:
+    """run a CLI command in a fresh interpreter: wall time, import time (milliseconds) and packages"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "vu1_monitor.main", *args],
+        env=env,
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    wall = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {result.returncode}: {result.stderr[-500:]}")
+    imports, packages = parse_importtime(result.stderr)
+    return wall, imports, packages
+
+
+def bench_startup(port: int, runs: int) -> dict:
+    """median cold-start time of each command"""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        src = str(Path("src").resolve())
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])),
+            "VU1_SERVER__HOSTNAME": "127.0.0.1",
+            "VU1_SERVER__PORT": str(port),
+            "VU1_SERVER__CACHE__PATH": directory,
+        }
+        for name, args in COMMANDS.items():
+            walls, imports = [], []
+            packages: set[str] = set()
+            for _ in range(runs):
+                wall, imported, packages = run_command(args, env, directory)
+                walls.append(wall)
+                imports.append(imported)
+            results[name] = {
+                "wall_ms": statistics.median(walls),
+                "import_ms": statistics.median(imports),
+                "heavy_imports": sorted(package for package in HEAVY if package in packages),
+            }
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """commands that start slower than the baseline by more than `tolerance` (fraction)"""
+    found = []
+    for name, result in results.items():
+        previous = baseline.get(name, {}).get("wall_ms")
+        if previous and (result["wall_ms"] - previous) / previous > tolerance:
+            found.append(f"{name}.wall_ms: {previous:.1f} -> {result['wall_ms']:.1f}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="runs of each command (the median is reported)")
+    parser.add_argument("--output", default="startup_output.json", help="results file (JSON)")
+    parser.add_argument("--baseline", default=None, help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression (fraction)")
+    args = parser.parse_args()
+
+    with running_server(ServerConfig()) as port:
+        results = bench_startup(port, args.runs)
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            found = regressions(results, json.load(file), args.tolerance)
+        for regression in found:
+            print(f"regression: {regression}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
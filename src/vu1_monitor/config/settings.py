@@ -4,6 +4,12 @@ from dynaconf import Dynaconf, Validator  # type: ignore
 
 current_directory = os.path.dirname(os.path.realpath(__file__))
 
+
+def _unset_or_positive(value: float | None) -> bool:
+    """optional settings are either unset or greater than 0"""
+    return value is None or value > 0
+
+
 settings = Dynaconf(
     envvar_prefix="VU1",
     settings_files=["settings.toml", ".secrets.toml"],
@@ -17,14 +23,104 @@ settings = Dynaconf(
         Validator("server.port", default=5340),
         Validator("server.logging_level", default="INFO"),
         Validator("server.key", default="cTpAWYuRpA2zx75Yh961Cg"),
+        Validator("server.concurrency", default=4),
+        Validator("server.budget", default=0),
         # timeouts
         Validator("server.timeouts.retries", default=5),
         Validator("server.timeouts.sleep", default=2),
+        Validator("server.timeouts.connect", default=5.0),
+        Validator("server.timeouts.read", default=5.0),
+        Validator("server.timeouts.backoff", default=2.0),
+        Validator("server.timeouts.max_sleep", default=30.0),
+        Validator("server.timeouts.jitter", default=0.5),
+        Validator("server.timeouts.deadline", default=30.0),
+        Validator("server.timeouts.failure_threshold", default=5),
+        Validator("server.timeouts.reset_timeout", default=30.0),
+        Validator("server.timeouts.half_open_requests", default=1),
+        # reconnect after an outage
+        Validator("server.reconnect.enabled", default=True),
+        Validator("server.reconnect.sleep", default=1.0),
+        Validator("server.reconnect.backoff", default=2.0),
+        Validator("server.reconnect.max_sleep", default=30.0),
+        # connection pool
+        Validator("server.pool.max_connections", default=10),
+        Validator("server.pool.max_keepalive", default=5),
+        Validator("server.pool.keepalive_expiry", default=30.0),
+        # dial discovery cache
+        Validator("server.cache.enabled", default=True),
+        Validator("server.cache.path", default="~/.cache/vu1-monitor"),
+        Validator("server.cache.ttl", default=3600),
+        Validator("server.cache.refresh", default=60),
+        Validator("server.cache.images", default=32, gte=1),
+        # metrics
+        Validator("metrics.workers", default=4),
+        Validator("metrics.backend", default="auto"),
+        Validator("metrics.cgroup", default=False),
+        # control socket
+        Validator("control.path", default="~/.cache/vu1-monitor/control.sock"),
+        Validator("control.timeout", default=10.0),
+        # telemetry
+        Validator("telemetry.enabled", default=False),
+        Validator("telemetry.host", default="127.0.0.1"),
+        Validator("telemetry.port", default=9340),
+        Validator("telemetry.textfile", default=""),
+        Validator("telemetry.interval", default=15.0),
+        Validator("telemetry.budget", default=0.01),
         # dials
         Validator("cpu.name", default="CPU"),
+        Validator("cpu.deadband", default=0),
+        Validator("cpu.max_staleness", default=30.0),
+        Validator("cpu.interval", default=None, condition=_unset_or_positive),
+        Validator("cpu.timeout", default=1.0),
+        Validator("cpu.sample_rate", default=4, gt=0),
+        Validator("cpu.aggregate", default="mean"),
+        Validator("cpu.ema_alpha", default=0.3),
+        Validator("cpu.percentile", default=95.0, gte=0, lte=100),
+        Validator("cpu.percentile_window", default=300.0, gt=0),
+        Validator("cpu.priority", default=3, gte=1),
+        Validator("cpu.statistic", default="mean"),
+        Validator("cpu.busy_threshold", default=90.0, gte=0, lte=100),
+        Validator("cpu.cores", default=""),
+        Validator("cpu.node", default=None),
         Validator("gpu.name", default="GPU"),
         Validator("gpu.backend", default="nvidia"),
+        Validator("gpu.metric", default="utilisation"),
+        Validator("gpu.deadband", default=0),
+        Validator("gpu.max_staleness", default=30.0),
+        Validator("gpu.interval", default=None, condition=_unset_or_positive),
+        Validator("gpu.timeout", default=2.0),
+        Validator("gpu.sample_rate", default=1, gt=0),
+        Validator("gpu.aggregate", default="mean"),
+        Validator("gpu.ema_alpha", default=0.3),
+        Validator("gpu.percentile", default=95.0, gte=0, lte=100),
+        Validator("gpu.percentile_window", default=300.0, gt=0),
+        Validator("gpu.priority", default=2, gte=1),
         Validator("memory.name", default="MEMORY"),
+        Validator("memory.deadband", default=0),
+        Validator("memory.max_staleness", default=30.0),
+        Validator("memory.interval", default=None, condition=_unset_or_positive),
+        Validator("memory.timeout", default=1.0),
+        Validator("memory.sample_rate", default=1, gt=0),
+        Validator("memory.aggregate", default="last"),
+        Validator("memory.ema_alpha", default=0.3),
+        Validator("memory.percentile", default=95.0, gte=0, lte=100),
+        Validator("memory.percentile_window", default=300.0, gt=0),
+        Validator("memory.priority", default=1, gte=1),
         Validator("network.name", default="NETWORK"),
+        Validator("network.deadband", default=0),
+        Validator("network.max_staleness", default=30.0),
+        Validator("network.interval", default=None, condition=_unset_or_positive),
+        Validator("network.timeout", default=1.0),
+        Validator("network.sample_rate", default=4, gt=0),
+        Validator("network.aggregate", default="mean"),
+        Validator("network.ema_alpha", default=0.3),
+        Validator("network.percentile", default=95.0, gte=0, lte=100),
+        Validator("network.percentile_window", default=300.0, gt=0),
+        Validator("network.priority", default=2, gte=1),
+        Validator("network.direction", default="max"),
+        Validator("network.scale", default="linear"),
+        Validator("network.capacity", default=0, gte=0),
+        Validator("network.include", default=""),
+        Validator("network.exclude", default="lo,veth*,docker*,br-*,virbr*"),
     ],
 )
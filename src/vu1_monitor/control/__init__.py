@@ -0,0 +1,4 @@
+from vu1_monitor.control.client import send_command
+from vu1_monitor.control.server import ControlServer
+
+__all__ = ["ControlServer", "send_command"]
@@ -0,0 +1,45 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from vu1_monitor.control.protocol import LIMIT, decode, encode, request
+from vu1_monitor.exceptions.control import ControlError, ControlTimeout
+
+NOT_RUNNING = (FileNotFoundError, ConnectionRefusedError)
+
+
+async def send_command(path: Path, command: str, timeout: float = 5.0, **args: Any) -> dict | None:
+    """Send a command to the monitoring daemon
+
+    :param path: daemon control socket
+    :param command: command to run
+    :param timeout: maximum time to wait for the daemon (seconds)
+    :raises ControlTimeout: Raised when the daemon doesn't answer in time.
+    :raises ControlError: Raised when the daemon fails to run the command.
+    :return: response message, or None when no daemon is listening on the socket (or on platforms
+        without unix sockets)
+    """
+    if not hasattr(asyncio, "open_unix_connection"):
+        return None
+
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(str(path), limit=LIMIT), timeout)
+    except NOT_RUNNING:
+        return None
+    except asyncio.TimeoutError as e:
+        raise ControlTimeout(f"monitoring daemon did not accept {command}") from e
+
+    try:
+        writer.write(encode(request(command, **args)))
+        await writer.drain()
+        response = decode(await asyncio.wait_for(reader.readline(), timeout))
+    except asyncio.TimeoutError as e:
+        raise ControlTimeout(f"monitoring daemon did not answer {command}") from e
+    except (ConnectionError, ValueError) as e:
+        raise ControlError(f"monitoring daemon did not answer {command}: {e!r}") from e
+    finally:
+        writer.close()
+
+    if response.get("status") != "ok":
+        raise ControlError(response.get("message", f"{command} failed"))
+    return response
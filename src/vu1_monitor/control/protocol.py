@@ -0,0 +1,44 @@
+"""Control socket protocol
+
+Requests and responses are single-line JSON objects, terminated by a newline:
+
+    request:  {"command": "backlight", "args": {"colour": [20, 20, 20], "dial": "CPU"}}
+    response: {"status": "ok", "data": ...} or {"status": "fail", "message": "..."}
+"""
+
+import json
+from typing import Any
+
+LIMIT = 64 * 1024
+
+
+def encode(message: dict) -> bytes:
+    """encode a message as a line of JSON"""
+    return json.dumps(message).encode() + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    """Decode a line of JSON
+
+    :raises ValueError: Raised when the line is not a JSON object.
+    :return: decoded message
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("message must be a JSON object")
+    return message
+
+
+def request(command: str, **args: Any) -> dict:
+    """build a request message"""
+    return {"command": command, "args": args}
+
+
+def ok(data: Any = None) -> dict:
+    """build a successful response message"""
+    return {"status": "ok", "data": data}
+
+
+def fail(message: str) -> dict:
+    """build a failed response message"""
+    return {"status": "fail", "message": message}
@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import errno
+import inspect
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from vu1_monitor.config import settings
+from vu1_monitor.control.client import NOT_RUNNING
+from vu1_monitor.control.protocol import LIMIT, decode, encode, fail, ok
+from vu1_monitor.exceptions import ServerNotFound
+
+logger = logging.getLogger(settings.name)
+
+Command = Callable[..., Awaitable[Any]]
+
+
+class ControlServer:
+    """Serves commands to CLI processes over a Unix domain socket
+
+    Each connection may send any number of requests; each is answered in order (see `protocol`).
+
+    :param commands: command handlers by name, called with the request arguments as keywords
+    """
+
+    def __init__(self, commands: dict[str, Command]) -> None:
+        self.commands = commands
+        self.path: Path | None = None
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def dispatch(self, message: dict) -> dict:
+        """Run the command of a request
+
+        :param message: decoded request
+        :return: response message
+        """
+        command = self.commands.get(message.get("command", ""))
+        if command is None:
+            return fail(f"unknown command: {message.get('command')}")
+        args = message.get("args", {})
+        try:
+            inspect.signature(command).bind(**args)
+        except TypeError as e:
+            return fail(f"invalid arguments: {e}")
+        try:
+            return ok(await command(**args))
+        except ServerNotFound as e:
+            return fail(e.message)
+        except Exception as e:
+            return fail(str(e) or repr(e))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """answer requests on one connection until the client closes it"""
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.dispatch(decode(line))
+                except ValueError as e:
+                    response = fail(f"invalid request: {e}")
+                writer.write(encode(response))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+            writer.close()
+
+    async def start(self, path: Path) -> None:
+        """Listen on a Unix domain socket, readable by the current user only
+
+        :param path: socket path (a stale socket left by a previous daemon is replaced)
+        :raises OSError: Raised when another daemon is listening on the socket.
+        """
+        if await _listening(path):
+            raise OSError(errno.EADDRINUSE, "another monitoring daemon is listening", str(path))
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # bind with the socket already private to the current user, rather than chmod it afterwards
+        umask = os.umask(0o177)
+        try:
+            sock.bind(str(path))
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            os.umask(umask)
+        self._server = await asyncio.start_unix_server(self.handle, sock=sock, limit=LIMIT)
+        self.path = path
+        logger.info(f"listening for commands on {path}")
+
+    async def close(self) -> None:
+        """Stop listening, drop open connections and remove the socket"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self.path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                self.path.unlink()
+            self.path = None
+
+
+async def _listening(path: Path) -> bool:
+    """whether a daemon accepts connections on a socket (a stale socket refuses them)"""
+    try:
+        _, writer = await asyncio.open_unix_connection(str(path))
+    except NOT_RUNNING:
+        return False
+    writer.close()
+    return True
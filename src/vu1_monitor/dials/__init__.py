@@ -1,3 +1,18 @@
+from vu1_monitor.dials.bulk import BulkReport
+from vu1_monitor.dials.cache import WriteCache, WriteStats
 from vu1_monitor.dials.client import VU1Client
+from vu1_monitor.dials.mailbox import DialWriter, Mailbox, MailboxStats
+from vu1_monitor.dials.retry import CircuitBreaker, CircuitState, RetryPolicy
 
-__all__ = ["VU1Client"]
+__all__ = [
+    "VU1Client",
+    "BulkReport",
+    "CircuitBreaker",
+    "CircuitState",
+    "DialWriter",
+    "Mailbox",
+    "MailboxStats",
+    "RetryPolicy",
+    "WriteCache",
+    "WriteStats",
+]
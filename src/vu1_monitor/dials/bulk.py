@@ -0,0 +1,66 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable
+
+from vu1_monitor.exceptions.dials import ServerNotFound
+from vu1_monitor.models.models import DialType
+
+
+@dataclass
+class BulkReport:
+    """Per-dial outcome of a bulk operation"""
+
+    results: dict[DialType, dict] = field(default_factory=dict)
+    errors: dict[DialType, BaseException] = field(default_factory=dict)
+    skipped: list[DialType] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """whether every attempted dial succeeded"""
+        return not self.errors
+
+    def as_dict(self) -> dict:
+        """JSON-serialisable summary (dial names of successful, failed and skipped dials)"""
+        return {
+            "done": [dial.value for dial in self.results],
+            "failed": {dial.value: str(error) or repr(error) for dial, error in self.errors.items()},
+            "skipped": [dial.value for dial in self.skipped],
+        }
+
+
+async def run_bulk(
+    send: Callable[[DialType], Awaitable[dict]],
+    dials: Iterable[DialType],
+    known: Iterable[DialType],
+    concurrency: int,
+) -> BulkReport:
+    """Run an operation on several dials concurrently
+
+    :param send: operation to run on each dial
+    :param dials: dials to run the operation on
+    :param known: dials known to exist (others are skipped without a request)
+    :param concurrency: maximum number of operations in flight
+    :raises ServerNotFound: Raised when the VU Server is unreachable, as no dial can succeed.
+    :return: per-dial report
+    """
+    known = set(known)
+    report = BulkReport()
+    targets: list[DialType] = []
+    for dial in dials:
+        (targets if dial in known else report.skipped).append(dial)
+
+    limit = asyncio.Semaphore(concurrency)
+
+    async def bounded(dial: DialType) -> dict:
+        async with limit:
+            return await send(dial)
+
+    results = await asyncio.gather(*(bounded(dial) for dial in targets), return_exceptions=True)
+    for dial, result in zip(targets, results, strict=True):
+        if isinstance(result, ServerNotFound):
+            raise result
+        if isinstance(result, BaseException):
+            report.errors[dial] = result
+        else:
+            report.results[dial] = result
+    return report
@@ -0,0 +1,68 @@
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from vu1_monitor.models.models import DialType, Element
+
+if TYPE_CHECKING:
+    from vu1_monitor.scheduler import DialPolicy
+
+
+@dataclass
+class WriteStats:
+
+    sent: int = 0
+    suppressed: int = 0
+
+
+class WriteCache:
+    """Last values written to each dial element, used to suppress redundant writes
+
+    A dial value within its deadband of the last value sent (or a backlight colour equal to the
+    last colour sent) is suppressed, unless the last write is older than `max_staleness` seconds.
+    """
+
+    def __init__(self, deadband: dict[DialType, float], max_staleness: dict[DialType, float]) -> None:
+        self.deadband = deadband
+        self.max_staleness = max_staleness
+        self.stats = {element: WriteStats() for element in Element}
+        self._last: dict[tuple[DialType, Element], tuple[Any, float]] = {}
+
+    @classmethod
+    def from_policies(cls, policies: dict[DialType, "DialPolicy"]) -> "WriteCache":
+        """Build the write cache from the deadband and max staleness of dial policies
+
+        :param policies: update policy of each dial
+        :return: write cache
+        """
+        return cls(
+            deadband={dial: policy.deadband for dial, policy in policies.items()},
+            max_staleness={dial: policy.max_staleness for dial, policy in policies.items()},
+        )
+
+    def should_send(self, dial: DialType, element: Element, value: Any) -> bool:
+        """check whether a write differs enough from the last one to be sent (counts suppressed writes)"""
+        last = self._last.get((dial, element))
+        if last is None or self._stale(dial, last[1]) or not self._within_deadband(dial, element, value, last[0]):
+            return True
+
+        self.stats[element].suppressed += 1
+        return False
+
+    def record(self, dial: DialType, element: Element, value: Any) -> None:
+        """record a write sent to the VU Server"""
+        self._last[(dial, element)] = (value, time.monotonic())
+        self.stats[element].sent += 1
+
+    def invalidate(self, dial: DialType | None = None) -> None:
+        """forget last written values (of one dial, or all dials)"""
+        for key in [key for key in self._last if dial is None or key[0] == dial]:
+            del self._last[key]
+
+    def _stale(self, dial: DialType, written_at: float) -> bool:
+        return time.monotonic() - written_at >= self.max_staleness.get(dial, 0.0)
+
+    def _within_deadband(self, dial: DialType, element: Element, value: Any, last: Any) -> bool:
+        if element == Element.DIAL:
+            return abs(value - last) <= self.deadband.get(dial, 0.0)
+        return value == last
@@ -1,78 +1,226 @@
+import asyncio
 import functools
 import time
 from pathlib import Path
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Iterator
 
 import httpx
 
 from vu1_monitor.config import settings
+from vu1_monitor.dials.bulk import BulkReport, run_bulk
+from vu1_monitor.dials.cache import WriteCache, WriteStats
+from vu1_monitor.dials.retry import CircuitBreaker, RetryPolicy
 from vu1_monitor.exceptions.dials import (
+    CircuitOpen,
     DialNotFound,
     DialNotImplemented,
     ServerNotFound,
 )
-from vu1_monitor.models.models import Dial, DialImage, DialType
-
-TYPES = [item.value for item in DialType]
+from vu1_monitor.files.assets import read_asset
+from vu1_monitor.files.cache import read_cache, write_cache
+from vu1_monitor.models.models import Dial, DialImage, DialType, Element
+from vu1_monitor.scheduler.policy import DialPolicy
+from vu1_monitor.telemetry.instruments import HTTP_DURATION, HTTP_RETRIES, WRITES
 
+if TYPE_CHECKING:
+    from vu1_monitor.images import PreparedImage
 
-def sync_handler(timeout_retries: int = 3, sleep: int = 2) -> Callable:
-    """decorator for handling server errors"""
+TYPES = [item.value for item in DialType]
+SUPPRESSED = {"status": "ok", "message": "Update suppressed", "data": None}
+
+
+def _breaker(args: tuple) -> CircuitBreaker | None:
+    """circuit breaker of the decorated method's instance (if any)"""
+    return getattr(args[0], "breaker", None) if args else None
+
+
+def _next_delay(
+    policy: RetryPolicy, delays: Iterator[float], started: float, breaker: CircuitBreaker | None
+) -> float | None:
+    """wait before the next retry, or None (recording a failure) once retries or the deadline are exhausted"""
+    delay = next(delays, None)
+    remaining = policy.remaining(started)
+    if delay is None or (remaining is not None and delay >= remaining):
+        if breaker:
+            breaker.record_failure()
+        return None
+    if breaker:
+        breaker.release()
+    HTTP_RETRIES.inc()
+    return delay
+
+
+def _record_status(breaker: CircuitBreaker, response: httpx.Response) -> None:
+    """tell the breaker about an error response: server errors count as failures, client errors don't"""
+    if response.is_server_error:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+async def _within(request: Awaitable, timeout: float | None) -> Any:
+    """Await a request for at most `timeout` seconds
+
+    Unlike asyncio.wait_for (before Python 3.12), a cancellation arriving as the request completes is
+    never swallowed, so writers stop when cancelled.
+
+    :raises asyncio.TimeoutError: Raised when the request takes longer than the timeout.
+    """
+    task = asyncio.ensure_future(request)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if not done:
+        task.cancel()
+        await asyncio.wait({task})
+        raise asyncio.TimeoutError()
+    return task.result()
+
+
+def sync_handler(timeout_retries: int = 3, sleep: float = 2, policy: RetryPolicy | None = None) -> Callable:
+    """decorator for handling server errors
+
+    Timeouts are retried with exponential backoff and jitter. When decorating methods, the
+    instance's `breaker` (if present) is consulted before each request and told about its outcome.
+    """
+    policy = policy or RetryPolicy(retries=timeout_retries, sleep=sleep)
 
     def server_decorator(func) -> Callable:
         @functools.wraps(func)
         def handle_errors(*args, **kwargs) -> Any:
             """handle errors"""
-            try:
-                return func(*args, **kwargs)
-            except httpx.ConnectError as e:
-                raise ServerNotFound from e
-            except httpx.TimeoutException as e:
-                # retry on timeout
-                for _ in range(timeout_retries):
-                    try:
-                        return func(*args, **kwargs)
-                    except httpx.TimeoutException:
-                        time.sleep(sleep)
-                raise e
+            breaker = _breaker(args)
+            started = time.monotonic()
+            delays = policy.delays()
+            while True:
+                if breaker and not breaker.allow():
+                    raise CircuitOpen()
+                try:
+                    response = func(*args, **kwargs)
+                except httpx.ConnectError as e:
+                    if breaker:
+                        breaker.record_failure()
+                    raise ServerNotFound from e
+                except httpx.TimeoutException:
+                    delay = _next_delay(policy, delays, started, breaker)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                except httpx.HTTPStatusError as e:
+                    if breaker:
+                        _record_status(breaker, e.response)
+                    raise
+                except BaseException:
+                    if breaker:
+                        breaker.release()
+                    raise
+                else:
+                    if breaker:
+                        breaker.record_success()
+                    return response
 
         return handle_errors
 
     return server_decorator
 
 
-def async_handler(timeout_retries: int = 3, sleep: int = 2) -> Callable:
-    """async decorator for handling server errors"""
+def async_handler(timeout_retries: int = 3, sleep: float = 2, policy: RetryPolicy | None = None) -> Callable:
+    """async decorator for handling server errors
+
+    Timeouts are retried with exponential backoff and jitter without blocking the event loop,
+    and every attempt is bounded by the policy deadline. When decorating methods, the
+    instance's `breaker` (if present) is consulted before each request and told about its outcome.
+    """
+    policy = policy or RetryPolicy(retries=timeout_retries, sleep=sleep)
 
     def server_decorator(func) -> Callable:
         @functools.wraps(func)
         async def handle_errors(*args, **kwargs) -> Any:
             """handle errors"""
-            try:
-                return await func(*args, **kwargs)
-            except httpx.ConnectError as e:
-                raise ServerNotFound from e
-            except httpx.TimeoutException as e:
-                # retry on timeout
-                for _ in range(timeout_retries):
-                    try:
-                        return await func(*args, **kwargs)
-                    except httpx.TimeoutException:
-                        time.sleep(sleep)
-                raise e
+            breaker = _breaker(args)
+            started = time.monotonic()
+            delays = policy.delays()
+            while True:
+                if breaker and not breaker.allow():
+                    raise CircuitOpen()
+                try:
+                    response = await _within(func(*args, **kwargs), policy.remaining(started))
+                except httpx.ConnectError as e:
+                    if breaker:
+                        breaker.record_failure()
+                    raise ServerNotFound from e
+                except (httpx.TimeoutException, asyncio.TimeoutError) as e:
+                    delay = _next_delay(policy, delays, started, breaker)
+                    if delay is None:
+                        if isinstance(e, httpx.TimeoutException):
+                            raise
+                        raise httpx.TimeoutException("request deadline exceeded") from e
+                    await asyncio.sleep(delay)
+                except httpx.HTTPStatusError as e:
+                    if breaker:
+                        _record_status(breaker, e.response)
+                    raise
+                except BaseException:
+                    if breaker:
+                        breaker.release()
+                    raise
+                else:
+                    if breaker:
+                        breaker.record_success()
+                    return response
 
         return handle_errors
 
     return server_decorator
 
 
+RETRY_POLICY = RetryPolicy.from_settings(settings.server.timeouts)
+
+
+def _transport_options() -> dict:
+    """build shared connection pool limits and timeouts from settings"""
+    limits = httpx.Limits(
+        max_connections=settings.server.pool.max_connections,
+        max_keepalive_connections=settings.server.pool.max_keepalive,
+        keepalive_expiry=settings.server.pool.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(settings.server.timeouts.read, connect=settings.server.timeouts.connect)
+    return {"limits": limits, "timeout": timeout}
+
+
 class VU1Client:
 
     def __init__(self, hostname: str, port: int, key: str, **kwargs: bool) -> None:
         self.__addr = f"http://{hostname}:{port}"
         self.__auth = {"key": key}
-        if not kwargs.get("testing", False):
-            self._load_dials()
+        options = _transport_options()
+        self._async_client = httpx.AsyncClient(base_url=self.__addr, params=self.__auth, **options)
+        self.breaker = CircuitBreaker.from_settings(settings.server.timeouts)
+        self.writes = WriteCache.from_policies({dial: DialPolicy.from_settings(dial) for dial in DialType})
+        self._cache_path = Path(settings.server.cache.path).expanduser() / f"dials-{hostname}-{port}.json"
+        self._dials_cached = False
+        self._uploads_path = self._cache_path.with_name(f"uploads-{hostname}-{port}.json")
+        self.__uploads: dict[str, str] | None = None
+        self.__dials: dict = {}
+        self._testing = kwargs.get("testing", False)
+
+    async def __aenter__(self) -> "VU1Client":
+        if not self._testing:
+            try:
+                await self._load_dials()
+            except BaseException:
+                await self.aclose()
+                raise
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections to the VU Server"""
+        await self._async_client.aclose()
 
     @property
     def dials(self) -> dict:
@@ -87,14 +235,71 @@ class VU1Client:
         """
         return dial in self.__dials
 
-    def _load_dials(self) -> dict:
-        """build a dictionary of available dials
+    async def _load_dials(self) -> dict:
+        """build a dictionary of available dials, from the discovery cache when it is fresh
 
         :raises DialNotFound: Raised when no dials found
         :return: dict of all available dials
         """
-        resp = self.get_dials()
+        if settings.server.cache.enabled:
+            cached = read_cache(self._cache_path, settings.server.cache.ttl)
+            if cached is not None:
+                self.__dials = self._build_dials(cached)
+                self._dials_cached = True
+                return self.__dials
+
+        resp = await self.aget_dials()
+        self.__dials = self._build_dials(resp)
+        self._dials_cached = False
+        self._cache_dials(resp)
+        return self.__dials
+
+    async def refresh_dials(self) -> dict:
+        """Rediscover available dials from the VU Server and update the discovery cache
+
+        :raises DialNotFound: Raised when no dials found
+        :return: dict of all available dials
+        """
+        return self._rediscovered(await self.aget_dials())
+
+    async def reconnect(self) -> dict:
+        """Probe the VU Server after an outage, and rediscover dials once it answers
+
+        The probe bypasses retries and the circuit breaker, and closes the breaker when it succeeds.
+        Every dial is written again on its next update, as the server may have restarted.
+
+        :raises ServerNotFound: Raised when the VU Server is still unreachable.
+        :raises DialNotFound: Raised when no dials found
+        :return: dict of all available dials
+        """
+        try:
+            response = await self._async_client.get("/api/v0/dial/list")
+            response.raise_for_status()
+        except httpx.TransportError as e:
+            raise ServerNotFound from e
 
+        self.breaker.record_success()
+        self.writes.invalidate()
+        return self._rediscovered(response.json()["data"])
+
+    def _rediscovered(self, resp: list[dict]) -> dict:
+        """replace the known dials with a fresh dial list, forgetting writes to dials that changed"""
+        dials = self._build_dials(resp)
+
+        for dial, found in dials.items():
+            if dial not in self.__dials or self.__dials[dial].uid != found.uid:
+                self.writes.invalidate(dial)
+
+        self.__dials = dials
+        self._dials_cached = False
+        self._cache_dials(resp)
+        return dials
+
+    def _build_dials(self, resp: list[dict]) -> dict:
+        """build a dictionary of known dials from a dial list
+
+        :raises DialNotFound: Raised when no dials found
+        """
         if len(resp) <= 0:
             raise DialNotFound("no dials returned from VU Server")
 
@@ -103,99 +308,237 @@ class VU1Client:
         if len(dials) <= 0:
             raise DialNotFound("no known dials found")
 
-        self.__dials: dict = dials
         return dials
 
-    @sync_handler(settings.server.timeouts.retries, settings.server.timeouts.sleep)
-    def get_dials(self) -> list[dict]:
-        """get list of all available dials"""
-        with httpx.Client(base_url=self.__addr, params=self.__auth) as client:
-            response = client.get("/api/v0/dial/list")
+    def _cache_dials(self, resp: list[dict]) -> None:
+        """write a dial list to the discovery cache"""
+        if settings.server.cache.enabled:
+            try:
+                write_cache(self._cache_path, resp)
+            except OSError:
+                pass
+
+    async def _validated(self, send: Callable[..., Awaitable[dict]], dial: DialType, *args: Any) -> dict:
+        """send a request, rediscovering dials once if a cached dial map turns out to be stale"""
+        try:
+            return await send(dial, *args)
+        except (httpx.HTTPStatusError, DialNotImplemented):
+            if not self._dials_cached:
+                raise
+            await self.refresh_dials()
+            return await send(dial, *args)
+
+    @async_handler(policy=RETRY_POLICY)
+    async def aget_dials(self) -> list[dict]:
+        """get list of all available dials (async)"""
+        response = await self._async_client.get("/api/v0/dial/list")
 
         if response.status_code != 200:
             response.raise_for_status()
 
         return response.json()["data"]
 
-    @async_handler(settings.server.timeouts.retries, settings.server.timeouts.sleep)
-    async def set_dial(self, dial: DialType, value: int) -> dict:
+    @property
+    def write_stats(self) -> dict[Element, WriteStats]:
+        """counts of sent and suppressed writes per dial element"""
+        return self.writes.stats
+
+    async def set_dial(self, dial: DialType, value: int, force: bool = False) -> dict:
         """Set the value of a dial
 
+        Writes within the dial's deadband of the last value sent are suppressed (see `WriteCache`).
+
         :param dial: Dial to update
         :param value: 0-100 value to set dial at
+        :param force: Send the write even if it would be suppressed, defaults to False
         :raises DialNotImplemented: Raised when dial selected is not found.
         :return: Set dial response body
         """
+        if not force and not self.writes.should_send(dial, Element.DIAL, value):
+            WRITES.labels(dial.value, Element.DIAL.value, "suppressed").inc()
+            return dict(SUPPRESSED)
+
+        response = await self._validated(self._set_dial, dial, value)
+        self.writes.record(dial, Element.DIAL, value)
+        WRITES.labels(dial.value, Element.DIAL.value, "sent").inc()
+        return response
+
+    @async_handler(policy=RETRY_POLICY)
+    async def _set_dial(self, dial: DialType, value: int) -> dict:
+        """send a dial value to the VU Server"""
         try:
             path = f"/api/v0/dial/{self.__dials[dial].uid}/set"
         except KeyError as e:
             raise DialNotImplemented(f"{dial.value} dial is not set up", dial) from e
 
-        async with httpx.AsyncClient(base_url=self.__addr, params=self.__auth) as client:
-            response = await client.get(path, params={"value": value})
+        started = time.perf_counter()
+        try:
+            response = await self._async_client.get(path, params={"value": value})
+        finally:
+            HTTP_DURATION.labels(dial.value, Element.DIAL.value).observe(time.perf_counter() - started)
 
         if response.status_code != 200:
             response.raise_for_status()
 
         return response.json()
 
-    async def reset_dials(self) -> None:
+    async def bulk(
+        self,
+        send: Callable[[DialType], Awaitable[dict]],
+        dials: Iterable[DialType] | None = None,
+        concurrency: int | None = None,
+    ) -> BulkReport:
+        """Run an operation on several dials concurrently, reporting the outcome of each
+
+        Dials missing from the discovered dial map are skipped without a request, and a failing
+        dial doesn't stop the others.
+
+        :param send: operation to run on each dial
+        :param dials: dials to run the operation on, defaults to every discovered dial
+        :param concurrency: maximum number of requests in flight, defaults to `server.concurrency`
+        :raises ServerNotFound: Raised when the VU Server is unreachable.
+        :return: per-dial report
+        """
+        dials = list(self.__dials) if dials is None else dials
+        return await run_bulk(send, dials, self.__dials, concurrency or settings.server.concurrency)
+
+    async def reset_dials(self) -> BulkReport:
         """Reset the values of all dials to 0"""
-        for dial in self.__dials:
-            await self.set_dial(dial, 0)
+        return await self.bulk(lambda dial: self.set_dial(dial, 0, force=True))
 
-    @async_handler(settings.server.timeouts.retries, settings.server.timeouts.sleep)
-    async def set_backlight(self, dial: DialType, colour: tuple[int, ...]) -> dict:
+    async def set_backlight(self, dial: DialType, colour: tuple[int, ...], force: bool = False) -> dict:
         """Set backlight colour of a dial
 
+        Writes of the colour last sent to the dial are suppressed (see `WriteCache`).
+
         :param dial: Dial to update
         :param colour: A tuple of (red, green, blue) RGB percent values (0-100)
+        :param force: Send the write even if it would be suppressed, defaults to False
         :raises DialNotImplemented: Raised when dial selected is not found.
         :return: Set backlight response body
         """
+        colour = tuple(colour)
+        if not force and not self.writes.should_send(dial, Element.BACKLIGHT, colour):
+            WRITES.labels(dial.value, Element.BACKLIGHT.value, "suppressed").inc()
+            return dict(SUPPRESSED)
+
+        response = await self._validated(self._set_backlight, dial, colour)
+        self.writes.record(dial, Element.BACKLIGHT, colour)
+        WRITES.labels(dial.value, Element.BACKLIGHT.value, "sent").inc()
+        return response
+
+    @async_handler(policy=RETRY_POLICY)
+    async def _set_backlight(self, dial: DialType, colour: tuple[int, ...]) -> dict:
+        """send a backlight colour to the VU Server"""
         try:
             path = f"/api/v0/dial/{self.__dials[dial].uid}/backlight"
         except KeyError as e:
             raise DialNotImplemented(f"{dial.value} dial is not set up", dial) from e
 
-        async with httpx.AsyncClient(base_url=self.__addr, params=self.__auth) as client:
-            params = {"red": colour[0], "green": colour[1], "blue": colour[2]}
-            response = await client.get(path, params=params)
+        params = {"red": colour[0], "green": colour[1], "blue": colour[2]}
+        started = time.perf_counter()
+        try:
+            response = await self._async_client.get(path, params=params)
+        finally:
+            HTTP_DURATION.labels(dial.value, Element.BACKLIGHT.value).observe(time.perf_counter() - started)
 
         if response.status_code != 200:
             response.raise_for_status()
 
         return response.json()
 
-    async def reset_backlights(self) -> None:
+    async def set_backlights(
+        self, colour: tuple[int, ...], dials: Iterable[DialType] | None = None, force: bool = False
+    ) -> BulkReport:
+        """Set the backlight colour of several dials concurrently
+
+        :param colour: A tuple of (red, green, blue) RGB percent values (0-100)
+        :param dials: Dials to update, defaults to every discovered dial
+        :param force: Send the writes even if they would be suppressed, defaults to False
+        :return: per-dial report
+        """
+        return await self.bulk(lambda dial: self.set_backlight(dial, colour, force=force), dials)
+
+    async def reset_backlights(self) -> BulkReport:
         """Reset the backlight of all dials to off"""
-        for dial in self.__dials:
-            await self.set_backlight(dial, (0, 0, 0))
+        return await self.set_backlights((0, 0, 0), force=True)
 
-    @async_handler(settings.server.timeouts.retries, settings.server.timeouts.sleep)
-    async def set_image(self, dial: DialType, image_path: Path) -> dict:
+    async def set_image(self, dial: DialType, image: Path | bytes, force: bool = False) -> dict:
         """Set an image for a dial
 
-        :param dial: :param dial: Dial to update.
-        :param image_path: _description_
+        The image is converted to the dial display format (see `prepare_image`), and its upload is
+        skipped when the dial already shows the same content: either the dial reports the
+        content-addressed filename, or it was the last image uploaded to the dial.
+
+        :param dial: Dial to update.
+        :param image: Image file, or encoded image, of any size or format
+        :param force: Upload the image even if the dial already shows it, defaults to False
         :raises DialNotImplemented: Raised when dial selected is not found.
+        :raises OSError: Raised when the image cannot be read or converted.
         :return: Set image response body
         """
+        from vu1_monitor.images import prepare_image
+
+        prepared = await prepare_image(image)
+        if not force and self._shows_image(dial, prepared):
+            self.writes.stats[Element.IMAGE].suppressed += 1
+            WRITES.labels(dial.value, Element.IMAGE.value, "suppressed").inc()
+            return dict(SUPPRESSED)
+
+        response = await self._validated(self._set_image, dial, prepared)
+        self._record_upload(dial, prepared)
+        self.writes.stats[Element.IMAGE].sent += 1
+        WRITES.labels(dial.value, Element.IMAGE.value, "sent").inc()
+        return response
+
+    @async_handler(policy=RETRY_POLICY)
+    async def _set_image(self, dial: DialType, image: "PreparedImage") -> dict:
+        """upload a converted image to the VU Server"""
         try:
             path = f"/api/v0/dial/{self.__dials[dial].uid}/image/set"
         except KeyError as e:
             raise DialNotImplemented(f"{dial.value} dial is not set up", dial) from e
 
-        async with httpx.AsyncClient(base_url=self.__addr, params=self.__auth) as client:
-            files = {"imgfile": open(image_path, "rb")}
-            response = await client.post(path, files=files)
+        files = {"imgfile": (image.filename, image.data, "image/png")}
+        started = time.perf_counter()
+        try:
+            response = await self._async_client.post(path, files=files)
+        finally:
+            HTTP_DURATION.labels(dial.value, Element.IMAGE.value).observe(time.perf_counter() - started)
 
         if response.status_code != 200:
             response.raise_for_status()
 
         return response.json()
 
-    async def reset_images(self) -> None:
-        """Reset all dials to their default images"""
-        for dial in self.__dials.keys():
-            await self.set_image(dial, DialImage[dial].value)
+    def _uploads(self) -> dict[str, str]:
+        """digest of the last image uploaded to each dial uid (kept alongside the discovery cache)"""
+        if self.__uploads is None:
+            cached = None
+            if settings.server.cache.enabled:
+                cached = read_cache(self._uploads_path, settings.server.cache.ttl)
+            self.__uploads = cached if isinstance(cached, dict) else {}
+        return self.__uploads
+
+    def _shows_image(self, dial: DialType, image: "PreparedImage") -> bool:
+        """check whether a dial already shows an image"""
+        found = self.__dials.get(dial)
+        if found is None:
+            return False
+        if found.image_file and image.digest in found.image_file:
+            return True
+        return self._uploads().get(found.uid) == image.digest
+
+    def _record_upload(self, dial: DialType, image: "PreparedImage") -> None:
+        """remember the image uploaded to a dial"""
+        uploads = self._uploads()
+        uploads[self.__dials[dial].uid] = image.digest
+        if settings.server.cache.enabled:
+            try:
+                write_cache(self._uploads_path, uploads)
+            except OSError:
+                pass
+
+    async def reset_images(self) -> BulkReport:
+        """Reset all dials to their default images (bundled assets, see `read_asset`)"""
+        return await self.bulk(lambda dial: self.set_image(dial, read_asset(DialImage[dial].value), force=True))
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from vu1_monitor.models.models import DialType
+from vu1_monitor.telemetry.instruments import UPDATES_DISCARDED
+
+T = TypeVar("T")
+
+
+@dataclass
+class MailboxStats:
+
+    posted: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    sent: int = 0
+    failed: int = 0
+    lag: float = 0.0
+
+
+class Mailbox(Generic[T]):
+    """Single-slot mailbox holding the latest value posted and not yet taken
+
+    Posting while a value is waiting overwrites it (counted as coalesced), so a slow reader only
+    ever sees the most recent value and never builds up a backlog.
+
+    :param clock: monotonic clock, defaults to time.monotonic
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.stats = MailboxStats()
+        self._value: T | None = None
+        self._posted = 0.0
+        self._ready = asyncio.Event()
+
+    @property
+    def pending(self) -> bool:
+        """whether a value is waiting to be taken"""
+        return self._ready.is_set()
+
+    def post(self, value: T) -> None:
+        """Post a value, replacing any value not yet taken
+
+        :param value: value to post
+        """
+        if self._ready.is_set():
+            self.stats.coalesced += 1
+        self.stats.posted += 1
+        self._value, self._posted = value, self.clock()
+        self._ready.set()
+
+    async def wait(self) -> None:
+        """wait until a value is posted, without taking it"""
+        await self._ready.wait()
+
+    async def take(self) -> tuple[T, float]:
+        """Wait for a value and take it out of the mailbox
+
+        :return: value, and the time it was posted (on the mailbox clock)
+        """
+        await self._ready.wait()
+        self._ready.clear()
+        return self._value, self._posted  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        """drop the value waiting to be taken, if any"""
+        if self._ready.is_set():
+            self._ready.clear()
+            self.stats.dropped += 1
+
+
+class DialWriter:
+    """Writes dial values to the VU Server from one writer task per dial
+
+    Values are posted to each dial's mailbox without waiting, and each writer sends the latest value
+    of its dial as soon as its previous write finishes. A slow VU Server therefore costs freshness
+    (values are coalesced), never memory or a growing lag. A value that has waited longer than its
+    dial's `max_age` for a free connection is dropped instead of sent.
+
+    Write errors are kept per dial until collected with `errors`.
+
+    :param send: sends one dial value (e.g. VU1Client.set_dial)
+    :param concurrency: maximum number of writes in flight across all dials
+    :param max_age: age after which a value is dropped, by dial (seconds), defaults to no limit
+    """
+
+    def __init__(
+        self,
+        send: Callable[[DialType, int], Awaitable[Any]],
+        concurrency: int,
+        max_age: dict[DialType, float] | None = None,
+    ) -> None:
+        self.send = send
+        self.max_age = max_age or {}
+        self.mailboxes: dict[DialType, Mailbox[int]] = {}
+        self._limit = asyncio.Semaphore(concurrency)
+        self._writers: dict[DialType, asyncio.Task] = {}
+        self._errors: dict[DialType, BaseException] = {}
+
+    @property
+    def stats(self) -> dict[DialType, MailboxStats]:
+        """mailbox stats of each dial written to"""
+        return {dial: mailbox.stats for dial, mailbox in self.mailboxes.items()}
+
+    @property
+    def sent(self) -> int:
+        """number of values written across all dials"""
+        return sum(mailbox.stats.sent for mailbox in self.mailboxes.values())
+
+    def post(self, dial: DialType, value: int) -> None:
+        """Post a dial value, starting the dial's writer on first use
+
+        :param dial: dial to write
+        :param value: dial value
+        """
+        mailbox = self.mailboxes.setdefault(dial, Mailbox())
+        if dial not in self._writers:
+            self._writers[dial] = asyncio.create_task(self._write(dial, mailbox))
+        coalesced = mailbox.stats.coalesced
+        mailbox.post(value)
+        if mailbox.stats.coalesced > coalesced:
+            UPDATES_DISCARDED.labels(dial.value, "coalesced").inc()
+
+    def errors(self) -> dict[DialType, BaseException]:
+        """Collect write errors raised since the last call
+
+        :return: last error of each dial that failed
+        """
+        errors, self._errors = self._errors, {}
+        return errors
+
+    def discard(self, dial: DialType) -> None:
+        """stop writing a dial, dropping its pending value"""
+        task = self._writers.pop(dial, None)
+        if task is not None:
+            task.cancel()
+        mailbox = self.mailboxes.get(dial)
+        if mailbox is not None and mailbox.pending:
+            mailbox.clear()
+            UPDATES_DISCARDED.labels(dial.value, "dropped").inc()
+
+    async def close(self) -> None:
+        """stop every writer, dropping pending values (writers restart on the next post)"""
+        tasks = list(self._writers.values())
+        for dial in list(self._writers):
+            self.discard(dial)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _write(self, dial: DialType, mailbox: Mailbox[int]) -> None:
+        """send the latest value of a dial whenever one is posted"""
+        while True:
+            # take the value only once a slot is free, so a value posted meanwhile replaces it
+            await mailbox.wait()
+            async with self._limit:
+                if not mailbox.pending:
+                    continue
+                value, posted = await mailbox.take()
+                if mailbox.clock() - posted > self.max_age.get(dial, float("inf")):
+                    mailbox.stats.dropped += 1
+                    UPDATES_DISCARDED.labels(dial.value, "dropped").inc()
+                    continue
+                try:
+                    await self.send(dial, value)
+                except Exception as e:
+                    mailbox.stats.failed += 1
+                    self._errors[dial] = e
+                else:
+                    mailbox.stats.sent += 1
+                    mailbox.stats.lag = mailbox.clock() - posted
@@ -0,0 +1,111 @@
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Iterator
+
+
+@dataclass
+class RetryPolicy:
+    """Retry timing for requests to the VU Server
+
+    :param retries: number of retries after the first attempt
+    :param sleep: base wait before the first retry (seconds)
+    :param backoff: multiplier applied to the wait after every retry
+    :param max_sleep: upper bound of a single wait (seconds)
+    :param jitter: fraction (0-1) of each wait that is randomised
+    :param deadline: total time budget of a request including retries (seconds)
+    """
+
+    retries: int = 3
+    sleep: float = 2
+    backoff: float = 2.0
+    max_sleep: float = 30.0
+    jitter: float = 0.5
+    deadline: float | None = None
+
+    @classmethod
+    def from_settings(cls, timeouts: Any) -> "RetryPolicy":
+        """build a retry policy from the server.timeouts settings block"""
+        return cls(
+            retries=timeouts.retries,
+            sleep=timeouts.sleep,
+            backoff=timeouts.backoff,
+            max_sleep=timeouts.max_sleep,
+            jitter=timeouts.jitter,
+            deadline=timeouts.deadline,
+        )
+
+    def delays(self) -> Iterator[float]:
+        """yield the wait before each retry (exponential backoff with jitter)"""
+        for attempt in range(self.retries):
+            delay = min(self.max_sleep, self.sleep * self.backoff**attempt)
+            yield delay * (1 - self.jitter * random.random())
+
+    def remaining(self, started: float) -> float | None:
+        """seconds left before the deadline of a request started at `started` (monotonic)"""
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.monotonic() - started)
+
+
+class CircuitState(str, Enum):
+
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half-open"
+
+
+class CircuitBreaker:
+    """Stop sending requests to a failing VU Server
+
+    After `threshold` consecutive failures the circuit opens and requests are refused.
+    Once `reset_timeout` seconds have passed, up to `half_open_requests` probe requests are
+    let through: a success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0, half_open_requests: int = 1) -> None:
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_requests = half_open_requests
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @classmethod
+    def from_settings(cls, timeouts: Any) -> "CircuitBreaker":
+        """build a circuit breaker from the server.timeouts settings block"""
+        return cls(timeouts.failure_threshold, timeouts.reset_timeout, timeouts.half_open_requests)
+
+    def allow(self) -> bool:
+        """check whether a request may be sent"""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probes = 0
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probes >= self.half_open_requests:
+                return False
+            self._probes += 1
+
+        return True
+
+    def release(self) -> None:
+        """hand back a probe for a request that never reached the server"""
+        if self.state == CircuitState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        """record a successful request"""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """record a failed request"""
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.threshold:
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
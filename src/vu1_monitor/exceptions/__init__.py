@@ -1,7 +1,18 @@
+from vu1_monitor.exceptions.control import ControlError, ControlTimeout
 from vu1_monitor.exceptions.dials import (
+    CircuitOpen,
     DialNotFound,
     DialNotImplemented,
     ServerNotFound,
 )
+from vu1_monitor.exceptions.metrics import CollectorTimeout
 
-__all__ = ["DialNotFound", "DialNotImplemented", "ServerNotFound"]
+__all__ = [
+    "CircuitOpen",
+    "CollectorTimeout",
+    "ControlError",
+    "ControlTimeout",
+    "DialNotFound",
+    "DialNotImplemented",
+    "ServerNotFound",
+]
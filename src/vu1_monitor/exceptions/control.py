@@ -0,0 +1,9 @@
+class ControlError(Exception):
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+
+class ControlTimeout(ControlError):
+    """the monitoring daemon did not answer in time"""
@@ -17,3 +17,9 @@ class ServerNotFound(Exception):
     def __init__(self, message: str = "VU Server is unreachable. Is it on?"):
         self.message = message
         super().__init__(self.message)
+
+
+class CircuitOpen(ServerNotFound):
+
+    def __init__(self, message: str = "VU Server keeps failing, requests are paused"):
+        super().__init__(message)
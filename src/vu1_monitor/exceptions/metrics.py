@@ -0,0 +1,8 @@
+from vu1_monitor.models.models import DialType
+
+
+class CollectorTimeout(Exception):
+
+    def __init__(self, message: str, dial: DialType):
+        super().__init__(message)
+        self.dial = dial
@@ -1,9 +1,13 @@
-from vu1_monitor.files.compression import extract_tarfile
+from vu1_monitor.files.assets import read_asset
+from vu1_monitor.files.cache import clear_cache, read_cache, write_cache
 from vu1_monitor.files.lock import check_pid, read_lock, write_lock
 
 __all__ = [
     "check_pid",
     "read_lock",
     "write_lock",
-    "extract_tarfile",
+    "clear_cache",
+    "read_cache",
+    "write_cache",
+    "read_asset",
 ]
@@ -0,0 +1,32 @@
+import functools
+import tarfile
+from importlib import resources
+from pathlib import PurePosixPath
+
+ARCHIVE = "static/static.tgz"
+
+
+@functools.cache
+def _assets() -> dict[str, bytes]:
+    """decompress the bundled asset archive into memory, once per process"""
+    assets = {}
+    with resources.files("vu1_monitor").joinpath(ARCHIVE).open("rb") as archive:
+        with tarfile.open(fileobj=archive, mode="r:gz") as tar:
+            for member in tar:
+                file = tar.extractfile(member) if member.isfile() else None
+                if file is not None:
+                    assets[PurePosixPath(member.name).name] = file.read()
+    return assets
+
+
+def read_asset(name: str) -> bytes:
+    """Read a bundled asset from the package resources, without extracting it to disk
+
+    :param name: asset filename
+    :raises FileNotFoundError: Raised when no asset has the name.
+    :return: asset content
+    """
+    try:
+        return _assets()[name]
+    except KeyError as e:
+        raise FileNotFoundError(f"no bundled asset named {name}") from e
@@ -0,0 +1,44 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+
+def read_cache(path: Path, ttl: float) -> Any | None:
+    """read a JSON cache file
+
+    :param path: path of cache file
+    :param ttl: maximum age of the cache file (seconds)
+    :return: cached data, or None when missing, unreadable or expired
+    """
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        with open(path, "r") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return data
+
+
+def write_cache(path: Path, data: Any) -> None:
+    """write a JSON cache file
+
+    The file is replaced atomically, so concurrent readers never see a partial file.
+
+    :param path: path of cache file
+    :param data: data to cache
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.{os.getpid()}")
+    partial.write_text(json.dumps(data))
+    os.replace(partial, path)
+
+
+def clear_cache(path: Path) -> None:
+    """remove a cache file
+
+    :param path: path of cache file
+    """
+    path.unlink(missing_ok=True)
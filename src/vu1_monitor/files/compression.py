@@ -13,12 +13,3 @@ def make_tarfile(output_filename: Path, source_dir: Path) -> None:
     with tarfile.open(output_filename, "w:gz") as tar:
         for file in files:
             tar.add(file)
-
-
-def extract_tarfile(tarfile_name: Path) -> None:
-    """Extract a tarfile into a directory
-
-    :param tarfile_name: name of tar file to extract
-    """
-    with tarfile.open(tarfile_name) as tar:
-        tar.extractall()
@@ -1,16 +1,40 @@
-from vu1_monitor.handlers.dials import (
-    reset_dials,
-    set_backlight,
-    set_image,
-    start_monitoring,
-)
-from vu1_monitor.handlers.process import run_as_child, stop_pid
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from vu1_monitor.handlers.dials import (
+        monitoring_status,
+        reset_dials,
+        set_backlight,
+        set_image,
+        start_monitoring,
+    )
+    from vu1_monitor.handlers.process import run_as_child, stop_pid
+
+# handlers are imported on first use: the dial handlers load httpx, while process handlers don't
+_MODULES = {
+    "set_backlight": "vu1_monitor.handlers.dials",
+    "set_image": "vu1_monitor.handlers.dials",
+    "reset_dials": "vu1_monitor.handlers.dials",
+    "start_monitoring": "vu1_monitor.handlers.dials",
+    "monitoring_status": "vu1_monitor.handlers.dials",
+    "run_as_child": "vu1_monitor.handlers.process",
+    "stop_pid": "vu1_monitor.handlers.process",
+}
 
 __all__ = [
     "set_backlight",
     "set_image",
     "reset_dials",
     "start_monitoring",
+    "monitoring_status",
     "run_as_child",
     "stop_pid",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """import a handler's module on first access"""
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_MODULES[name]), name)
@@ -1,22 +1,33 @@
 import asyncio
 import functools
 import logging
+import signal
 import sys
+import time
+from dataclasses import asdict
 from pathlib import Path
-
-import psutil
-from PIL import Image
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from vu1_monitor.config import settings
-from vu1_monitor.dials import VU1Client
-from vu1_monitor.exceptions import DialNotImplemented, ServerNotFound
-from vu1_monitor.files import extract_tarfile
-from vu1_monitor.metrics import get_gpu_utilisation
+from vu1_monitor.dials import DialWriter, VU1Client
+from vu1_monitor.dials.client import SUPPRESSED
+from vu1_monitor.exceptions import ControlError, ControlTimeout, DialNotImplemented, ServerNotFound
 from vu1_monitor.models import Bright, Colours, DialType, Element
+from vu1_monitor.scheduler import PolicyEngine, Scheduler
+from vu1_monitor.telemetry import start_exporter
+from vu1_monitor.telemetry.instruments import (
+    OUTAGE_DURATION,
+    RECOVERY_DURATION,
+    SERVER_OUTAGES,
+    SERVER_UP,
+    TICK_DURATION,
+)
 
-logger = logging.getLogger(settings.name)
+if TYPE_CHECKING:
+    from vu1_monitor.control import ControlServer
+    from vu1_monitor.metrics import Recording
 
-FILETYPES = (".png", ".jpg", "jpeg")
+logger = logging.getLogger(settings.name)
 
 
 def server_not_found(func):
@@ -32,111 +43,450 @@ def server_not_found(func):
     return handle_not_found_errors
 
 
+async def _via_daemon(command: str, fallback: bool = True, **args: Any) -> dict | None:
+    """Send a command to the monitoring daemon
+
+    :param command: command to run
+    :param fallback: return None when the daemon doesn't answer in time (for the caller to contact the
+        VU Server directly), rather than raising, defaults to True
+    :raises ControlError: Raised when the daemon fails to run the command.
+    :return: response message, or None when no daemon is running
+    """
+    from vu1_monitor.control import send_command
+
+    try:
+        return await send_command(Path(settings.control.path).expanduser(), command, settings.control.timeout, **args)
+    except ControlTimeout as e:
+        if not fallback:
+            raise
+        logger.warning(f"{e.message}, contacting the VU Server directly")
+        return None
+
+
 @server_not_found
 async def set_backlight(colour: str, brightness: str, dial: DialType | None) -> None:
-    """Set backlight colour and brightness for a dial
+    """Set backlight colour and brightness for a dial, through the monitoring daemon when it is running
 
     :param colour: Pre-set colour to set dial to, defaults to WHITE.
     :param brightness: Brightness level to set dial to, defaults to LOW.
     :param dial: Dial to set, defaults to None (sets all dials).
     """
-    client = VU1Client(settings.server.hostname, settings.server.port, settings.server.key)
     adj_colour = tuple([int(value * Bright[brightness].value) for value in Colours[colour].value])
+    dial = DialType(dial) if dial else None
 
-    if not dial:
-        for type in DialType:
-            try:
-                await client.set_backlight(type, adj_colour)
-                logger.debug(f"{type.value} backlight set to {colour}")
-            except DialNotImplemented:
-                logger.warning(f"{type.value} backlight not set: dial not found")
-    else:
-        try:
-            await client.set_backlight(DialType(dial), adj_colour)
-            logger.debug(f"{dial} backlight set to {colour}")
-        except DialNotImplemented:
-            logger.error(f"{dial} backlight not set: dial not found")
+    try:
+        response = await _via_daemon("backlight", colour=adj_colour, dial=dial.value if dial else None)
+        if response is None:
+            async with VU1Client(settings.server.hostname, settings.server.port, settings.server.key) as client:
+                report = await _set_backlights(client, adj_colour, dial)
+        else:
+            report = response["data"]
+        _log_report(report, f"backlight set to {colour}", "backlight not set")
+    except ControlError as e:
+        logger.error(f"backlight not set: {e.message}")
+
+
+async def _set_backlights(client: VU1Client, colour: tuple[int, ...], dial: DialType | None) -> dict:
+    """set the backlight of a dial, or of every connected dial when dial is None"""
+    report = await client.set_backlights(colour, [dial] if dial else None, force=True)
+    return report.as_dict()
+
+
+def _log_report(report: dict, done: str, failed: str) -> None:
+    """log the per-dial outcome of a bulk operation (see `BulkReport.as_dict`)"""
+    for dial in report["done"]:
+        logger.debug(f"{dial} {done}")
+    for dial, error in report["failed"].items():
+        logger.error(f"{dial} {failed}: {error}")
+    for dial in report["skipped"]:
+        logger.warning(f"{dial} {failed}: dial not found")
 
 
 @server_not_found
-async def set_image(filename: str, dial: DialType) -> None:
-    """Set the image for a dial
+async def set_image(filename: str, dial: DialType, force: bool = False) -> None:
+    """Set the image for a dial, through the monitoring daemon when it is running
 
-    :param dial: :param dial: Dial to set
+    The image is converted to the dial display format first, so a file that is not an image fails
+    before anything is sent; the conversion is cached for the upload.
+
+    :param filename: Image file, of any size or format
+    :param dial: Dial to set
+    :param force: Upload the image even if the dial already shows it, defaults to False
     """
-    client = VU1Client(settings.server.hostname, settings.server.port, settings.server.key)
-    assert filename.endswith(FILETYPES), f"file must be of type: {FILETYPES}"
+    from vu1_monitor.images import prepare_image
 
-    width, height = Image.open(filename).size
-    assert (width * height) == (200 * 144), "image must be exactly 144 x 200 pixels"
+    path = Path(filename).resolve()
+    try:
+        await prepare_image(path)
+    except OSError as e:
+        logger.critical(f"{filename} is not a readable image: {e}")
+        sys.exit(1)
 
     try:
-        await client.set_image(dial, Path(filename))
-        logger.debug(f"{dial} image set to {filename}")
+        response = await _via_daemon("image", filename=str(path), dial=dial.value, force=force)
+        if response is None:
+            async with VU1Client(settings.server.hostname, settings.server.port, settings.server.key) as client:
+                response = {"data": await client.set_image(dial, path, force=force)}
+        if response["data"] == SUPPRESSED:
+            logger.debug(f"{dial} already shows {filename}")
+        else:
+            logger.debug(f"{dial} image set to {filename}")
     except DialNotImplemented:
         logger.error(f"{dial} image not set: dial not found")
+    except ControlError as e:
+        logger.error(f"{dial} image not set: {e.message}")
+
+
+async def monitoring_status() -> None:
+    """Log live dial values and loop stats of the monitoring daemon (without contacting the VU Server)"""
+    try:
+        response = await _via_daemon("status", fallback=False)
+    except ControlError as e:
+        logger.error(f"status unavailable: {e.message}")
+        return
+
+    if response is None:
+        logger.warning("status unavailable: no monitoring running")
+        return
+
+    status = response["data"]
+    logger.info(f"monitoring for {status['uptime']:.0f}s, VU Server requests {status['breaker']}")
+    for name, dial in status["dials"].items():
+        value = "-" if dial["value"] is None else f"{dial['value']:.1f}"
+        mailbox = dial.get("mailbox") or {}
+        discarded = f", coalesced: {mailbox['coalesced']}, dropped: {mailbox['dropped']}" if mailbox else ""
+        logger.info(
+            f"{name}: {value} (every {dial['interval']:g}s, ticks: {dial['ticks']}, "
+            f"overruns: {dial['overruns']}, missed: {dial['missed']}{discarded}"
+            f"{', disabled' if dial['disabled'] else ''})"
+        )
+    for element, writes in status["writes"].items():
+        logger.info(f"{element} writes sent: {writes['sent']}, suppressed: {writes['suppressed']}")
 
 
 @server_not_found
-async def start_monitoring(interval: int, cpu: bool, gpu: bool, mem: bool, net: bool, auto: bool) -> None:
+async def start_monitoring(
+    interval: int,
+    cpu: bool,
+    gpu: bool,
+    mem: bool,
+    net: bool,
+    auto: bool,
+    control: bool = False,
+    record: Path | None = None,
+    replay: Path | None = None,
+    speed: float = 1.0,
+) -> None:
     """Start VU1-Monitoring
 
-    :param interval: Wait interval between each update (seconds)
+    :param interval: Interval between each update (seconds), unless a dial policy sets its own interval
     :param cpu: Flag for CPU Dial updates
     :param gpu: Flag for GPU Dial updates
     :param mem: Flag for Memory Dial updates
     :param net: Flag for Network Dial updates
     :param auto: Flag for automatic dial updates *checks for all existing dials and overrides negative dial flags)
+    :param control: Flag for serving commands from other vu1-monitor processes on the control socket
+    :param record: Recording file every sample is appended to, defaults to None
+    :param replay: Recording to replay instead of sampling live metrics (stops at its end), defaults to None
+    :param speed: Playback speed of a replay; intervals and sample rates are scaled by it, defaults to 1
     """
-    client = VU1Client(settings.server.hostname, settings.server.port, settings.server.key)
-    logger.info("running VU1-Monitor..")
-
     if True not in [cpu, gpu, mem, net, auto]:
         logger.critical("at least one dial must be set to update")
         sys.exit(1)
 
-    bytes_recv = psutil.net_io_counters().bytes_recv
+    from vu1_monitor.metrics import (
+        Recorder,
+        ReplayCollector,
+        Sampler,
+        build_collectors,
+        build_replay_collectors,
+        build_samplers,
+    )
+
+    flags = {DialType.CPU: cpu, DialType.GPU: gpu, DialType.MEMORY: mem, DialType.NETWORK: net}
+    candidates = set(DialType) if auto else {dial for dial, flag in flags.items() if flag}
+    recording = _open_recording(replay, candidates) if replay else None
+    if recording is not None:
+        candidates &= recording.dials
+    else:
+        speed = 1.0
+    recorder = Recorder(record) if record else None
+    disabled: set[DialType] = set()
+
+    async with VU1Client(settings.server.hostname, settings.server.port, settings.server.key) as client:
+        logger.info("running VU1-Monitor..")
+        if not auto:
+            for dial in sorted(candidates - client.dials.keys()):
+                logger.critical(f"failed to update {dial.value}: dial not found")
+                disabled.add(dial)
+
+        def plan() -> tuple[PolicyEngine, dict[DialType, float]]:
+            """plan the publish intervals of the connected dials within the request budget"""
+            engine = PolicyEngine.from_settings((candidates & client.dials.keys()) - disabled, interval)
+            planned = {dial: value / speed for dial, value in engine.intervals.items()}
+            for dial, wanted in engine.throttled.items():
+                logger.warning(
+                    f"{dial.value} updates every {planned[dial]:.2f}s instead of {wanted}s "
+                    f"to stay within {engine.budget} requests per second"
+                )
+            return engine, planned
+
+        policies, intervals = plan()
+        if not intervals:
+            logger.critical("no dials left to update")
+            sys.exit(1)
+        _cancel_on_terminate()
+
+        samplers: dict[DialType, Sampler] = {}
+        sampling: list[asyncio.Task] = []
+        scheduler = Scheduler(intervals)
+        writer = DialWriter(client.set_dial, settings.server.concurrency, max_age=intervals)
+        refreshing = asyncio.create_task(refresh_dials(client, settings.server.cache.refresh))
+        exporting = await start_exporter() if settings.telemetry.enabled else []
+        latest: dict[DialType, float] = {}
+        started_at = time.monotonic()
+        outages, down_since, recovering = 0, None, None
+        replayed = False
+        SERVER_UP.set(1)
+
+        async def status() -> dict:
+            """live dial values and loop stats"""
+            return {
+                "uptime": time.monotonic() - started_at,
+                "breaker": client.breaker.state.value,
+                "outages": outages,
+                "down": None if down_since is None else time.monotonic() - down_since,
+                "dials": {
+                    dial.value: {
+                        "value": latest.get(dial),
+                        "interval": intervals[dial],
+                        "priority": policies.policies[dial].priority,
+                        "disabled": dial in disabled,
+                        **asdict(scheduler.stats[dial]),
+                        "mailbox": asdict(writer.stats[dial]) if dial in writer.stats else None,
+                    }
+                    for dial in sorted(intervals)
+                },
+                "writes": {element.value: asdict(stats) for element, stats in client.write_stats.items()},
+            }
+
+        controller = await _start_controller(client, status) if control else None
+
+        try:
+            async for due in scheduler.ticks():
+                started = time.perf_counter()
+                connected = (candidates & client.dials.keys()) - disabled
+                if connected and connected != intervals.keys():
+                    # dials were connected or disconnected: share the budget among the connected dials only
+                    policies, intervals = plan()
+                    scheduler.reschedule(intervals)
+                    writer.max_age = intervals
+                    for dial, sampler in samplers.items():
+                        if dial in intervals:
+                            sampler.resize(intervals[dial])
+                    due = {dial: elapsed for dial, elapsed in due.items() if dial in intervals}
+                dials = {dial for dial in due if flags[dial] or (auto and client.check_dial(dial))} - disabled
 
+                for dial in dials - samplers.keys():
+                    collectors = (
+                        build_replay_collectors(recording, {dial}, speed) if recording else build_collectors({dial})
+                    )
+                    samplers.update(build_samplers(collectors, policies.policies, intervals, speed, recorder))
+                    sampling.append(asyncio.create_task(samplers[dial].run()))
+
+                if replayed:
+                    logger.info(f"replay of {replay} finished")
+                    break
+                # the last replayed values are published, then written before the next tick ends monitoring
+                replayed = bool(samplers) and all(
+                    isinstance(sampler.collector, ReplayCollector) and sampler.collector.finished
+                    for sampler in samplers.values()
+                )
+
+                published = {dial: samplers[dial].publish() for dial in dials}
+                values = {dial: value for dial, value in published.items() if value is not None}
+                latest.update(values)
+                for dial, value in values.items():
+                    writer.post(dial, int(value))
+                TICK_DURATION.observe(time.perf_counter() - started)
+
+                if recovering is not None and writer.sent > recovering[1]:
+                    RECOVERY_DURATION.observe(time.monotonic() - recovering[0])
+                    logger.info(f"dial updates resumed after {time.monotonic() - recovering[0]:.1f}s")
+                    recovering = None
+
+                lost = None
+                errors = writer.errors()
+                for dial, error in errors.items():
+                    if isinstance(error, DialNotImplemented) and flags[dial]:
+                        logger.critical(f"failed to update {dial.value}: dial not found")
+                        disabled.add(dial)
+                        writer.discard(dial)
+                    elif isinstance(error, DialNotImplemented):
+                        logger.warning(f"failed to update {dial.value}: dial disconnected")
+                    elif isinstance(error, ServerNotFound):
+                        lost = error
+                    else:
+                        logger.error(f"failed to update {dial.value}: {error!r}")
+
+                if lost is not None:
+                    if not settings.server.reconnect.enabled:
+                        raise lost
+                    logger.warning(f"{lost.message} (pausing updates until it is back)")
+                    down_since = time.monotonic()
+                    outages += 1
+                    SERVER_OUTAGES.inc()
+                    SERVER_UP.set(0)
+                    await writer.close()
+                    OUTAGE_DURATION.observe(await wait_for_server(client))
+                    SERVER_UP.set(1)
+                    recovering, down_since = (down_since, writer.sent), None
+                    for dial in latest.keys() - disabled:
+                        if client.check_dial(dial):
+                            writer.post(dial, int(latest[dial]))
+                    continue
+
+                if not auto and candidates <= disabled:
+                    logger.critical("no dials left to update")
+                    sys.exit(1)
+
+                if values and not errors:
+                    latency = ", ".join(
+                        f"{dial.value} {samplers[dial].collector.latency * 1000:.1f}ms" for dial in values
+                    )
+                    logger.debug(f"update published (sampled: {latency})")
+        except asyncio.CancelledError:
+            logger.info("stopping VU1-Monitor..")
+            stats = client.write_stats[Element.DIAL]
+            logger.info(f"dial writes sent: {stats.sent}, suppressed: {stats.suppressed}")
+            for dial, ticks in scheduler.stats.items():
+                logger.info(f"{dial.value} ticks: {ticks.ticks}, overruns: {ticks.overruns}, missed: {ticks.missed}")
+            for dial, mailbox in writer.stats.items():
+                logger.info(f"{dial.value} values coalesced: {mailbox.coalesced}, dropped: {mailbox.dropped}")
+        finally:
+            await writer.close()
+            if recorder is not None:
+                recorder.close()
+            if recording is not None:
+                recording.close()
+            refreshing.cancel()
+            for task in sampling + exporting:
+                task.cancel()
+            await asyncio.gather(*sampling, *exporting, return_exceptions=True)
+            if controller is not None:
+                await controller.close()
+
+
+def _open_recording(path: Path, dials: set[DialType]) -> "Recording":
+    """open a recording to replay, exiting when it can't be read or has none of the dials"""
+    from vu1_monitor.metrics import Recording
+
+    try:
+        recording = Recording(path)
+    except (OSError, ValueError) as e:
+        logger.critical(f"failed to open recording: {e}")
+        sys.exit(1)
+    if not dials & recording.dials:
+        logger.critical(f"{path} has no samples of {', '.join(sorted(dial.value for dial in dials))}")
+        sys.exit(1)
+    for dial in sorted(dials - recording.dials):
+        logger.warning(f"{path} has no samples of {dial.value}, it won't be updated")
+    return recording
+
+
+async def _start_controller(client: VU1Client, status: Callable[[], Awaitable[dict]]) -> "ControlServer | None":
+    """serve CLI commands with the daemon's client on the control socket"""
+    from vu1_monitor.control import ControlServer
+
+    async def backlight(colour: list[int], dial: str | None) -> dict:
+        return await _set_backlights(client, tuple(colour), DialType(dial) if dial else None)
+
+    async def image(filename: str, dial: str, force: bool = False) -> dict:
+        return await client.set_image(DialType(dial), Path(filename), force=force)
+
+    async def reset(element: str) -> dict:
+        return await _reset(client, Element(element))
+
+    controller = ControlServer({"backlight": backlight, "image": image, "reset": reset, "status": status})
+    try:
+        await controller.start(Path(settings.control.path).expanduser())
+    except OSError as e:
+        logger.warning(f"failed to listen for commands: {e}")
+        return None
+    return controller
+
+
+async def wait_for_server(client: VU1Client) -> float:
+    """Probe the VU Server with exponential backoff until it answers, then rediscover its dials
+
+    :param client: VU1 client to reconnect
+    :return: time the VU Server was unreachable (seconds)
+    """
+    config = settings.server.reconnect
+    started, delay = time.monotonic(), config.sleep
     while True:
+        await asyncio.sleep(delay)
         try:
-            if cpu or (auto and client.check_dial(DialType.CPU)):
-                cpu_percent = int(psutil.cpu_percent())
-                await client.set_dial(DialType.CPU, cpu_percent)
-
-            if gpu or (auto and client.check_dial(DialType.GPU)):
-                gpu_percent = int(get_gpu_utilisation(settings.gpu.backend))
-                await client.set_dial(DialType.GPU, gpu_percent)
-
-            if mem or (auto and client.check_dial(DialType.MEMORY)):
-                memory_percent = int(psutil.virtual_memory().percent)
-                await client.set_dial(DialType.MEMORY, memory_percent)
-
-            if net or (auto and client.check_dial(DialType.NETWORK)):
-                bytes_recv_updated = psutil.net_io_counters().bytes_recv
-                mb_rev = (bytes_recv_updated - bytes_recv) / (1024 * 1024)
-                await client.set_dial(DialType.NETWORK, int(mb_rev))
-                bytes_recv = bytes_recv_updated
-
-        except DialNotImplemented as e:
-            logger.critical(f"failed to update {e.dial.value}: dial not found")
-            sys.exit(1)
+            dials = await client.reconnect()
+        except ServerNotFound:
+            logger.debug(f"VU Server still unreachable, retrying in {delay:.1f}s")
+        except Exception as e:
+            logger.debug(f"VU Server not ready: {e!r}")
+        else:
+            outage = time.monotonic() - started
+            logger.info(f"VU Server back after {outage:.1f}s, dials found: {', '.join(dial.value for dial in dials)}")
+            return outage
+        delay = min(config.max_sleep, delay * config.backoff)
 
-        logger.debug("update successful")
-        await asyncio.sleep(interval)
+
+async def refresh_dials(client: VU1Client, period: float) -> None:
+    """Periodically rediscover dials so newly connected dials are picked up
+
+    :param client: VU1 client to refresh
+    :param period: time between refreshes (seconds)
+    """
+    while True:
+        await asyncio.sleep(period)
+        try:
+            dials = await client.refresh_dials()
+            logger.debug(f"dials refreshed: {', '.join(dial.value for dial in dials)}")
+        except Exception as e:
+            logger.warning(f"failed to refresh dials: {e}")
+
+
+def _cancel_on_terminate() -> None:
+    """cancel the running monitoring task on SIGTERM so connections are closed cleanly"""
+    task = asyncio.current_task()
+    if task is not None:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
 
 
 @server_not_found
-async def reset_dials(element: Element) -> None:
-    """reset all dials
+async def reset_dials(element: Element, daemon: bool = True) -> None:
+    """reset all dials, through the monitoring daemon when it is running
 
     :element: Dial element to reset
+    :daemon: Send the reset through the monitoring daemon when it is running, defaults to True
     """
-    client = VU1Client(settings.server.hostname, settings.server.port, settings.server.key)
+    try:
+        response = await _via_daemon("reset", element=element.value) if daemon else None
+        if response is None:
+            async with VU1Client(settings.server.hostname, settings.server.port, settings.server.key) as client:
+                report = await _reset(client, element)
+        else:
+            report = response["data"]
+        _log_report(report, f"{element.value} reset", f"{element.value} not reset")
+    except ControlError as e:
+        logger.error(f"{element.value} not reset: {e.message}")
+
+
+async def _reset(client: VU1Client, element: Element) -> dict:
+    """reset an element of all dials"""
     match element:
         case Element.DIAL:
-            await client.reset_dials()
+            report = await client.reset_dials()
         case Element.BACKLIGHT:
-            await client.reset_backlights()
+            report = await client.reset_backlights()
         case Element.IMAGE:
-            extract_tarfile(Path("src/vu1_monitor/static/static.tgz"))
-            await client.reset_images()
+            report = await client.reset_images()
+    return report.as_dict()
@@ -17,8 +17,8 @@ def run_as_child(commands: list[str]) -> None:
     if not check_pid("pid"):
         proc = subprocess.Popen(
             commands,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             start_new_session=True,
         )
         write_lock({"pid": proc.pid})
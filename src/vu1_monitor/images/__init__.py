@@ -0,0 +1,9 @@
+from vu1_monitor.images.pipeline import (
+    SIZE,
+    PreparedImage,
+    convert_image,
+    prepare_image,
+    prepare_image_sync,
+)
+
+__all__ = ["SIZE", "PreparedImage", "convert_image", "prepare_image", "prepare_image_sync"]
@@ -0,0 +1,119 @@
+import asyncio
+import contextlib
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from vu1_monitor.config import settings
+
+# dial display (width, height)
+SIZE = (200, 144)
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """An image converted to the dial display format, ready to upload"""
+
+    data: bytes
+    digest: str
+
+    @property
+    def filename(self) -> str:
+        """content-addressed upload filename"""
+        return f"{self.digest}.png"
+
+
+def convert_image(data: bytes) -> bytes:
+    """Convert an image of any size or format to a dial display PNG
+
+    The image is scaled to fit the display, keeping its aspect ratio, and padded with white.
+
+    :param data: encoded source image
+    :raises OSError: Raised when the data is not a readable image.
+    :return: encoded PNG
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source).convert("RGB")
+    if image.size != SIZE:
+        image = ImageOps.pad(image, SIZE, color="white")
+
+    output = io.BytesIO()
+    image.save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+def _read(path: Path) -> tuple[bytes, str]:
+    """read a file in chunks, hashing it as it streams"""
+    digest, chunks = hashlib.sha256(), []
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+            chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+def _cache_dir() -> Path | None:
+    """directory of converted images, or None when caching is disabled"""
+    if not settings.server.cache.enabled:
+        return None
+    return Path(settings.server.cache.path).expanduser() / "images"
+
+
+def _prune(cache_dir: Path, keep: int) -> None:
+    """remove all but the `keep` most recently used converted images"""
+    images = []
+    for path in cache_dir.glob("*.png"):
+        with contextlib.suppress(FileNotFoundError):
+            images.append((path.stat().st_mtime, path))
+    for _, path in sorted(images, reverse=True)[keep:]:
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+def prepare_image_sync(source: Path | bytes) -> PreparedImage:
+    """Convert an image to the dial display format, reusing a previous conversion of the same content
+
+    :param source: image file, or encoded image
+    :raises OSError: Raised when the source cannot be read or is not an image.
+    :return: converted image
+    """
+    if isinstance(source, Path):
+        data, source_digest = _read(source)
+    else:
+        data, source_digest = source, hashlib.sha256(source).hexdigest()
+
+    cache_dir = _cache_dir()
+    cached = cache_dir / f"{source_digest}.png" if cache_dir else None
+    if cached is not None and cached.exists():
+        converted, digest = _read(cached)
+        with contextlib.suppress(OSError):
+            # mark as recently used, so pruning evicts it last
+            os.utime(cached)
+        return PreparedImage(converted, digest)
+
+    converted = convert_image(data)
+    if cached is not None:
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            partial = cached.with_name(f".{cached.name}.{os.getpid()}")
+            partial.write_bytes(converted)
+            os.replace(partial, cached)
+            _prune(cached.parent, settings.server.cache.images)
+        except OSError:
+            pass
+    return PreparedImage(converted, hashlib.sha256(converted).hexdigest())
+
+
+async def prepare_image(source: Path | bytes) -> PreparedImage:
+    """Convert an image to the dial display format in a worker thread (see `prepare_image_sync`)
+
+    :param source: image file, or encoded image
+    :raises OSError: Raised when the source cannot be read or is not an image.
+    :return: converted image
+    """
+    return await asyncio.to_thread(prepare_image_sync, source)
@@ -1,20 +1,13 @@
 import asyncio
+from pathlib import Path
 
 import click
 
 from vu1_monitor.config import settings
-from vu1_monitor.handlers import (
-    reset_dials,
-    run_as_child,
-    set_backlight,
-    set_image,
-    start_monitoring,
-    stop_pid,
-)
 from vu1_monitor.logger import create_logger
 from vu1_monitor.models import Bright, Colours, DialType, Element
 
-logger = create_logger(settings.name, settings.server.logging_level)
+# handlers are imported within each command, so a command only loads the dependencies it uses
 
 COLOURS = [item.name for item in Colours]
 BRIGHT = [item.name for item in Bright]
@@ -23,7 +16,7 @@ BRIGHT = [item.name for item in Bright]
 @click.group
 def main() -> None:
     """main command group"""
-    pass
+    create_logger(settings.name, settings.server.logging_level)
 
 
 @main.command(help="set the backlight colour and brightness of a dial")
@@ -32,21 +25,28 @@ def main() -> None:
 @click.option("--dial", "-d", default=None, type=DialType)
 def backlight(colour: str, brightness: str, dial: DialType | None) -> None:
     """set backlight of a dial"""
+    from vu1_monitor.handlers.dials import set_backlight
+
     asyncio.run(set_backlight(colour, brightness, dial))
 
 
 @main.command(help="set the image of a dial")
 @click.argument("filename", type=click.Path(exists=True))
 @click.option("--dial", "-d", required=True, type=DialType)
-def image(filename: str, dial: DialType) -> None:
+@click.option("--force", is_flag=True, default=False, help="upload even if the dial already shows the image")
+def image(filename: str, dial: DialType, force: bool) -> None:
     """Set the image for a dial"""
-    asyncio.run(set_image(filename, dial))
+    from vu1_monitor.handlers.dials import set_image
+
+    asyncio.run(set_image(filename, dial, force))
 
 
 @main.command(help="reset all dials to default")
 @click.argument("element", type=Element, required=True)
 def reset(element: Element) -> None:
     """reset all dials"""
+    from vu1_monitor.handlers.dials import reset_dials
+
     asyncio.run(reset_dials(element))
 
 
@@ -57,24 +57,58 @@ def reset(element: Element) -> None:
 @click.option("--gpu/--no-gpu", default=False, help=f"update {DialType.GPU.value} dial")
 @click.option("--mem/--no-mem", default=False, help=f"update {DialType.MEMORY.value} dial")
 @click.option("--net/--no-net", default=False, help=f"update {DialType.NETWORK.value} dial")
-def run(interval: int, cpu: bool, gpu: bool, mem: bool, net: bool, auto: bool) -> None:
+@click.option("--control/--no-control", default=False, help="serve other vu1-monitor commands on the control socket")
+@click.option("--record", type=click.Path(dir_okay=False, path_type=Path), help="append every sample to a recording")
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="replay a recording instead of live metrics",
+)
+@click.option("--speed", default=1.0, type=click.FloatRange(min=0, min_open=True), help="replay speed")
+def run(
+    interval: int,
+    cpu: bool,
+    gpu: bool,
+    mem: bool,
+    net: bool,
+    auto: bool,
+    control: bool,
+    record: Path | None,
+    replay: Path | None,
+    speed: float,
+) -> None:
     """Run VU1-Monitoring"""
-    asyncio.run(start_monitoring(interval, cpu, gpu, mem, net, auto))
+    from vu1_monitor.handlers.dials import start_monitoring
+
+    asyncio.run(start_monitoring(interval, cpu, gpu, mem, net, auto, control, record, replay, speed))
 
 
 @main.command(help="start monitoring in background (auto checks for dials)")
 @click.option("--interval", "-i", default=2, help="update interval (seconds)")
 def start(interval: int) -> None:
     """Start VU1-Monitoring (detatched)"""
-    commands = ["vu1-monitor", "run", "-i", str(interval), "--auto"]
+    from vu1_monitor.handlers.process import run_as_child
+
+    commands = ["vu1-monitor", "run", "-i", str(interval), "--auto", "--control"]
     run_as_child(commands)
 
 
 @main.command(help="stop monitoring")
 def stop() -> None:
     """Stop VU1-Monitoring"""
+    from vu1_monitor.handlers.dials import reset_dials
+    from vu1_monitor.handlers.process import stop_pid
+
     stop_pid()
-    asyncio.run(reset_dials(Element.DIAL))
+    asyncio.run(reset_dials(Element.DIAL, daemon=False))
+
+
+@main.command(help="show live dial values and stats of background monitoring")
+def status() -> None:
+    """Show VU1-Monitoring status"""
+    from vu1_monitor.handlers.dials import monitoring_status
+
+    asyncio.run(monitoring_status())
 
 
 if __name__ == "__main__":
@@ -1 +1,42 @@
+from vu1_monitor.metrics.amdgpu import AMDGPUBackend
+from vu1_monitor.metrics.collectors import (
+    Collector,
+    CPUCollector,
+    GPUCollector,
+    MemoryCollector,
+    NetworkCollector,
+    build_collectors,
+)
+from vu1_monitor.metrics.cores import CoreCPU, node_cpus, parse_cpulist
 from vu1_monitor.metrics.gpu import get_gpu_utilisation
+from vu1_monitor.metrics.network import NetworkThroughput, scale_throughput
+from vu1_monitor.metrics.recording import Recorder, Recording, ReplayCollector, build_replay_collectors
+from vu1_monitor.metrics.sampling import Sampler, build_samplers
+from vu1_monitor.metrics.sketch import QuantileSketch, SlidingQuantile
+from vu1_monitor.metrics.window import RingBuffer, Window
+
+__all__ = [
+    "AMDGPUBackend",
+    "Collector",
+    "CoreCPU",
+    "CPUCollector",
+    "GPUCollector",
+    "MemoryCollector",
+    "NetworkCollector",
+    "NetworkThroughput",
+    "QuantileSketch",
+    "Recorder",
+    "Recording",
+    "ReplayCollector",
+    "RingBuffer",
+    "Sampler",
+    "SlidingQuantile",
+    "Window",
+    "build_collectors",
+    "build_replay_collectors",
+    "build_samplers",
+    "get_gpu_utilisation",
+    "node_cpus",
+    "parse_cpulist",
+    "scale_throughput",
+]
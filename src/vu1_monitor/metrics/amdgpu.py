@@ -0,0 +1,100 @@
+import re
+import statistics
+from pathlib import Path
+
+from vu1_monitor.metrics.procfs import ROOT, ProcFile
+
+AMD_VENDOR = 0x1002
+CARD = re.compile(r"card\d+")
+
+
+class AMDGPUDevice:
+    """An amdgpu device, with its sysfs files kept open
+
+    :param path: device directory (e.g. /sys/class/drm/card0/device)
+    :raises OSError: Raised when the device doesn't report its utilisation.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.busy = ProcFile(path / "gpu_busy_percent", 64)
+        try:
+            self.vram_total = int((path / "mem_info_vram_total").read_text())
+            self.vram_used: ProcFile | None = ProcFile(path / "mem_info_vram_used", 64)
+        except (OSError, ValueError):
+            # APUs without dedicated memory, or older kernels
+            self.vram_used, self.vram_total = None, 0
+
+    def utilisation(self) -> int:
+        """GPU utilisation (percent)"""
+        return _read_int(self.busy)
+
+    def vram_percent(self) -> float:
+        """VRAM in use (0-100), 0 when unknown"""
+        if self.vram_used is None or self.vram_total <= 0:
+            return 0.0
+        return 100.0 * _read_int(self.vram_used) / self.vram_total
+
+    def close(self) -> None:
+        """close the device files"""
+        self.busy.close()
+        if self.vram_used is not None:
+            self.vram_used.close()
+
+
+def _read_int(file: ProcFile) -> int:
+    """integer value of a single-value sysfs file"""
+    return int(file.buffer[: file.read()])
+
+
+def amd_devices(root: Path = ROOT) -> list[Path]:
+    """Device directories of AMD GPUs driven by amdgpu
+
+    :param root: filesystem root, defaults to /
+    :return: device directories, in card order
+    """
+    cards = [card for card in (root / "sys" / "class" / "drm").glob("card*") if CARD.fullmatch(card.name)]
+    devices = []
+    for card in sorted(cards, key=lambda card: int(card.name[4:])):
+        device = card / "device"
+        try:
+            vendor = int((device / "vendor").read_text(), 16)
+        except (OSError, ValueError):
+            continue
+        if vendor == AMD_VENDOR and (device / "gpu_busy_percent").exists():
+            devices.append(device)
+    return devices
+
+
+class AMDGPUBackend:
+    """Reads AMD GPU utilisation from the amdgpu driver's sysfs files, without ADL
+
+    Devices are discovered once and their files kept open, so a sample is one read per device.
+
+    :param root: filesystem root, defaults to /
+    :raises OSError: Raised when no amdgpu device is found.
+    """
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.devices = [AMDGPUDevice(path) for path in amd_devices(root)]
+        if not self.devices:
+            raise OSError(f"no amdgpu devices found in {root / 'sys' / 'class' / 'drm'}")
+
+    def utilisation(self) -> float:
+        """return AMD GPU utilisation (all devices)"""
+        if not self.devices:
+            return 0.0
+        return statistics.fmean(device.utilisation() for device in self.devices)
+
+    def vram_percent(self) -> float:
+        """return AMD GPU VRAM in use (devices with dedicated memory, 0-100)"""
+        devices = [device for device in self.devices if device.vram_total > 0]
+        if not devices:
+            return 0.0
+        return statistics.fmean(device.vram_percent() for device in devices)
+
+    def close(self) -> None:
+        """close the device files"""
+        for device in self.devices:
+            device.close()
+        self.devices = []
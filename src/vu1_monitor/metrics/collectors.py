@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from pathlib import Path
+
+import psutil
+
+from vu1_monitor.config import settings
+from vu1_monitor.exceptions.metrics import CollectorTimeout
+from vu1_monitor.metrics.cores import CoreCPU, node_cpus, parse_cpulist
+from vu1_monitor.metrics.gpu import get_gpu_utilisation, get_gpu_vram
+from vu1_monitor.metrics.network import NetworkThroughput, directional, scale_throughput
+from vu1_monitor.metrics.procfs import (
+    CgroupCPU,
+    CgroupMemory,
+    ProcMeminfo,
+    ProcNetDev,
+    ProcStat,
+    ProcStatCores,
+    cgroup_dir,
+)
+from vu1_monitor.models.models import (
+    CPUStatistic,
+    DialType,
+    GPUBackend,
+    GPUMetric,
+    MetricsBackend,
+    NetworkDirection,
+    NetworkScale,
+)
+from vu1_monitor.telemetry.instruments import COLLECTOR_DURATION
+
+logger = logging.getLogger(settings.name)
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """shared worker pool for blocking metric samplers"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.metrics.workers, thread_name_prefix="vu1-collector")
+    return _executor
+
+
+class Collector(ABC):
+    """Samples a metric for a dial in a worker thread, off the event loop
+
+    :param timeout: Maximum time to wait for a sample (seconds)
+    :param executor: Worker pool to sample in, defaults to the shared collector pool
+    """
+
+    dial: DialType
+
+    def __init__(self, timeout: float = 1.0, executor: Executor | None = None) -> None:
+        self.timeout = timeout
+        self.executor = executor
+        self.latency = 0.0
+        self._pending: Future | None = None
+
+    @abstractmethod
+    def sample(self) -> float:
+        """take a blocking sample of the metric (0-100 dial scale)"""
+
+    async def collect(self) -> float:
+        """Sample the metric in the worker pool
+
+        :raises CollectorTimeout: Raised when sampling takes longer than the timeout, or a previous sample is still running.
+        :return: sampled value
+        """
+        if self._pending is not None and not self._pending.done():
+            raise CollectorTimeout(f"{self.dial.value} collector is still running a previous sample", self.dial)
+
+        self._pending = (self.executor or get_executor()).submit(self.sample)
+        started = time.perf_counter()
+        sampling = asyncio.wrap_future(self._pending)
+        try:
+            # asyncio.wait rather than wait_for, which can swallow a cancellation arriving as the sample completes
+            done, _ = await asyncio.wait({sampling}, timeout=self.timeout)
+            if not done:
+                sampling.cancel()
+                raise CollectorTimeout(f"{self.dial.value} collector timed out after {self.timeout}s", self.dial)
+            return sampling.result()
+        finally:
+            self.latency = time.perf_counter() - started
+            COLLECTOR_DURATION.labels(self.dial.value).observe(self.latency)
+
+
+class CPUCollector(Collector):
+
+    dial = DialType.CPU
+
+    def __init__(self, source: ProcStat | CgroupCPU | CoreCPU | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.source = source
+
+    def sample(self) -> float:
+        """system-wide (or cgroup, or per-core statistic of) CPU utilisation since the last sample"""
+        return self.source.cpu_percent() if self.source else psutil.cpu_percent()
+
+
+class GPUCollector(Collector):
+    """GPU utilisation or VRAM use, averaged over all devices
+
+    :param backend: GPU backend, defaults to none (always 0)
+    :param metric: metric shown, defaults to utilisation
+    """
+
+    dial = DialType.GPU
+
+    def __init__(self, backend: str | None = None, metric: GPUMetric = GPUMetric.UTILISATION, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.backend = backend
+        self.metric = metric
+
+    def sample(self) -> float:
+        """GPU utilisation or VRAM in use (all devices)"""
+        if self.metric == GPUMetric.VRAM:
+            return get_gpu_vram(self.backend)
+        return get_gpu_utilisation(self.backend)
+
+
+class MemoryCollector(Collector):
+
+    dial = DialType.MEMORY
+
+    def __init__(self, source: ProcMeminfo | CgroupMemory | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.source = source
+
+    def sample(self) -> float:
+        """virtual memory (or cgroup memory) utilisation"""
+        return self.source.memory_percent() if self.source else psutil.virtual_memory().percent
+
+
+class NetworkCollector(Collector):
+    """Throughput of the selected network interfaces, mapped onto the dial
+
+    :param throughput: per-interface throughput, defaults to all interfaces through psutil
+    :param direction: direction(s) of traffic shown, defaults to the busiest direction
+    :param scale: how throughput is mapped onto the dial, defaults to linear
+    :param capacity: throughput at the top of the dial in one direction (Mbit/s), defaults to the link speed
+    """
+
+    dial = DialType.NETWORK
+
+    def __init__(
+        self,
+        throughput: NetworkThroughput | None = None,
+        direction: NetworkDirection = NetworkDirection.MAX,
+        scale: NetworkScale = NetworkScale.LINEAR,
+        capacity: float | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.throughput = throughput or NetworkThroughput()
+        self.direction = direction
+        self.scale = scale
+        self.capacity = capacity
+
+    def sample(self) -> float:
+        """throughput since the last sample, measured between counter reads"""
+        received, sent = self.throughput.rates()
+        capacity = self.capacity * 1_000_000 / 8 if self.capacity else self.throughput.capacity()
+        if self.direction == NetworkDirection.TOTAL:
+            # full duplex: a link carries its capacity both ways at once
+            capacity *= 2
+        return scale_throughput(directional(received, sent, self.direction), capacity, self.scale)
+
+
+def build_collectors(dials: set[DialType]) -> dict[DialType, Collector]:
+    """Build a collector for each dial, configured from settings
+
+    :param dials: dials to build collectors for
+    :return: collectors by dial
+    """
+    procfs, cgroup = _use_procfs(), None
+    if procfs and settings.metrics.cgroup:
+        cgroup = cgroup_dir()
+        if cgroup is None:
+            logger.warning("cgroup v2 not found, reporting system-wide CPU & memory")
+
+    collectors: dict[DialType, Collector] = {}
+    if DialType.CPU in dials:
+        collectors[DialType.CPU] = CPUCollector(_cpu_source(procfs, cgroup), timeout=settings.cpu.timeout)
+    if DialType.GPU in dials:
+        metric = GPUMetric(settings.gpu.metric)
+        if metric == GPUMetric.VRAM and GPUBackend(settings.gpu.backend) not in (GPUBackend.AMD, GPUBackend.AMDGPU):
+            logger.warning(f"{settings.gpu.backend} GPU backend doesn't report VRAM, the GPU dial will show 0")
+        collectors[DialType.GPU] = GPUCollector(settings.gpu.backend, metric, timeout=settings.gpu.timeout)
+    if DialType.MEMORY in dials:
+        memory = (CgroupMemory(cgroup) if cgroup else ProcMeminfo()) if procfs else None
+        collectors[DialType.MEMORY] = MemoryCollector(memory, timeout=settings.memory.timeout)
+    if DialType.NETWORK in dials:
+        throughput = NetworkThroughput(
+            ProcNetDev() if procfs else None,
+            include=_patterns(settings.network.include),
+            exclude=_patterns(settings.network.exclude),
+        )
+        collectors[DialType.NETWORK] = NetworkCollector(
+            throughput,
+            NetworkDirection(settings.network.direction),
+            NetworkScale(settings.network.scale),
+            settings.network.capacity,
+            timeout=settings.network.timeout,
+        )
+    return collectors
+
+
+def _cpu_source(procfs: bool, cgroup: Path | None) -> ProcStat | CgroupCPU | CoreCPU | None:
+    """CPU source for the configured statistic (see `cpu.statistic`, `cpu.cores` & `cpu.node`)"""
+    statistic = CPUStatistic(settings.cpu.statistic)
+    cores = parse_cpulist(settings.cpu.cores) if settings.cpu.cores else None
+    if settings.cpu.node is not None:
+        cores = (cores or set()) | node_cpus(settings.cpu.node)
+    if statistic == CPUStatistic.MEAN and cores is None:
+        return (CgroupCPU(cgroup) if cgroup else ProcStat()) if procfs else None
+    if cgroup:
+        logger.warning(f"{statistic.value} CPU statistic is per core, reporting host CPUs instead of the cgroup")
+    return CoreCPU(statistic, settings.cpu.busy_threshold, cores, ProcStatCores() if procfs else None)
+
+
+def _patterns(patterns: str | list[str]) -> list[str]:
+    """interface patterns from a comma-separated string (as set in the environment) or a list"""
+    if isinstance(patterns, str):
+        patterns = patterns.split(",")
+    return [pattern.strip() for pattern in patterns if pattern.strip()]
+
+
+def _use_procfs() -> bool:
+    """whether to sample from /proc directly rather than through psutil (see `metrics.backend`)"""
+    backend = MetricsBackend(settings.metrics.backend)
+    if backend == MetricsBackend.AUTO:
+        return sys.platform.startswith("linux") and os.access("/proc/stat", os.R_OK)
+    return backend == MetricsBackend.PROCFS
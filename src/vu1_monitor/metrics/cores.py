@@ -0,0 +1,103 @@
+import math
+from itertools import repeat
+from operator import ge, itemgetter
+from pathlib import Path
+
+import psutil
+
+from vu1_monitor.metrics.procfs import ROOT, ProcStatCores
+from vu1_monitor.models.models import CPUStatistic
+
+
+def parse_cpulist(spec: str) -> set[int]:
+    """Parse a CPU list, as used by taskset and sysfs (e.g. "0-3,8,10-11")
+
+    :param spec: CPU list
+    :raises ValueError: Raised when the list is malformed.
+    :return: CPU numbers
+    """
+    cpus: set[int] = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        if int(last or first) < int(first):
+            raise ValueError(f"invalid CPU range: {part}")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def node_cpus(node: int, root: Path = ROOT) -> set[int]:
+    """CPUs of a NUMA node, from sysfs
+
+    :param node: NUMA node number
+    :param root: filesystem root, defaults to /
+    :raises ValueError: Raised when the node doesn't exist.
+    :return: CPU numbers
+    """
+    try:
+        spec = (root / "sys" / "devices" / "system" / "node" / f"node{node}" / "cpulist").read_text()
+    except OSError as e:
+        raise ValueError(f"NUMA node {node} not found") from e
+    return parse_cpulist(spec.strip())
+
+
+class CoreCPU:
+    """CPU utilisation statistic across individual cores, rather than the system-wide mean
+
+    `max`, `p90` and `busy` show a saturated subset of cores that a mean over many cores hides;
+    `busy` is the share of cores at or above `threshold` (the count of busy cores, scaled to the dial).
+    Statistics are computed over the configured cores only, when set.
+
+    :param statistic: statistic to report
+    :param threshold: utilisation at which a core counts as busy (0-100), defaults to 90
+    :param cores: CPU numbers to report on, defaults to all
+    :param source: per-CPU counters read from /proc, defaults to psutil
+    """
+
+    def __init__(
+        self,
+        statistic: CPUStatistic,
+        threshold: float = 90.0,
+        cores: set[int] | None = None,
+        source: ProcStatCores | None = None,
+    ) -> None:
+        self.statistic = statistic
+        self.threshold = threshold
+        self.cores = cores
+        self.source = source
+        self._cpus: list[int] = []
+        self._select: itemgetter | None = None
+        if source is None:
+            psutil.cpu_percent(percpu=True)
+
+    def _percents(self) -> list[float]:
+        """utilisation of each selected core since the last sample"""
+        if self.source:
+            cpus, percents = self.source.cpu_percents()
+        else:
+            percents = psutil.cpu_percent(percpu=True)
+            cpus = list(range(len(percents)))
+        if self.cores is None:
+            return percents
+        if cpus != self._cpus:
+            # only rebuilt when CPUs go on or offline
+            positions = [position for position, cpu in enumerate(cpus) if cpu in self.cores]
+            self._cpus, self._select = cpus, itemgetter(*positions) if positions else None
+        if self._select is None:
+            return []
+        selected = self._select(percents)
+        return list(selected) if isinstance(selected, tuple) else [selected]
+
+    def cpu_percent(self) -> float:
+        """statistic of core utilisation since the last sample (0-100)"""
+        percents = self._percents()
+        if not percents:
+            return 0.0
+        if self.statistic == CPUStatistic.MAX:
+            return max(percents)
+        if self.statistic == CPUStatistic.P90:
+            return sorted(percents)[math.ceil(0.9 * len(percents)) - 1]
+        if self.statistic == CPUStatistic.BUSY:
+            return 100.0 * sum(map(ge, percents, repeat(self.threshold))) / len(percents)
+        return sum(percents) / len(percents)
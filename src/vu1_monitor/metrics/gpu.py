@@ -1,9 +1,14 @@
+import functools
+import logging
 import statistics
 
-import GPUtil  # type: ignore
-
+from vu1_monitor.config import settings
+from vu1_monitor.metrics.amdgpu import AMDGPUBackend
+from vu1_monitor.metrics.nvml import NVMLBackend, NVMLError
 from vu1_monitor.models.models import GPUBackend
 
+logger = logging.getLogger(settings.name)
+
 
 def get_gpu_utilisation(backend: str | None = None) -> float:
     """Get GPU utilisation from device"""
@@ -14,19 +19,60 @@ def get_gpu_utilisation(backend: str | None = None) -> float:
         return _get_nvidia_utilisation()
     elif backend == GPUBackend.AMD:
         return _get_amd_utilistion()
+    elif backend == GPUBackend.AMDGPU:
+        amdgpu = _amdgpu_backend()
+        return amdgpu.utilisation() if amdgpu is not None else 0.0
     else:
         return 0.0
 
 
+def get_gpu_vram(backend: str | None = None) -> float:
+    """Get GPU memory in use (0-100) from device. Only AMD devices read through amdgpu sysfs report it."""
+    if backend and GPUBackend(backend) in (GPUBackend.AMD, GPUBackend.AMDGPU):
+        amdgpu = _amdgpu_backend()
+        return amdgpu.vram_percent() if amdgpu is not None else 0.0
+    return 0.0
+
+
+@functools.cache
+def _nvml_backend() -> NVMLBackend | None:
+    """NVML backend, created once per process (None if NVML is unavailable)"""
+    try:
+        return NVMLBackend()
+    except (OSError, NVMLError) as e:
+        logger.info(f"NVML unavailable, falling back to GPUtil: {e}")
+        return None
+
+
+@functools.cache
+def _amdgpu_backend() -> AMDGPUBackend | None:
+    """amdgpu sysfs backend, created once per process (None if no amdgpu device is found)"""
+    try:
+        return AMDGPUBackend()
+    except OSError as e:
+        logger.info(f"amdgpu sysfs unavailable: {e}")
+        return None
+
+
 def _get_nvidia_utilisation() -> float:
-    """return NVIDA GPU utilisation (all devices)"""
+    """return NVIDA GPU utilisation (all devices). Reads through NVML when available, otherwise GPUtil (loaded lazily)."""
+    backend = _nvml_backend()
+    if backend is not None:
+        return backend.utilisation()
+
+    import GPUtil  # type: ignore
+
     device_list = GPUtil.getGPUs()
     utilisation = [device.load * 100 for device in device_list]
     return statistics.fmean(utilisation)
 
 
 def _get_amd_utilistion() -> float:
-    """return AMD GPU utilisation (all devices). Loads library lazily to avoid device errors if not present."""
+    """return AMD GPU utilisation (all devices). Reads amdgpu sysfs when available, otherwise pyadl (loaded lazily)."""
+    backend = _amdgpu_backend()
+    if backend is not None:
+        return backend.utilisation()
+
     from pyadl import ADLManager  # type: ignore
 
     device_list = ADLManager.getInstance().getDevices()
@@ -0,0 +1,156 @@
+import math
+import time
+from fnmatch import fnmatch
+from typing import Callable
+
+import psutil
+
+from vu1_monitor.metrics.procfs import ProcNetDev
+from vu1_monitor.models.models import NetworkDirection, NetworkScale
+
+# counters of some drivers are 32-bit, even where /proc/net/dev reports 64-bit values
+WRAP = 2**32
+# default link speed of interfaces that don't report one (Mbit/s)
+DEFAULT_SPEED = 1000
+# throughput shown at the bottom of the log scale (bytes/s)
+LOG_FLOOR = 1024.0
+
+
+def counter_delta(previous: int, current: int) -> int:
+    """Increase of a byte counter between two reads
+
+    A counter lower than before has wrapped around if it was a 32-bit counter close to its limit,
+    and was otherwise reset (e.g. the interface was re-created or reconnected), counting from 0.
+
+    :param previous: previous counter value
+    :param current: current counter value
+    :return: bytes counted in between
+    """
+    if current >= previous:
+        return current - previous
+    if WRAP // 2 < previous < WRAP:
+        return current + WRAP - previous
+    return current
+
+
+def selected(interface: str, include: list[str], exclude: list[str]) -> bool:
+    """Whether an interface matches an include pattern (when any) and no exclude pattern
+
+    :param interface: interface name
+    :param include: shell-style patterns of interfaces to measure (all when empty)
+    :param exclude: shell-style patterns of interfaces to skip (e.g. "veth*")
+    """
+    if include and not any(fnmatch(interface, pattern) for pattern in include):
+        return False
+    return not any(fnmatch(interface, pattern) for pattern in exclude)
+
+
+class NetworkThroughput:
+    """Received and sent bytes per second of the selected network interfaces
+
+    All interface counters are read in one pass, and rates are measured over the monotonic time
+    between reads. An interface is measured from the read after it first appears.
+
+    :param source: per-interface counters read from /proc, defaults to psutil
+    :param include: shell-style patterns of interfaces to measure (all when empty)
+    :param exclude: shell-style patterns of interfaces to skip
+    :param clock: monotonic clock, defaults to time.monotonic
+    """
+
+    def __init__(
+        self,
+        source: ProcNetDev | None = None,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.source = source
+        self.include = include or []
+        self.exclude = exclude or []
+        self.clock = clock
+        self.speeds: dict[str, int | None] = {}
+        self._counters, self._read_at = self._read(), clock()
+
+    def _read(self) -> dict[str, tuple[int, int]]:
+        """bytes received and sent by each selected interface"""
+        if self.source:
+            counters = self.source.counters()
+        else:
+            counters = {
+                interface: (counter.bytes_recv, counter.bytes_sent)
+                for interface, counter in psutil.net_io_counters(pernic=True).items()
+            }
+        return {
+            interface: counter
+            for interface, counter in counters.items()
+            if selected(interface, self.include, self.exclude)
+        }
+
+    def _speed(self, interface: str) -> int | None:
+        """link speed of an interface (Mbit/s), read once"""
+        if interface not in self.speeds:
+            if self.source:
+                self.speeds[interface] = self.source.speed(interface)
+            else:
+                stats = psutil.net_if_stats().get(interface)
+                self.speeds[interface] = stats.speed if stats and stats.speed > 0 else None
+        return self.speeds[interface]
+
+    @property
+    def interfaces(self) -> list[str]:
+        """interfaces measured"""
+        return sorted(self._counters)
+
+    def capacity(self) -> float:
+        """combined link speed of the interfaces measured, in one direction (bytes/s)"""
+        speeds = [self._speed(interface) or DEFAULT_SPEED for interface in self._counters]
+        return sum(speeds or [DEFAULT_SPEED]) * 1_000_000 / 8
+
+    def rates(self) -> tuple[float, float]:
+        """Throughput since the previous call
+
+        :return: bytes received and sent per second, across the interfaces measured
+        """
+        counters, read_at = self._read(), self.clock()
+        elapsed = read_at - self._read_at
+        received = sent = 0
+        for interface, (rx, tx) in counters.items():
+            if interface in self._counters:
+                previous_rx, previous_tx = self._counters[interface]
+                received += counter_delta(previous_rx, rx)
+                sent += counter_delta(previous_tx, tx)
+        self._counters, self._read_at = counters, read_at
+        return (received / elapsed, sent / elapsed) if elapsed > 0 else (0.0, 0.0)
+
+
+def scale_throughput(rate: float, capacity: float, scale: NetworkScale) -> float:
+    """Map a throughput onto the dial (0-100)
+
+    The linear scale is the share of `capacity` used. The log scale spreads 1 KB/s to `capacity`
+    evenly across the dial by order of magnitude, so both light and heavy traffic move the needle.
+
+    :param rate: throughput (bytes/s)
+    :param capacity: throughput shown at the top of the dial (bytes/s)
+    :param scale: how throughput is mapped onto the dial
+    :return: dial value (0-100)
+    """
+    if capacity <= 0:
+        return 0.0
+    if scale == NetworkScale.LOG:
+        if rate <= LOG_FLOOR or capacity <= LOG_FLOOR:
+            return 0.0
+        return min(100.0, 100.0 * math.log(rate / LOG_FLOOR) / math.log(capacity / LOG_FLOOR))
+    return min(100.0, 100.0 * rate / capacity)
+
+
+def directional(received: float, sent: float, direction: NetworkDirection) -> float:
+    """throughput shown for a direction (bytes/s)"""
+    match direction:
+        case NetworkDirection.RX:
+            return received
+        case NetworkDirection.TX:
+            return sent
+        case NetworkDirection.TOTAL:
+            return received + sent
+        case _:
+            return max(received, sent)
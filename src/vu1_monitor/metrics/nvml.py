@@ -0,0 +1,102 @@
+import ctypes
+import statistics
+import sys
+from typing import Any
+
+NVML_SUCCESS = 0
+LIBRARY_NAMES = {
+    "linux": ["libnvidia-ml.so.1", "libnvidia-ml.so"],
+    "win32": ["nvml.dll"],
+}
+
+
+class NVMLError(Exception):
+
+    def __init__(self, function: str, code: int):
+        super().__init__(f"{function} failed with NVML error code {code}")
+        self.code = code
+
+
+class Utilisation(ctypes.Structure):
+    """nvmlUtilization_t"""
+
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+
+class NVMLLibrary:
+    """Thin ctypes binding to the NVML functions used by vu1-monitor
+
+    :param lib: loaded NVML library (or a stand-in exposing the same functions), defaults to the system library
+    :raises OSError: Raised when the NVML library cannot be loaded.
+    """
+
+    def __init__(self, lib: Any = None) -> None:
+        self.lib = lib if lib is not None else _load_library()
+
+    def _call(self, function: str, *args: Any) -> None:
+        code = getattr(self.lib, function)(*args)
+        if code != NVML_SUCCESS:
+            raise NVMLError(function, code)
+
+    def init(self) -> None:
+        """initialise NVML"""
+        self._call("nvmlInit_v2")
+
+    def shutdown(self) -> None:
+        """release NVML"""
+        self._call("nvmlShutdown")
+
+    def device_count(self) -> int:
+        """number of NVIDIA devices"""
+        count = ctypes.c_uint()
+        self._call("nvmlDeviceGetCount_v2", ctypes.byref(count))
+        return count.value
+
+    def device_handle(self, index: int) -> ctypes.c_void_p:
+        """handle of the device at `index`"""
+        handle = ctypes.c_void_p()
+        self._call("nvmlDeviceGetHandleByIndex_v2", ctypes.c_uint(index), ctypes.byref(handle))
+        return handle
+
+    def utilisation(self, handle: ctypes.c_void_p, out: Utilisation | None = None) -> int:
+        """GPU utilisation (percent) of a device"""
+        out = out if out is not None else Utilisation()
+        self._call("nvmlDeviceGetUtilizationRates", handle, ctypes.byref(out))
+        return out.gpu
+
+
+def _load_library() -> ctypes.CDLL:
+    """load the system NVML library"""
+    errors = []
+    for name in LIBRARY_NAMES.get(sys.platform, []):
+        try:
+            return ctypes.CDLL(name)
+        except OSError as e:
+            errors.append(str(e))
+    raise OSError(f"NVML library not found: {errors}")
+
+
+class NVMLBackend:
+    """Reads NVIDIA GPU utilisation in-process, keeping NVML and device handles open
+
+    :param library: NVML binding to use, defaults to the system library
+    :raises OSError: Raised when the NVML library cannot be loaded.
+    :raises NVMLError: Raised when NVML cannot be initialised.
+    """
+
+    def __init__(self, library: NVMLLibrary | None = None) -> None:
+        self.library = library or NVMLLibrary()
+        self.library.init()
+        self.handles = [self.library.device_handle(index) for index in range(self.library.device_count())]
+        self._out = Utilisation()
+
+    def utilisation(self) -> float:
+        """return NVIDIA GPU utilisation (all devices)"""
+        if not self.handles:
+            return 0.0
+        return statistics.fmean(self.library.utilisation(handle, self._out) for handle in self.handles)
+
+    def close(self) -> None:
+        """release device handles and NVML"""
+        self.handles = []
+        self.library.shutdown()
@@ -0,0 +1,279 @@
+import os
+import time
+from itertools import repeat
+from operator import add, mul, sub, truediv
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path("/")
+
+
+class ProcFile:
+    """A /proc, /sys or cgroup file kept open and re-read from the start into a reusable buffer
+
+    The buffer doubles until a whole read fits, so later reads never allocate.
+
+    :param path: file to read
+    :param size: initial buffer size (bytes)
+    """
+
+    def __init__(self, path: Path, size: int = 4096) -> None:
+        self.path = path
+        self.buffer = bytearray(size)
+        self._fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+
+    def read(self) -> int:
+        """Re-read the file into `buffer`
+
+        :return: number of bytes read
+        """
+        while True:
+            size = os.preadv(self._fd, [self.buffer], 0)
+            if size < len(self.buffer):
+                return size
+            self.buffer = bytearray(len(self.buffer) * 2)
+
+    def field(self, key: bytes, size: int) -> int:
+        """first integer following `key` in the data read (e.g. b"MemTotal:" in /proc/meminfo)
+
+        :raises KeyError: Raised when the key is not in the data.
+        """
+        start = self.buffer.find(key, 0, size)
+        if start < 0:
+            raise KeyError(key.decode())
+        start += len(key)
+        end = self.buffer.find(b"\n", start, size)
+        return int(self.buffer[start : end if end >= 0 else size].split(None, 1)[0])
+
+    def close(self) -> None:
+        """close the file descriptor"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self) -> None:
+        if hasattr(self, "_fd"):
+            self.close()
+
+
+class ProcStat:
+    """System-wide CPU utilisation from /proc/stat (the first `cpu` line only)
+
+    :param root: filesystem root, defaults to /
+    """
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.file = ProcFile(root / "proc" / "stat")
+        self._busy, self._total = self._times()
+
+    def _times(self) -> tuple[int, int]:
+        """busy and total jiffies of all CPUs"""
+        size = self.file.read()
+        end = self.file.buffer.find(b"\n", 0, size)
+        # cpu user nice system idle iowait irq softirq steal guest guest_nice (guest time is within user)
+        times = [int(value) for value in self.file.buffer[:end].split()[1:9]]
+        total = sum(times)
+        return total - times[3] - times[4], total
+
+    def cpu_percent(self) -> float:
+        """CPU utilisation since the previous call (0-100)"""
+        busy, total = self._times()
+        delta_busy, delta_total = busy - self._busy, total - self._total
+        self._busy, self._total = busy, total
+        return min(100.0, 100.0 * delta_busy / delta_total) if delta_total > 0 else 0.0
+
+
+class ProcStatCores:
+    """Per-CPU utilisation from the `cpuN` lines of /proc/stat
+
+    Every CPU is read in one pass over the file, and each counter is turned into a column across
+    all CPUs with slicing, so the work per CPU runs in C (map/zip over the columns) rather than in a
+    Python loop, and stays cheap with thousands of CPUs.
+
+    :param root: filesystem root, defaults to /
+    """
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.file = ProcFile(root / "proc" / "stat", 64 * 1024)
+        self.cpus: list[int] = []
+        self._names: list[bytes] = []
+        self._busy, self._total = self._times()
+
+    def _times(self) -> tuple[list[int], list[int]]:
+        """busy and total jiffies of each CPU"""
+        size = self.file.read()
+        buffer = self.file.buffer
+        # the first line sums all CPUs, then one "cpuN user nice system idle iowait irq softirq steal ..." line each
+        start = buffer.find(b"\n", 0, size) + 1
+        end = buffer.find(b"\n", buffer.rfind(b"\ncpu", 0, size) + 1, size)
+        width = len(buffer[start : buffer.find(b"\n", start, size)].split())
+        fields = bytes(memoryview(buffer)[start:end]).split()
+
+        names = fields[::width]
+        if names != self._names:
+            self._names, self.cpus = names, [int(name[3:]) for name in names]
+        # user nice system irq softirq steal are busy, idle iowait are not (guest time is within user)
+        busy = list(map(sum, zip(*(map(int, fields[column::width]) for column in (1, 2, 3, 6, 7, 8)), strict=True)))
+        idle = map(add, map(int, fields[4::width]), map(int, fields[5::width]))
+        return busy, list(map(add, busy, idle))
+
+    def cpu_percents(self) -> tuple[list[int], list[float]]:
+        """Utilisation of each CPU since the previous call
+
+        When CPUs go on or offline, utilisation is 0 for the call that notices it.
+
+        :return: online CPU numbers, and the utilisation of each (0-100)
+        """
+        cpus = self.cpus
+        busy, total = self._times()
+        if self.cpus != cpus:
+            self._busy, self._total = busy, total
+            return self.cpus, [0.0] * len(busy)
+
+        delta_busy = map(mul, map(sub, busy, self._busy), repeat(100.0))
+        delta_total = map(max, map(sub, total, self._total), repeat(1))
+        self._busy, self._total = busy, total
+        return self.cpus, list(map(min, map(truediv, delta_busy, delta_total), repeat(100.0)))
+
+
+class ProcMeminfo:
+    """Memory utilisation from /proc/meminfo, as used by psutil (total less available)
+
+    :param root: filesystem root, defaults to /
+    """
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.file = ProcFile(root / "proc" / "meminfo")
+
+    def total(self) -> int:
+        """total memory (bytes)"""
+        return self.file.field(b"MemTotal:", self.file.read()) * 1024
+
+    def memory_percent(self) -> float:
+        """memory in use (0-100)"""
+        size = self.file.read()
+        total, available = self.file.field(b"MemTotal:", size), self.file.field(b"MemAvailable:", size)
+        return 100.0 * (total - available) / total if total > 0 else 0.0
+
+
+class ProcNetDev:
+    """Bytes received and sent by each network interface, from /proc/net/dev
+
+    :param root: filesystem root, defaults to /
+    """
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.root = root
+        self.file = ProcFile(root / "proc" / "net" / "dev")
+
+    def counters(self) -> dict[str, tuple[int, int]]:
+        """bytes received and sent by each interface, read in one pass"""
+        size = self.file.read()
+        buffer, counters = self.file.buffer, {}
+        # two header lines, then "  name: rx_bytes rx_packets (6 more) tx_bytes ..." per interface
+        line = buffer.find(b"\n", buffer.find(b"\n", 0, size) + 1, size) + 1
+        while 0 < line < size:
+            colon = buffer.find(b":", line, size)
+            end = buffer.find(b"\n", colon, size)
+            end = end if end >= 0 else size
+            fields = buffer[colon + 1 : end].split(None, 9)
+            counters[buffer[line:colon].strip().decode()] = (int(fields[0]), int(fields[8]))
+            line = end + 1
+        return counters
+
+    def speed(self, interface: str) -> int | None:
+        """link speed of an interface (Mbit/s), or None when unknown (e.g. virtual or down)"""
+        try:
+            speed = int((self.root / "sys" / "class" / "net" / interface / "speed").read_text())
+        except (OSError, ValueError):
+            return None
+        return speed if speed > 0 else None
+
+
+def cgroup_dir(root: Path = ROOT) -> Path | None:
+    """Directory of this process' cgroup, when running under the unified (v2) hierarchy
+
+    :param root: filesystem root, defaults to /
+    :return: cgroup directory, or None without cgroup v2
+    """
+    mount = root / "sys" / "fs" / "cgroup"
+    if not (mount / "cgroup.controllers").exists():
+        return None
+    try:
+        lines = (root / "proc" / "self" / "cgroup").read_text().splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        if line.startswith("0::"):
+            path = mount / line[3:].lstrip("/")
+            return path if path.is_dir() else mount
+    return None
+
+
+class CgroupCPU:
+    """CPU utilisation of a cgroup against its own CPU limit (cpu.max), from cpu.stat
+
+    Without a quota the limit is the number of CPUs this process may run on.
+
+    :param path: cgroup directory (see `cgroup_dir`)
+    :param clock: monotonic clock, defaults to time.monotonic
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.stat = ProcFile(path / "cpu.stat")
+        self.cpus = self._limit(path)
+        self._usage, self._sampled_at = self._read(), clock()
+
+    @staticmethod
+    def _limit(path: Path) -> float:
+        """CPUs available to the cgroup"""
+        cpus = float(len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1)
+        try:
+            quota, period = (path / "cpu.max").read_text().split()
+        except (OSError, ValueError):
+            return cpus
+        return cpus if quota == "max" else min(cpus, int(quota) / int(period))
+
+    def _read(self) -> int:
+        """CPU time used by the cgroup (microseconds)"""
+        return self.stat.field(b"usage_usec", self.stat.read())
+
+    def cpu_percent(self) -> float:
+        """utilisation of the cgroup's CPU limit since the previous call (0-100)"""
+        usage, sampled_at = self._read(), self.clock()
+        elapsed = (sampled_at - self._sampled_at) * 1_000_000 * self.cpus
+        percent = 100.0 * (usage - self._usage) / elapsed if elapsed > 0 else 0.0
+        self._usage, self._sampled_at = usage, sampled_at
+        return min(100.0, percent)
+
+
+class CgroupMemory:
+    """Memory utilisation of a cgroup against its own limit (memory.max)
+
+    Reclaimable page cache (`inactive_file`) is not counted as used. Without a limit, usage is
+    measured against total memory.
+
+    :param path: cgroup directory (see `cgroup_dir`)
+    :param root: filesystem root, defaults to /
+    """
+
+    def __init__(self, path: Path, root: Path = ROOT) -> None:
+        self.current = ProcFile(path / "memory.current", 64)
+        self.stat = ProcFile(path / "memory.stat")
+        self.limit = self._limit(path) or ProcMeminfo(root).total()
+
+    @staticmethod
+    def _limit(path: Path) -> int | None:
+        """memory limit of the cgroup (bytes), or None when unlimited"""
+        try:
+            limit = (path / "memory.max").read_text().strip()
+        except OSError:
+            return None
+        return None if limit == "max" else int(limit)
+
+    def memory_percent(self) -> float:
+        """memory in use against the cgroup limit (0-100)"""
+        current = int(self.current.buffer[: self.current.read()])
+        inactive = self.stat.field(b"inactive_file ", self.stat.read())
+        return min(100.0, 100.0 * max(0, current - inactive) / self.limit)
@@ -0,0 +1,189 @@
+import bisect
+import mmap
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Iterator
+
+from vu1_monitor.metrics.collectors import Collector
+from vu1_monitor.models.models import DialType
+
+MAGIC = b"VU1REC\x00\x00"
+VERSION = 1
+# magic, version, header size, wall clock time the recording started
+HEADER = struct.Struct("<8sHHd")
+# seconds since the recording started, dial, value
+RECORD = struct.Struct("<dB3xf")
+DIALS = list(DialType)
+FLUSH_SIZE = 64 * 1024
+
+
+class Recorder:
+    """Appends timestamped dial samples to a recording file
+
+    Records are fixed-size (see `RECORD`) and buffered, so a recording can be memory-mapped while
+    it is written; a partial record left by a crash is ignored when read.
+
+    :param path: recording file (created, or appended to)
+    :param clock: monotonic clock, defaults to time.monotonic
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.monotonic) -> None:
+        self.path = path
+        self.clock = clock
+        self._buffer = bytearray()
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._started = clock()
+            self._file.write(HEADER.pack(MAGIC, VERSION, HEADER.size, time.time()))
+        else:
+            recording = Recording(path)
+            self._started = clock() - recording.duration
+            recording.close()
+
+    def record(self, dial: DialType, value: float) -> None:
+        """Append a sample
+
+        :param dial: dial sampled
+        :param value: sampled value
+        """
+        self._buffer += RECORD.pack(self.clock() - self._started, DIALS.index(dial), value)
+        if len(self._buffer) >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """write buffered samples to the file"""
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """flush and close the file"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class Recording:
+    """A recording file, memory-mapped and read without copying the records
+
+    :param path: recording file
+    :raises ValueError: Raised when the file is not a recording.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a vu1-monitor recording")
+        magic, version, offset, self.started = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} vu1-monitor recording")
+        count = (len(self._map) - offset) // RECORD.size
+        self._records = memoryview(self._map)[offset : offset + count * RECORD.size]
+
+    def __len__(self) -> int:
+        return len(self._records) // RECORD.size
+
+    def __iter__(self) -> Iterator[tuple[float, DialType, float]]:
+        for at, dial, value in RECORD.iter_unpack(self._records):
+            yield at, DIALS[dial], value
+
+    @property
+    def duration(self) -> float:
+        """time between the start of the recording and its last sample (seconds)"""
+        return RECORD.unpack_from(self._records, len(self._records) - RECORD.size)[0] if len(self) else 0.0
+
+    @property
+    def dials(self) -> set[DialType]:
+        """dials with samples in the recording"""
+        return {DIALS[dial] for _, dial, _ in RECORD.iter_unpack(self._records)}
+
+    def samples(self, dial: DialType) -> tuple[array, array]:
+        """Samples of one dial
+
+        :param dial: dial to read
+        :return: sample times (seconds since the recording started) and values
+        """
+        times, values = array("d"), array("d")
+        index = DIALS.index(dial)
+        for at, sampled, value in RECORD.iter_unpack(self._records):
+            if sampled == index:
+                times.append(at)
+                values.append(value)
+        return times, values
+
+    def close(self) -> None:
+        """unmap the file"""
+        if hasattr(self, "_records"):
+            self._records.release()
+        self._map.close()
+
+
+class ReplayCollector(Collector):
+    """Replays the recorded samples of a dial in place of live metrics
+
+    Each sample returns the value recorded at the matching point of the recording, with the
+    recording played back `speed` times faster than real time.
+
+    :param dial: dial replayed
+    :param times: sample times (seconds since the recording started)
+    :param values: sampled values
+    :param speed: playback speed, defaults to 1 (real time)
+    :param clock: monotonic clock, defaults to time.monotonic
+    """
+
+    def __init__(
+        self,
+        dial: DialType,
+        times: array,
+        values: array,
+        speed: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.dial = dial
+        self.times = times
+        self.values = values
+        self.speed = speed
+        self.clock = clock
+        self._started = clock()
+
+    @property
+    def position(self) -> float:
+        """playback position (seconds since the recording started)"""
+        return (self.clock() - self._started) * self.speed
+
+    @property
+    def finished(self) -> bool:
+        """whether playback has passed the last sample"""
+        return not self.times or self.position > self.times[-1]
+
+    def sample(self) -> float:
+        """value recorded at the playback position (the first value before it, the last after it)"""
+        if not self.values:
+            return 0.0
+        index = bisect.bisect_right(self.times, self.position)
+        return self.values[max(0, index - 1)]
+
+
+def build_replay_collectors(
+    recording: Recording, dials: set[DialType], speed: float = 1.0
+) -> dict[DialType, Collector]:
+    """Build a replay collector for each dial with samples in a recording
+
+    :param recording: recording to replay
+    :param dials: dials to replay
+    :param speed: playback speed, defaults to 1 (real time)
+    :return: collectors by dial
+    """
+    collectors: dict[DialType, Collector] = {}
+    for dial in dials & recording.dials:
+        times, values = recording.samples(dial)
+        collectors[dial] = ReplayCollector(dial, times, values, speed)
+    return collectors
@@ -0,0 +1,97 @@
+import logging
+import math
+from typing import TYPE_CHECKING
+
+from vu1_monitor.config import settings
+from vu1_monitor.metrics.collectors import Collector
+from vu1_monitor.metrics.window import Window
+from vu1_monitor.models.models import DialType
+from vu1_monitor.scheduler import DialPolicy, Scheduler
+
+if TYPE_CHECKING:
+    from vu1_monitor.metrics.recording import Recorder
+
+logger = logging.getLogger(settings.name)
+
+
+class Sampler:
+    """Samples a collector at its own rate into a window, independently of dial publishing
+
+    :param collector: collector to sample
+    :param window: window the samples are aggregated in
+    :param rate: samples per second
+    :param recorder: recorder every sample is appended to, defaults to None
+    """
+
+    def __init__(self, collector: Collector, window: Window, rate: float, recorder: "Recorder | None" = None) -> None:
+        self.collector = collector
+        self.window = window
+        self.rate = rate
+        self.recorder = recorder
+        self.scheduler: Scheduler[DialType] | None = None
+
+    @property
+    def dial(self) -> DialType:
+        return self.collector.dial
+
+    def resize(self, interval: float) -> None:
+        """Size the window to hold one publish interval of samples
+
+        :param interval: publish interval of the dial (seconds)
+        """
+        self.window.resize(_window_size(self.rate, interval))
+
+    def publish(self) -> float | None:
+        """aggregate of the latest samples (None before the first sample)"""
+        return self.window.publish()
+
+    async def run(self) -> None:
+        """sample at fixed deadlines until cancelled"""
+        self.scheduler = Scheduler({self.dial: 1 / self.rate})
+        async for _ in self.scheduler.ticks():
+            try:
+                value = await self.collector.collect()
+            except Exception as e:
+                logger.warning(f"failed to sample {self.dial.value}: {e}")
+                continue
+            self.window.add(value)
+            if self.recorder is not None:
+                self.recorder.record(self.dial, value)
+
+
+def _window_size(rate: float, interval: float) -> int:
+    """number of samples taken at `rate` over one publish interval"""
+    return max(1, math.ceil(rate * interval))
+
+
+def build_samplers(
+    collectors: dict[DialType, Collector],
+    policies: dict[DialType, DialPolicy],
+    intervals: dict[DialType, float],
+    speed: float = 1.0,
+    recorder: "Recorder | None" = None,
+) -> dict[DialType, Sampler]:
+    """Build a sampler for each collector, configured from the dial policies
+
+    Each window holds one publish interval of samples.
+
+    :param collectors: collectors by dial
+    :param policies: update policy of each dial
+    :param intervals: publish interval of each dial, as planned within the request budget (seconds)
+    :param speed: time compression of a replay; sample rates are multiplied by it, defaults to 1
+    :param recorder: recorder every sample is appended to, defaults to None
+    :return: samplers by dial
+    """
+    samplers = {}
+    for dial, collector in collectors.items():
+        policy = policies[dial]
+        rate = policy.sample_rate * speed
+        window = Window(
+            _window_size(rate, intervals[dial]),
+            policy.aggregate,
+            policy.ema_alpha,
+            policy.percentile,
+            policy.percentile_window,
+        )
+        samplers[dial] = Sampler(collector, window, rate, recorder)
+    return samplers
@@ -0,0 +1,132 @@
+import bisect
+import math
+import time
+from array import array
+from itertools import accumulate
+from operator import sub
+from typing import Callable
+
+
+class QuantileSketch:
+    """Quantiles of a stream of values within a relative error, in a fixed number of counters
+
+    Values are counted in logarithmic bins whose width grows with the value (as in DDSketch), so
+    any quantile is estimated within `accuracy` of its true value, relative to it. The bins are
+    allocated up front: memory does not grow with the number of values. Values at or below
+    `minimum` share a bin reported as 0, and values above `maximum` are counted as `maximum`.
+
+    :param accuracy: relative error of estimated quantiles (0-1), defaults to 1%
+    :param minimum: smallest value told apart from 0, defaults to 0.01
+    :param maximum: largest value told apart from larger ones, defaults to 1,000,000
+    """
+
+    def __init__(self, accuracy: float = 0.01, minimum: float = 0.01, maximum: float = 1e6) -> None:
+        if not 0 < accuracy < 1:
+            raise ValueError("sketch accuracy must be between 0 and 1")
+        self.accuracy = accuracy
+        self.minimum = minimum
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = math.ceil(math.log(maximum / minimum) / self._log_gamma) + 1
+        self.counts = array("I", bytes(4 * self.bins))
+        self.count = 0
+
+    def key(self, value: float) -> int:
+        """bin of a value"""
+        if value <= self.minimum:
+            return 0
+        return min(math.ceil(math.log(value / self.minimum) / self._log_gamma), self.bins - 1)
+
+    def value(self, key: int) -> float:
+        """value reported for a bin (within `accuracy` of every value in it)"""
+        return 0.0 if key == 0 else self.minimum * 2 * self.gamma**key / (self.gamma + 1)
+
+    def add(self, value: float) -> None:
+        """count a value"""
+        self.counts[self.key(value)] += 1
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile of the values counted
+
+        :param q: quantile (0-1), e.g. 0.95 for the 95th percentile
+        :return: estimated quantile, or None before the first value
+        """
+        if not self.count:
+            return None
+        rank = min(max(q, 0.0), 1.0) * (self.count - 1)
+        return self.value(bisect.bisect_right(list(accumulate(self.counts)), rank))
+
+    def clear(self) -> None:
+        """forget every value counted"""
+        self.counts[:] = array("I", bytes(4 * self.bins))
+        self.count = 0
+
+
+class SlidingQuantile:
+    """Quantiles of the values added within the last `window` seconds, in constant memory
+
+    The window is split into `slices` sketches, each counting the values of one slice of time.
+    A running total of the slices answers quantiles, and the oldest slice is subtracted from it and
+    reused as time moves on. Memory depends only on the number of slices and the sketch accuracy,
+    not on the length of the window or how fast values are added.
+
+    :param window: length of the window (seconds)
+    :param slices: number of slices the window is split into (expiry granularity), defaults to 10
+    :param accuracy: relative error of estimated quantiles (0-1), defaults to 1%
+    :param clock: monotonic clock, defaults to time.monotonic
+    """
+
+    def __init__(
+        self,
+        window: float,
+        slices: int = 10,
+        accuracy: float = 0.01,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if window <= 0 or slices < 1:
+            raise ValueError("sliding window length and slices must be positive")
+        self.window = window
+        self.clock = clock
+        self.slice = window / slices
+        self.total = QuantileSketch(accuracy)
+        self.slices = [QuantileSketch(accuracy) for _ in range(slices)]
+        self._current = 0
+        self._ends = clock() + self.slice
+
+    def __len__(self) -> int:
+        self._expire()
+        return self.total.count
+
+    def add(self, value: float) -> None:
+        """count a value at the current time"""
+        self._expire()
+        key = self.total.key(value)
+        self.slices[self._current].counts[key] += 1
+        self.slices[self._current].count += 1
+        self.total.counts[key] += 1
+        self.total.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile of the values added within the window
+
+        :param q: quantile (0-1), e.g. 0.95 for the 95th percentile
+        :return: estimated quantile, or None without values in the window
+        """
+        self._expire()
+        return self.total.quantile(q)
+
+    def _expire(self) -> None:
+        """move to the slice of the current time, dropping the values of slices that left the window"""
+        now = self.clock()
+        if now < self._ends:
+            return
+        passed = int((now - self._ends) // self.slice) + 1
+        self._ends += passed * self.slice
+        for _ in range(min(passed, len(self.slices))):
+            self._current = (self._current + 1) % len(self.slices)
+            expired = self.slices[self._current]
+            if expired.count:
+                self.total.counts[:] = array("I", map(sub, self.total.counts, expired.counts))
+                self.total.count -= expired.count
+                expired.clear()
@@ -0,0 +1,115 @@
+from array import array
+
+from vu1_monitor.metrics.sketch import SlidingQuantile
+from vu1_monitor.models.models import Aggregate
+
+
+class RingBuffer:
+    """Fixed-size, preallocated buffer of the latest samples
+
+    :param size: number of samples kept
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("ring buffer size must be at least 1")
+        self.size = size
+        self._values = array("d", bytes(8 * size))
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        """add a sample, overwriting the oldest once full"""
+        self._values[self._index] = value
+        self._index = (self._index + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def resize(self, size: int) -> None:
+        """change the number of samples kept, keeping the latest samples held"""
+        if size < 1:
+            raise ValueError("ring buffer size must be at least 1")
+        start = self._index - self._count
+        latest = [self._values[(start + offset) % self.size] for offset in range(self._count)][-size:]
+        self.size = size
+        self._values = array("d", bytes(8 * size))
+        self._values[: len(latest)] = array("d", latest)
+        self._index = len(latest) % size
+        self._count = len(latest)
+
+    def last(self) -> float:
+        """most recent sample"""
+        return self._values[self._index - 1]
+
+    def mean(self) -> float:
+        """mean of the samples held"""
+        return sum(self._filled()) / self._count
+
+    def max(self) -> float:
+        """largest sample held"""
+        return max(self._filled())
+
+    def _filled(self) -> memoryview | array:
+        return self._values if self._count == self.size else memoryview(self._values)[: self._count]
+
+
+class Window:
+    """Samples of one metric, published as a single aggregate value
+
+    The `percentile` aggregate is taken over the last `horizon` seconds of samples rather than the
+    samples of one publish interval, from a sliding quantile sketch of constant size.
+
+    :param size: number of samples aggregated
+    :param aggregate: aggregation published
+    :param alpha: smoothing factor (0-1) of the exponential moving average
+    :param percentile: percentile (0-100) published by the percentile aggregate, defaults to 95
+    :param horizon: length of time covered by the percentile aggregate (seconds), defaults to 300
+    """
+
+    def __init__(
+        self,
+        size: int,
+        aggregate: Aggregate = Aggregate.LAST,
+        alpha: float = 0.3,
+        percentile: float = 95.0,
+        horizon: float = 300.0,
+    ) -> None:
+        self.buffer = RingBuffer(size)
+        self.aggregate = Aggregate(aggregate)
+        self.alpha = alpha
+        self.ema: float | None = None
+        self.percentile = percentile
+        self.quantiles = SlidingQuantile(horizon) if self.aggregate == Aggregate.PERCENTILE else None
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def resize(self, size: int) -> None:
+        """change the number of samples aggregated, keeping the latest samples"""
+        self.buffer.resize(size)
+
+    def add(self, value: float) -> None:
+        """add a sample to the window"""
+        self.buffer.append(value)
+        self.ema = value if self.ema is None else self.alpha * value + (1 - self.alpha) * self.ema
+        if self.quantiles is not None:
+            self.quantiles.add(value)
+
+    def publish(self) -> float | None:
+        """aggregate of the window (None before the first sample)"""
+        if not self.buffer:
+            return None
+
+        match self.aggregate:
+            case Aggregate.MEAN:
+                return self.buffer.mean()
+            case Aggregate.MAX:
+                return self.buffer.max()
+            case Aggregate.EMA:
+                return self.ema
+            case Aggregate.PERCENTILE if self.quantiles is not None:
+                return self.quantiles.quantile(self.percentile / 100)
+            case _:
+                return self.buffer.last()
@@ -1,19 +1,31 @@
 from vu1_monitor.models.models import (
+    Aggregate,
     Bright,
     Colours,
+    CPUStatistic,
     Dial,
     DialImage,
     DialType,
     Element,
     GPUBackend,
+    GPUMetric,
+    MetricsBackend,
+    NetworkDirection,
+    NetworkScale,
 )
 
 __all__ = [
+    "Aggregate",
     "Bright",
     "Colours",
+    "CPUStatistic",
     "Dial",
     "DialImage",
     "DialType",
     "Element",
     "GPUBackend",
+    "GPUMetric",
+    "MetricsBackend",
+    "NetworkDirection",
+    "NetworkScale",
 ]
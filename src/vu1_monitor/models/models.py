@@ -1,6 +1,5 @@
 from dataclasses import dataclass
 from enum import Enum
-from pathlib import Path
 
 from vu1_monitor.config.settings import settings
 
@@ -12,7 +11,7 @@ class Dial:
     uid: str
     value: str
     backlight: dict
-    image_file: str
+    image_file: str | None
 
 
 class DialType(str, Enum):
@@ -25,10 +24,10 @@ class DialType(str, Enum):
 
 class DialImage(Enum):
 
-    CPU: Path = Path("src/vu1_monitor/static/cpu-load.png")
-    GPU: Path = Path("src/vu1_monitor/static/gpu-load.png")
-    MEMORY: Path = Path("src/vu1_monitor/static/mem-load.png")
-    NETWORK: Path = Path("src/vu1_monitor/static/net-down.png")
+    CPU: str = "cpu-load.png"
+    GPU: str = "gpu-load.png"
+    MEMORY: str = "mem-load.png"
+    NETWORK: str = "net-down.png"
 
 
 class Colours(Enum):
@@ -58,4 +57,49 @@ class GPUBackend(str, Enum):
 
     NVIDIA: str = "nvidia"
     AMD: str = "amd"
+    AMDGPU: str = "amdgpu"
     METAL: str = "metal"
+
+
+class GPUMetric(str, Enum):
+
+    UTILISATION = "utilisation"
+    VRAM = "vram"
+
+
+class Aggregate(str, Enum):
+
+    MEAN: str = "mean"
+    MAX: str = "max"
+    EMA: str = "ema"
+    LAST: str = "last"
+    PERCENTILE: str = "percentile"
+
+
+class CPUStatistic(str, Enum):
+
+    MEAN: str = "mean"
+    MAX: str = "max"
+    P90: str = "p90"
+    BUSY: str = "busy"
+
+
+class NetworkDirection(str, Enum):
+
+    RX: str = "rx"
+    TX: str = "tx"
+    TOTAL: str = "total"
+    MAX: str = "max"
+
+
+class NetworkScale(str, Enum):
+
+    LINEAR: str = "linear"
+    LOG: str = "log"
+
+
+class MetricsBackend(str, Enum):
+
+    AUTO: str = "auto"
+    PROCFS: str = "procfs"
+    PSUTIL: str = "psutil"
@@ -0,0 +1,4 @@
+from vu1_monitor.scheduler.policy import DialPolicy, PolicyEngine
+from vu1_monitor.scheduler.scheduler import Scheduler, TickStats
+
+__all__ = ["DialPolicy", "PolicyEngine", "Scheduler", "TickStats"]
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+
+from vu1_monitor.config import settings
+from vu1_monitor.models.models import Aggregate, DialType
+
+# publish interval of dials without their own, unless given (the default `--interval` of `run`)
+DEFAULT_INTERVAL = 2.0
+
+
+@dataclass(frozen=True)
+class DialPolicy:
+    """Update policy of a dial, declared in its settings section (e.g. `[default.cpu]`)"""
+
+    interval: float
+    sample_rate: float
+    deadband: float
+    max_staleness: float
+    aggregate: Aggregate
+    priority: float
+    ema_alpha: float = 0.3
+    percentile: float = 95.0
+    percentile_window: float = 300.0
+
+    @classmethod
+    def from_settings(cls, dial: DialType, interval: float = DEFAULT_INTERVAL) -> "DialPolicy":
+        """Read the policy of a dial from settings
+
+        :param dial: dial to read the policy of
+        :param interval: publish interval used when the dial doesn't set its own (seconds), defaults to 2
+        :return: dial policy
+        """
+        config = settings[dial.name.lower()]
+        return cls(
+            interval=config.interval or interval,
+            sample_rate=config.sample_rate,
+            deadband=config.deadband,
+            max_staleness=config.max_staleness,
+            aggregate=Aggregate(config.aggregate),
+            priority=config.priority,
+            ema_alpha=config.ema_alpha,
+            percentile=config.percentile,
+            percentile_window=config.percentile_window,
+        )
+
+
+class PolicyEngine:
+    """Plans publish intervals of several dials within a global request budget
+
+    Each dial asks for one VU Server request per publish interval. When the dials together ask for
+    more requests per second than the budget, the budget is shared in proportion to dial priority
+    (weighted max-min fairness): a dial never gets more than it asks for, and whatever it leaves is
+    shared among the others, so high priority dials keep their interval while low priority dials are
+    slowed down.
+
+    :param policies: policy of each dial
+    :param budget: maximum VU Server requests per second across all dials (0 for no limit)
+    """
+
+    def __init__(self, policies: dict[DialType, DialPolicy], budget: float = 0) -> None:
+        self.policies = policies
+        self.budget = budget
+        self.intervals = self._plan()
+
+    @classmethod
+    def from_settings(cls, dials: set[DialType], interval: float) -> "PolicyEngine":
+        """Build the engine from the dial policies and request budget in settings
+
+        :param dials: dials to plan
+        :param interval: publish interval used by dials that don't set their own (seconds)
+        :return: policy engine
+        """
+        policies = {dial: DialPolicy.from_settings(dial, interval) for dial in dials}
+        return cls(policies, settings.server.budget)
+
+    @property
+    def throttled(self) -> dict[DialType, float]:
+        """dials slowed down to fit the budget, with their declared interval"""
+        return {
+            dial: policy.interval for dial, policy in self.policies.items() if self.intervals[dial] > policy.interval
+        }
+
+    @property
+    def rate(self) -> float:
+        """planned VU Server requests per second across all dials"""
+        return sum(1 / interval for interval in self.intervals.values())
+
+    def _plan(self) -> dict[DialType, float]:
+        """publish interval of each dial, within the budget"""
+        wanted = {dial: 1 / policy.interval for dial, policy in self.policies.items()}
+        if self.budget <= 0 or sum(wanted.values()) <= self.budget:
+            return {dial: policy.interval for dial, policy in self.policies.items()}
+
+        rates: dict[DialType, float] = {}
+        remaining, sharing = self.budget, set(wanted)
+        while sharing:
+            weight = sum(self.policies[dial].priority for dial in sharing)
+            share = {dial: remaining * self.policies[dial].priority / weight for dial in sharing}
+            satisfied = {dial for dial in sharing if wanted[dial] <= share[dial]}
+            if not satisfied:
+                rates.update(share)
+                break
+            for dial in satisfied:
+                rates[dial] = wanted[dial]
+                remaining -= wanted[dial]
+            sharing -= satisfied
+        return {dial: 1 / rate for dial, rate in rates.items()}
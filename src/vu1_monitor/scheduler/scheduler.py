@@ -0,0 +1,79 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+@dataclass
+class TickStats:
+
+    ticks: int = 0
+    overruns: int = 0
+    missed: int = 0
+
+
+class Scheduler(Generic[K]):
+    """Fires ticks for several jobs at fixed deadlines on a monotonic clock
+
+    Deadlines advance by exactly one interval per tick, so time spent working does not stretch the
+    period. A tick whose work runs past the job's next deadline is counted as an overrun, and any
+    deadlines passed entirely are counted as missed and skipped rather than fired in a burst.
+
+    :param intervals: tick interval of each job (seconds)
+    :param clock: monotonic clock, defaults to time.monotonic
+    """
+
+    def __init__(self, intervals: dict[K, float], clock: Callable[[], float] = time.monotonic) -> None:
+        self.intervals = intervals
+        self.clock = clock
+        self.stats = {job: TickStats() for job in intervals}
+
+    def reschedule(self, intervals: dict[K, float]) -> None:
+        """Replace the jobs and their intervals
+
+        New jobs are due at the next tick, removed jobs stop ticking, and jobs kept move to their
+        new interval after their next tick.
+
+        :param intervals: tick interval of each job (seconds)
+        """
+        self.intervals = intervals
+        for job in intervals.keys() - self.stats.keys():
+            self.stats[job] = TickStats()
+
+    async def ticks(self) -> AsyncIterator[dict[K, float]]:
+        """Yield the jobs due at each deadline
+
+        :return: due jobs, with the real time elapsed since their previous tick (their interval on the first tick)
+        """
+        started = self.clock()
+        deadlines = {job: started for job in self.intervals}
+        previous: dict[K, float] = {}
+
+        while True:
+            if deadlines.keys() != self.intervals.keys():
+                now = self.clock()
+                deadlines = {job: deadlines.get(job, now) for job in self.intervals}
+            delay = min(deadlines.values()) - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            now = self.clock()
+            due = [job for job, deadline in deadlines.items() if deadline <= now]
+            elapsed = {job: now - previous[job] if job in previous else self.intervals[job] for job in due}
+            for job in due:
+                previous[job] = now
+                self.stats[job].ticks += 1
+
+            yield elapsed
+
+            finished = self.clock()
+            for job in due:
+                interval = self.intervals[job]
+                deadlines[job] += interval
+                if finished > deadlines[job]:
+                    missed = int((finished - deadlines[job]) // interval)
+                    self.stats[job].overruns += 1
+                    self.stats[job].missed += missed
+                    deadlines[job] += missed * interval
@@ -0,0 +1,4 @@
+from vu1_monitor.telemetry.exporter import Exporter, start_exporter
+from vu1_monitor.telemetry.registry import Counter, Gauge, Histogram, Registry
+
+__all__ = ["Counter", "Exporter", "Gauge", "Histogram", "Registry", "start_exporter"]
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+
+from vu1_monitor.config import settings
+from vu1_monitor.telemetry.instruments import REGISTRY, TELEMETRY_RENDER
+from vu1_monitor.telemetry.registry import Registry
+
+logger = logging.getLogger(settings.name)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Exporter:
+    """Exposes a registry in the Prometheus text format, within a CPU budget
+
+    Rendering is the only costly part of telemetry, so renders are rate limited: after a render
+    taking `cost` seconds, the next one happens no sooner than `cost / budget` seconds later,
+    and scrapes in between are answered with the previous render.
+
+    :param registry: metrics to expose, defaults to the vu1-monitor registry
+    :param budget: maximum fraction (0-1) of one CPU spent rendering metrics
+    """
+
+    def __init__(self, registry: Registry = REGISTRY, budget: float = 0.01) -> None:
+        self.registry = registry
+        self.budget = budget
+        self._text: str | None = None
+        self._rendered_at = 0.0
+        self._cost = 0.0
+
+    def render(self) -> str:
+        """Render the registry, or return the previous render while within its budget window
+
+        :return: metrics in the Prometheus text exposition format
+        """
+        now = time.monotonic()
+        if self._text is not None and now - self._rendered_at < self._cost / self.budget:
+            return self._text
+
+        started = time.perf_counter()
+        self._text = self.registry.render()
+        self._cost = time.perf_counter() - started
+        self._rendered_at = now
+        TELEMETRY_RENDER.inc(self._cost)
+        return self._text
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """answer a single HTTP request for /metrics"""
+        try:
+            request_line = (await reader.readuntil(b"\r\n\r\n")).split(b"\r\n", 1)[0].decode("latin-1")
+            method, target, _ = request_line.split(" ", 2)
+            if method == "GET" and target.split("?", 1)[0] == "/metrics":
+                status, content_type, body = "200 OK", CONTENT_TYPE, self.render().encode()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> asyncio.Server:
+        """Serve metrics over HTTP at /metrics
+
+        :param host: address to listen on
+        :param port: port to listen on
+        :return: running server
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    def write_textfile(self, path: Path) -> None:
+        """Write metrics for the node exporter textfile collector
+
+        The file is replaced atomically, so the collector never reads a partial file.
+
+        :param path: file to write (should end in .prom)
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.name}.{os.getpid()}")
+        partial.write_text(self.render())
+        os.replace(partial, path)
+
+    async def run_textfile(self, path: Path, interval: float) -> None:
+        """Periodically write metrics to a textfile
+
+        :param path: file to write
+        :param interval: time between writes (seconds)
+        """
+        while True:
+            try:
+                self.write_textfile(path)
+            except OSError as e:
+                logger.warning(f"failed to write metrics to {path}: {e}")
+            await asyncio.sleep(interval)
+
+
+async def start_exporter(exporter: Exporter | None = None) -> list[asyncio.Task]:
+    """Start the exporters enabled in settings
+
+    :param exporter: exporter to run, defaults to one exposing the vu1-monitor registry
+    :return: running exporter tasks (cancel them to stop exporting)
+    """
+    exporter = exporter or Exporter(budget=settings.telemetry.budget)
+    tasks: list[asyncio.Task] = []
+
+    if settings.telemetry.port:
+        try:
+            server = await exporter.serve(settings.telemetry.host, settings.telemetry.port)
+            tasks.append(asyncio.create_task(server.serve_forever()))
+            logger.info(f"serving metrics on http://{settings.telemetry.host}:{settings.telemetry.port}/metrics")
+        except OSError as e:
+            logger.warning(f"failed to serve metrics: {e}")
+
+    if settings.telemetry.textfile:
+        path = Path(settings.telemetry.textfile).expanduser()
+        tasks.append(asyncio.create_task(exporter.run_textfile(path, settings.telemetry.interval)))
+        logger.info(f"writing metrics to {path}")
+
+    return tasks
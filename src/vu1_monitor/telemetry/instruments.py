@@ -0,0 +1,64 @@
+import os
+import time
+
+from vu1_monitor.telemetry.registry import Registry
+
+REGISTRY = Registry()
+
+TICK_DURATION = REGISTRY.histogram(
+    "vu1_monitor_tick_duration_seconds", "Time taken to publish the dial updates of a monitoring tick"
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "vu1_monitor_http_request_duration_seconds", "VU Server request latency", ("dial", "element")
+)
+HTTP_RETRIES = REGISTRY.counter("vu1_monitor_http_retries_total", "VU Server requests retried after a timeout")
+WRITES = REGISTRY.counter(
+    "vu1_monitor_writes_total", "Dial writes by outcome (sent or suppressed)", ("dial", "element", "outcome")
+)
+UPDATES_DISCARDED = REGISTRY.counter(
+    "vu1_monitor_updates_discarded_total",
+    "Dial values never sent, by reason (coalesced by a newer value, or dropped as too old)",
+    ("dial", "reason"),
+)
+OUTAGE_BUCKETS = (1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+SERVER_UP = REGISTRY.gauge("vu1_monitor_server_up", "Whether the VU Server is reachable (1) or in an outage (0)")
+SERVER_OUTAGES = REGISTRY.counter("vu1_monitor_server_outages_total", "VU Server outages survived while monitoring")
+OUTAGE_DURATION = REGISTRY.histogram(
+    "vu1_monitor_server_outage_seconds",
+    "Time from losing the VU Server until it answered again",
+    buckets=OUTAGE_BUCKETS,
+)
+RECOVERY_DURATION = REGISTRY.histogram(
+    "vu1_monitor_server_recovery_seconds",
+    "Time from losing the VU Server until dial updates were written again",
+    buckets=OUTAGE_BUCKETS,
+)
+COLLECTOR_DURATION = REGISTRY.histogram(
+    "vu1_monitor_collector_duration_seconds", "Time taken to sample a dial metric", ("dial",)
+)
+TELEMETRY_RENDER = REGISTRY.counter("vu1_monitor_telemetry_render_seconds_total", "Time spent rendering these metrics")
+PROCESS_CPU = REGISTRY.counter("process_cpu_seconds_total", "User and system CPU time of the daemon (seconds)")
+PROCESS_RSS = REGISTRY.gauge("process_resident_memory_bytes", "Resident memory of the daemon (bytes)")
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _resident_memory() -> float:
+    """resident set size of this process, from /proc when available"""
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            return float(int(file.read().split()[1]) * _PAGE_SIZE)
+    except OSError:
+        import psutil
+
+        return float(psutil.Process().memory_info().rss)
+
+
+def _update_process() -> None:
+    """refresh the daemon's own CPU and memory usage"""
+    cpu = PROCESS_CPU.labels()
+    cpu.inc(time.process_time() - cpu.value)
+    PROCESS_RSS.set(_resident_memory())
+
+
+REGISTRY.on_render(_update_process)
@@ -0,0 +1,193 @@
+import bisect
+from abc import ABC, abstractmethod
+from typing import Callable, Generic, TypeVar
+
+LabelValues = tuple[str, ...]
+M = TypeVar("M", bound="_Series")
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value: str) -> str:
+    """escape a label value for the text exposition format"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Series(ABC):
+    """a single labelled time series"""
+
+    @abstractmethod
+    def samples(self, name: str, labels: str) -> list[str]:
+        """exposition lines of the series"""
+
+
+class _CounterSeries(_Series):
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def samples(self, name: str, labels: str) -> list[str]:
+        return [f"{name}{labels} {self.value}"]
+
+
+class _GaugeSeries(_CounterSeries):
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramSeries(_Series):
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: str) -> list[str]:
+        inner = labels[1:-1] + "," if labels else ""
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{inner}le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{labels} {self.sum}")
+        lines.append(f"{name}_count{labels} {self.count}")
+        return lines
+
+
+class _Metric(ABC, Generic[M]):
+    """a named metric holding one series per set of label values"""
+
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series: dict[LabelValues, M] = {}
+
+    @abstractmethod
+    def _new(self) -> M:
+        """create an empty series"""
+
+    def labels(self, *values: str) -> M:
+        """series for a set of label values (created on first use)"""
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            series = self._series[values] = self._new()
+        return series
+
+    def render(self) -> list[str]:
+        documentation = self.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines = [f"# HELP {self.name} {documentation}", f"# TYPE {self.name} {self.type}"]
+        for values, series in self._series.items():
+            pairs = ",".join(
+                f'{label}="{_escape(value)}"' for label, value in zip(self.labelnames, values, strict=True)
+            )
+            lines.extend(series.samples(self.name, f"{{{pairs}}}" if pairs else ""))
+        return lines
+
+
+class Counter(_Metric[_CounterSeries]):
+
+    type = "counter"
+
+    def _new(self) -> _CounterSeries:
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """increment the unlabelled series"""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric[_GaugeSeries]):
+
+    type = "gauge"
+
+    def _new(self) -> _GaugeSeries:
+        return _GaugeSeries()
+
+    def set(self, value: float) -> None:
+        """set the unlabelled series"""
+        self.labels().set(value)
+
+
+class Histogram(_Metric[_HistogramSeries]):
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new(self) -> _HistogramSeries:
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """observe a value in the unlabelled series"""
+        self.labels().observe(value)
+
+
+class Registry:
+    """Collection of metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, _Metric] = {}
+        self.callbacks: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        """add a metric to the registry"""
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """create and register a counter"""
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """create and register a gauge"""
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """create and register a histogram"""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def on_render(self, callback: Callable[[], None]) -> None:
+        """call `callback` before every render, to refresh metrics that are read rather than observed"""
+        self.callbacks.append(callback)
+
+    def render(self) -> str:
+        """render every metric in the Prometheus text exposition format"""
+        for callback in self.callbacks:
+            callback()
+        lines = [line for metric in self.metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
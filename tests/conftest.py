@@ -1,15 +1,36 @@
 import json
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 from dynaconf import settings  # type: ignore
 
+from vu1_monitor.config import settings as vu1_settings
+
 
 @pytest.fixture(scope="session", autouse=True)
 def set_test_settings():
     settings.configure(FORCE_ENV_FOR_DYNACONF="testing")
 
 
+@pytest.fixture(autouse=True)
+def dial_cache(tmp_path: Path) -> Iterator[Path]:
+    """keep the dial discovery cache of each test in its own directory"""
+    path = vu1_settings.server.cache.path
+    vu1_settings.set("server.cache.path", str(tmp_path))
+    yield tmp_path
+    vu1_settings.set("server.cache.path", path)
+
+
+@pytest.fixture(autouse=True)
+def control_socket(tmp_path: Path) -> Iterator[Path]:
+    """point the daemon control socket of each test at its own directory"""
+    path = vu1_settings.control.path
+    vu1_settings.set("control.path", str(tmp_path / "control.sock"))
+    yield tmp_path / "control.sock"
+    vu1_settings.set("control.path", path)
+
+
 @pytest.fixture
 def assert_all_responses_were_requested() -> bool:
     return False
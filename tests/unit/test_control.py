@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import subprocess
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from pytest_mock import MockFixture
+
+from vu1_monitor.control import ControlServer, send_command
+from vu1_monitor.control.protocol import decode, encode, request
+from vu1_monitor.dials.client import VU1Client
+from vu1_monitor.exceptions import ControlError, ControlTimeout, DialNotImplemented
+from vu1_monitor.handlers.dials import _start_controller, monitoring_status, reset_dials, set_backlight
+from vu1_monitor.handlers.process import run_as_child
+from vu1_monitor.models.models import DialType, Element
+
+
+@pytest_asyncio.fixture
+async def daemon(control_socket: Path) -> AsyncIterator[dict[str, list]]:
+    """control server recording the commands it receives"""
+    calls: dict[str, list] = {"backlight": [], "reset": []}
+
+    async def backlight(colour: list[int], dial: str | None) -> dict:
+        calls["backlight"].append((colour, dial))
+        return {"done": [dial], "failed": {}, "skipped": []}
+
+    async def reset(element: str) -> dict:
+        if element == Element.IMAGE.value:
+            raise DialNotImplemented("CPU dial is not set up", DialType.CPU)
+        calls["reset"].append(element)
+        return {"done": ["CPU"], "failed": {}, "skipped": []}
+
+    async def status() -> dict:
+        return {"uptime": 1.0}
+
+    server = ControlServer({"backlight": backlight, "reset": reset, "status": status})
+    await server.start(control_socket)
+    yield calls
+    await server.close()
+
+
+################
+### Protocol ###
+################
+
+
+def test_protocol_round_trip() -> None:
+    """test requests survive encoding as a line of JSON"""
+    line = encode(request("backlight", colour=[1, 2, 3], dial=None))
+    assert line.endswith(b"\n")
+    assert decode(line) == {"command": "backlight", "args": {"colour": [1, 2, 3], "dial": None}}
+
+
+def test_protocol_invalid() -> None:
+    """test messages that are not JSON objects are rejected"""
+    with pytest.raises(ValueError):
+        decode(b"[1, 2]\n")
+    with pytest.raises(ValueError):
+        decode(b"{not json\n")
+
+
+#######################
+### Server & client ###
+#######################
+
+
+@pytest.mark.asyncio
+async def test_send_command(daemon: dict, control_socket: Path) -> None:
+    """test commands are run by the daemon and answered"""
+    response = await send_command(control_socket, "status")
+    assert response == {"status": "ok", "data": {"uptime": 1.0}}
+
+    await send_command(control_socket, "backlight", colour=[20, 0, 0], dial="CPU")
+    assert daemon["backlight"] == [([20, 0, 0], "CPU")]
+
+
+@pytest.mark.asyncio
+async def test_send_command_failures(daemon: dict, control_socket: Path) -> None:
+    """test unknown commands, bad arguments and command errors are raised to the sender"""
+    with pytest.raises(ControlError, match="unknown command"):
+        await send_command(control_socket, "explode")
+    with pytest.raises(ControlError, match="invalid arguments"):
+        await send_command(control_socket, "reset", colour="RED")
+    with pytest.raises(ControlError, match="CPU dial is not set up"):
+        await send_command(control_socket, "reset", element="image")
+
+
+@pytest.mark.asyncio
+async def test_server_command_type_error(control_socket: Path) -> None:
+    """test a TypeError raised while running a command is reported as it is, not as invalid arguments"""
+
+    async def broken(value: int) -> dict:
+        raise TypeError(f"unsupported value: {value}")
+
+    server = ControlServer({"broken": broken})
+    await server.start(control_socket)
+    try:
+        with pytest.raises(ControlError, match="unsupported value: 1") as error:
+            await send_command(control_socket, "broken", value=1)
+        assert "invalid arguments" not in error.value.message
+        with pytest.raises(ControlError, match="invalid arguments"):
+            await send_command(control_socket, "broken", colour="RED")
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_send_command_not_running(control_socket: Path) -> None:
+    """test no response is returned when no daemon is listening"""
+    assert await send_command(control_socket, "status") is None
+
+    control_socket.touch()
+    assert await send_command(control_socket, "status") is None
+
+
+@pytest.mark.asyncio
+async def test_send_command_timeout(control_socket: Path) -> None:
+    """test a daemon that doesn't answer in time raises a timeout"""
+
+    async def hang() -> dict:
+        await asyncio.sleep(10)
+        return {}
+
+    server = ControlServer({"status": hang})
+    await server.start(control_socket)
+    try:
+        with pytest.raises(ControlTimeout):
+            await send_command(control_socket, "status", timeout=0.05)
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_send_command_without_unix_sockets(
+    monkeypatch: pytest.MonkeyPatch, daemon: dict, control_socket: Path
+) -> None:
+    """test the daemon is treated as not running on platforms without unix sockets"""
+    monkeypatch.delattr(asyncio, "open_unix_connection")
+    assert await send_command(control_socket, "status") is None
+
+
+@pytest.mark.asyncio
+async def test_server_replaces_stale_socket(control_socket: Path) -> None:
+    """test a socket left by a previous daemon is replaced, and removed on close"""
+    control_socket.touch()
+    server = ControlServer({})
+    await server.start(control_socket)
+    assert control_socket.is_socket()
+    assert control_socket.stat().st_mode & 0o777 == 0o600
+
+    await server.close()
+    assert not control_socket.exists()
+
+
+@pytest.mark.asyncio
+async def test_server_keeps_live_socket(daemon: dict, control_socket: Path) -> None:
+    """test a second daemon doesn't take over the socket of a daemon that is still listening"""
+    server = ControlServer({})
+    with pytest.raises(OSError, match="another monitoring daemon is listening"):
+        await server.start(control_socket)
+
+    assert await send_command(control_socket, "status") == {"status": "ok", "data": {"uptime": 1.0}}
+
+
+@pytest.mark.asyncio
+async def test_server_private_directory(tmp_path: Path) -> None:
+    """test the socket directory is created readable by the current user only"""
+    path = tmp_path / "control" / "control.sock"
+    server = ControlServer({})
+    await server.start(path)
+    try:
+        assert path.parent.stat().st_mode & 0o777 == 0o700
+        assert path.stat().st_mode & 0o777 == 0o600
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_server_many_requests(daemon: dict, control_socket: Path) -> None:
+    """test one connection can send several requests"""
+    reader, writer = await asyncio.open_unix_connection(str(control_socket))
+    for element in ("dial", "backlight"):
+        writer.write(encode(request("reset", element=element)))
+        assert decode(await reader.readline())["status"] == "ok"
+    writer.close()
+    assert daemon["reset"] == ["dial", "backlight"]
+
+
+################
+### Handlers ###
+################
+
+
+@pytest.mark.asyncio
+async def test_handlers_use_daemon(mocker: MockFixture, daemon: dict) -> None:
+    """test CLI handlers send their command to the running daemon instead of the VU Server"""
+    get_dials = mocker.patch.object(VU1Client, "aget_dials")
+
+    await set_backlight("RED", "MAX", DialType.CPU)
+    await reset_dials(Element.DIAL)
+
+    assert daemon["backlight"] == [([100, 0, 0], "CPU")]
+    assert daemon["reset"] == ["dial"]
+    get_dials.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_handlers_fall_back(mocker: MockFixture, dial_body: dict) -> None:
+    """test CLI handlers call the VU Server directly when no daemon is running"""
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
+    set_backlight_mock = mocker.patch.object(VU1Client, "set_backlight")
+
+    await set_backlight("RED", "MAX", DialType.CPU)
+
+    set_backlight_mock.assert_awaited_once_with(DialType.CPU, (100, 0, 0), force=True)
+
+
+@pytest.mark.asyncio
+async def test_backlight_all_dials(mocker: MockFixture, dial_body: dict, caplog: pytest.LogCaptureFixture) -> None:
+    """test setting every backlight only writes to the connected dials"""
+    dial_body["data"] = dial_body["data"][:2]
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
+    set_backlight_mock = mocker.patch.object(VU1Client, "set_backlight")
+
+    with caplog.at_level(logging.WARNING):
+        await set_backlight("RED", "MAX", None)
+
+    assert {call.args[0] for call in set_backlight_mock.await_args_list} == {DialType.CPU, DialType.MEMORY}
+    assert "dial not found" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_handlers_fall_back_on_timeout(mocker: MockFixture, dial_body: dict) -> None:
+    """test CLI handlers call the VU Server directly when the daemon doesn't answer in time"""
+    mocker.patch("vu1_monitor.control.send_command", side_effect=ControlTimeout("monitoring daemon did not answer"))
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
+    set_backlight_mock = mocker.patch.object(VU1Client, "set_backlight")
+
+    await set_backlight("RED", "MAX", DialType.CPU)
+
+    set_backlight_mock.assert_awaited_once_with(DialType.CPU, (100, 0, 0), force=True)
+
+
+def test_daemon_output_discarded(mocker: MockFixture) -> None:
+    """test the daemon's output isn't piped to a reader that never drains it"""
+    mocker.patch("vu1_monitor.handlers.process.check_pid", return_value=False)
+    mocker.patch("vu1_monitor.handlers.process.write_lock")
+    popen = mocker.patch("subprocess.Popen")
+
+    run_as_child(["vu1-monitor", "run"])
+
+    assert popen.call_args.kwargs["stdout"] == popen.call_args.kwargs["stderr"] == subprocess.DEVNULL
+
+
+@pytest.mark.asyncio
+async def test_status(control_socket: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """test status is served by the daemon's controller, and reported as unavailable without one"""
+    with caplog.at_level(logging.WARNING):
+        await monitoring_status()
+    assert "no monitoring running" in caplog.text
+
+    async def status() -> dict:
+        return {
+            "uptime": 12.0,
+            "breaker": "closed",
+            "dials": {
+                "CPU": {"value": 42.0, "interval": 1, "disabled": False, "ticks": 12, "overruns": 0, "missed": 0}
+            },
+            "writes": {"dial": {"sent": 10, "suppressed": 2}},
+        }
+
+    client = VU1Client("test", 5430, "test", testing=True)
+    controller = await _start_controller(client, status)
+    assert controller is not None
+    try:
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            await monitoring_status()
+        assert "CPU: 42.0 (every 1s, ticks: 12" in caplog.text
+        assert "dial writes sent: 10, suppressed: 2" in caplog.text
+    finally:
+        await controller.close()
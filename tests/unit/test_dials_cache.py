@@ -0,0 +1,60 @@
+import pytest
+from pytest_mock import MockFixture
+
+from vu1_monitor.dials.cache import WriteCache
+from vu1_monitor.models.models import Aggregate, DialType, Element
+from vu1_monitor.scheduler import DialPolicy
+
+
+@pytest.fixture
+def cache() -> WriteCache:
+    return WriteCache(deadband={DialType.CPU: 2}, max_staleness={DialType.CPU: 30})
+
+
+def test_first_write_sent(cache: WriteCache) -> None:
+    """test a dial with no previous write is always sent"""
+    assert cache.should_send(DialType.CPU, Element.DIAL, 10)
+
+
+def test_deadband_suppresses(cache: WriteCache) -> None:
+    """test writes within the deadband are suppressed and counted"""
+    cache.record(DialType.CPU, Element.DIAL, 10)
+
+    assert not cache.should_send(DialType.CPU, Element.DIAL, 12)
+    assert cache.should_send(DialType.CPU, Element.DIAL, 13)
+    assert cache.stats[Element.DIAL].sent == 1
+    assert cache.stats[Element.DIAL].suppressed == 1
+
+
+def test_backlight_suppresses_same_colour(cache: WriteCache) -> None:
+    """test backlights are only suppressed for an identical colour"""
+    cache.record(DialType.CPU, Element.BACKLIGHT, (10, 10, 10))
+
+    assert not cache.should_send(DialType.CPU, Element.BACKLIGHT, (10, 10, 10))
+    assert cache.should_send(DialType.CPU, Element.BACKLIGHT, (10, 10, 11))
+
+
+def test_max_staleness_refreshes(mocker: MockFixture, cache: WriteCache) -> None:
+    """test an unchanged value is re-sent once the last write is stale"""
+    monotonic = mocker.patch("vu1_monitor.dials.cache.time.monotonic", return_value=100.0)
+    cache.record(DialType.CPU, Element.DIAL, 10)
+
+    monotonic.return_value = 129.0
+    assert not cache.should_send(DialType.CPU, Element.DIAL, 10)
+    monotonic.return_value = 130.0
+    assert cache.should_send(DialType.CPU, Element.DIAL, 10)
+
+
+def test_invalidate(cache: WriteCache) -> None:
+    """test invalidated dials are sent again"""
+    cache.record(DialType.CPU, Element.DIAL, 10)
+    cache.invalidate(DialType.CPU)
+    assert cache.should_send(DialType.CPU, Element.DIAL, 10)
+
+
+def test_from_policies() -> None:
+    """test deadband and max staleness are taken from the dial policies"""
+    policy = DialPolicy(1, 1, 5, 60.0, Aggregate.MEAN, 1)
+    cache = WriteCache.from_policies({DialType.GPU: policy})
+    assert cache.deadband == {DialType.GPU: 5}
+    assert cache.max_staleness == {DialType.GPU: 60.0}
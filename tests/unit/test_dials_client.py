@@ -1,17 +1,23 @@
+import asyncio
+import re
 from pathlib import Path
 
 import httpx
 import pytest
+import pytest_asyncio
 from httpx import HTTPError
 from pytest_httpx import HTTPXMock
 
-from vu1_monitor.dials.client import VU1Client, async_handler, sync_handler
+from vu1_monitor.config import settings
+from vu1_monitor.dials.retry import CircuitState
+from vu1_monitor.dials.client import SUPPRESSED, VU1Client, async_handler, sync_handler
 from vu1_monitor.exceptions.dials import (
     DialNotFound,
     DialNotImplemented,
     ServerNotFound,
 )
-from vu1_monitor.models.models import Dial, DialType
+from vu1_monitor.images import prepare_image
+from vu1_monitor.models.models import Dial, DialType, Element
 
 
 @pytest.fixture
@@ -19,10 +25,52 @@ def client() -> VU1Client:
     return VU1Client("test", 5430, "test", testing=True)
 
 
-@pytest.fixture
-def client_loaded(httpx_mock: HTTPXMock, dial_body: dict) -> VU1Client:
+@pytest_asyncio.fixture
+async def client_loaded(httpx_mock: HTTPXMock, dial_body: dict) -> VU1Client:
+    httpx_mock.add_response(json=dial_body)
+    return await VU1Client("test", 5430, "test").__aenter__()
+
+
+############################
+### Connection lifecycle ###
+############################
+
+
+@pytest.mark.asyncio
+async def test_client_context_closes_pool() -> None:
+    """test async context manager closes pooled connections on exit"""
+    async with VU1Client("test", 5430, "test", testing=True) as client:
+        assert not client._async_client.is_closed
+    assert client._async_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_client_context_discovers(httpx_mock: HTTPXMock, dial_body: dict) -> None:
+    """test dials are discovered on entering the context, and the pool closed when discovery fails"""
+    client = VU1Client("test", 5430, "test")
+    assert client.dials == {}
+
+    httpx_mock.add_exception(httpx.ConnectError("test"))
+    with pytest.raises(ServerNotFound):
+        async with client:
+            pass
+    assert client._async_client.is_closed
+
     httpx_mock.add_response(json=dial_body)
-    return VU1Client("test", 5430, "test")
+    async with VU1Client("test", 5430, "test") as client:
+        assert client.check_dial(DialType.CPU)
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_pool(httpx_mock: HTTPXMock, client_loaded: VU1Client, value_body: dict) -> None:
+    """test dial updates are sent through the same pooled client"""
+    httpx_mock.add_response(json=value_body)
+    httpx_mock.add_response(json=value_body)
+    pool = client_loaded._async_client
+    await client_loaded.set_dial(DialType.CPU, 10)
+    await client_loaded.set_dial(DialType.CPU, 20)
+    assert client_loaded._async_client is pool
+    assert len(httpx_mock.get_requests()) == 3
 
 
 ##################################
@@ -95,38 +143,43 @@ async def test_async_timeout_error(httpx_mock: HTTPXMock) -> None:
 #############################
 
 
-def test_get_dials(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
+@pytest.mark.asyncio
+async def test_get_dials(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
     """test get dials manipulates body correctly"""
     httpx_mock.add_response(json=dial_body)
-    response = client.get_dials()
+    response = await client.aget_dials()
     assert response == dial_body["data"]
 
 
-def test_get_dials_raises(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
+@pytest.mark.asyncio
+async def test_get_dials_raises(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
     """test get dials raises HTTPError on non 200"""
     httpx_mock.add_response(status_code=400, json=dial_body)
     with pytest.raises(HTTPError):
-        client.get_dials()
+        await client.aget_dials()
 
 
-def test_load_dials(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
+@pytest.mark.asyncio
+async def test_load_dials(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
     """test load dials populates dials correctly"""
     httpx_mock.add_response(json=dial_body)
-    client._load_dials()
+    await client._load_dials()
     assert len(client.dials) == len(dial_body["data"])
     for dial in client.dials:
         assert isinstance(client.dials[dial], Dial)
 
 
-def test_load_dials_no_dials_configured(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
+@pytest.mark.asyncio
+async def test_load_dials_no_dials_configured(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
     """test load dials fails when no dials have been configured"""
     dial_body["data"] = []
     httpx_mock.add_response(json=dial_body)
     with pytest.raises(DialNotFound, match="no dials returned from VU Server"):
-        client._load_dials()
+        await client._load_dials()
 
 
-def test_load_dials_no_dials_correctly_configured(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
+@pytest.mark.asyncio
+async def test_load_dials_no_dials_correctly_configured(httpx_mock: HTTPXMock, client: VU1Client, dial_body: dict):
     """test load dials fails when no dials have been configured correctly (mismatch names)"""
     new_dials = []
     for dial in dial_body["data"]:
@@ -136,7 +189,7 @@ def test_load_dials_no_dials_correctly_configured(httpx_mock: HTTPXMock, client:
 
     httpx_mock.add_response(json=dial_body)
     with pytest.raises(DialNotFound, match="no known dials found"):
-        client._load_dials()
+        await client._load_dials()
 
 
 def test_check_dial_exists(httpx_mock: HTTPXMock, client_loaded: VU1Client):
@@ -150,6 +203,90 @@ def test_check_dial_not_exists(httpx_mock: HTTPXMock, client_loaded: VU1Client):
     assert client_loaded.check_dial(DialType.CPU) is False
 
 
+##############################
+### Discovery cache tests ###
+##############################
+
+
+@pytest.mark.asyncio
+async def test_load_dials_cached(httpx_mock: HTTPXMock, dial_body: dict):
+    """test a fresh discovery cache is used instead of the VU Server"""
+    httpx_mock.add_response(json=dial_body)
+    async with VU1Client("test", 5430, "test"):
+        pass
+    async with VU1Client("test", 5430, "test") as client:
+        pass
+
+    assert len(httpx_mock.get_requests()) == 1
+    assert client.check_dial(DialType.CPU)
+
+
+@pytest.mark.asyncio
+async def test_load_dials_cache_disabled(httpx_mock: HTTPXMock, dial_body: dict):
+    """test dials are always discovered when the cache is disabled"""
+    httpx_mock.add_response(json=dial_body)
+    settings.set("server.cache.enabled", False)
+    try:
+        for _ in range(2):
+            async with VU1Client("test", 5430, "test"):
+                pass
+    finally:
+        settings.set("server.cache.enabled", True)
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_dials(httpx_mock: HTTPXMock, client_loaded: VU1Client, dial_body: dict, value_body: dict):
+    """test refresh rediscovers dials and re-sends values of replaced dials"""
+    httpx_mock.add_response(json=value_body, url=re.compile(r".*/set.*"))
+    await client_loaded.set_dial(DialType.CPU, 50)
+
+    dial_body["data"][0]["uid"] = "replaced"
+    httpx_mock.add_response(json=dial_body, url=re.compile(r".*/list.*"))
+    dials = await client_loaded.refresh_dials()
+
+    assert dials[DialType.CPU].uid == "replaced"
+    assert client_loaded.writes.should_send(DialType.CPU, Element.DIAL, 50)
+
+
+@pytest.mark.asyncio
+async def test_reconnect(httpx_mock: HTTPXMock, client_loaded: VU1Client, dial_body: dict, value_body: dict):
+    """test reconnecting probes past an open circuit, closes it and re-sends every dial value"""
+    httpx_mock.add_response(json=value_body, url=re.compile(r".*/set.*"))
+    await client_loaded.set_dial(DialType.CPU, 50)
+    for _ in range(client_loaded.breaker.threshold):
+        client_loaded.breaker.record_failure()
+
+    httpx_mock.add_exception(httpx.ConnectError("test"), url=re.compile(r".*/list.*"))
+    with pytest.raises(ServerNotFound):
+        await client_loaded.reconnect()
+
+    httpx_mock.add_response(json=dial_body, url=re.compile(r".*/list.*"))
+    dials = await client_loaded.reconnect()
+
+    assert DialType.CPU in dials
+    assert client_loaded.breaker.state == CircuitState.CLOSED
+    assert client_loaded.writes.should_send(DialType.CPU, Element.DIAL, 50)
+
+
+@pytest.mark.asyncio
+async def test_stale_cache_rediscovers(httpx_mock: HTTPXMock, dial_body: dict, value_body: dict):
+    """test a request failing against a cached dial map triggers rediscovery"""
+    httpx_mock.add_response(json=dial_body)
+    await VU1Client("test", 5430, "test").__aenter__()
+    client = await VU1Client("test", 5430, "test").__aenter__()
+    httpx_mock.reset(assert_all_responses_were_requested=False)
+
+    httpx_mock.add_response(status_code=404)
+    httpx_mock.add_response(json=dial_body)
+    httpx_mock.add_response(json=value_body)
+    response = await client.set_dial(DialType.CPU, 50)
+
+    assert response == value_body
+    assert [request.url.path.rsplit("/", 1)[-1] for request in httpx_mock.get_requests()] == ["set", "list", "set"]
+
+
 ######################
 ### Set Dial tests ###
 ######################
@@ -185,6 +322,31 @@ async def test_set_dial_non_200(httpx_mock: HTTPXMock, client_loaded: VU1Client,
         await client_loaded.set_dial(DialType.CPU, 50)
 
 
+@pytest.mark.asyncio
+async def test_set_dial_suppressed(httpx_mock: HTTPXMock, client_loaded: VU1Client, value_body: dict):
+    """test set_dial suppresses unchanged values"""
+    httpx_mock.add_response(json=value_body)
+    await client_loaded.set_dial(DialType.CPU, 50)
+    response = await client_loaded.set_dial(DialType.CPU, 50)
+
+    assert response["message"] == "Update suppressed"
+    assert len(httpx_mock.get_requests()) == 2
+    assert client_loaded.write_stats[Element.DIAL].sent == 1
+    assert client_loaded.write_stats[Element.DIAL].suppressed == 1
+
+
+@pytest.mark.asyncio
+async def test_set_dial_forced(httpx_mock: HTTPXMock, client_loaded: VU1Client, value_body: dict):
+    """test set_dial sends unchanged values when forced"""
+    httpx_mock.add_response(json=value_body)
+    httpx_mock.add_response(json=value_body)
+    await client_loaded.set_dial(DialType.CPU, 50)
+    response = await client_loaded.set_dial(DialType.CPU, 50, force=True)
+
+    assert response == value_body
+    assert len(httpx_mock.get_requests()) == 3
+
+
 ###########################
 ### Set Backlight tests ###
 ###########################
@@ -220,6 +382,17 @@ async def test_set_backlight_non_200(httpx_mock: HTTPXMock, client_loaded: VU1Cl
         await client_loaded.set_backlight(DialType.CPU, (50, 50, 50))
 
 
+@pytest.mark.asyncio
+async def test_set_backlight_suppressed(httpx_mock: HTTPXMock, client_loaded: VU1Client, backlight_body: dict):
+    """test set_backlight suppresses an unchanged colour"""
+    httpx_mock.add_response(json=backlight_body)
+    await client_loaded.set_backlight(DialType.CPU, (50, 50, 50))
+    await client_loaded.set_backlight(DialType.CPU, (50, 50, 50))
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert client_loaded.write_stats[Element.BACKLIGHT].suppressed == 1
+
+
 #######################
 ### Set Image tests ###
 #######################
@@ -254,3 +427,132 @@ async def test_set_image_non_200(httpx_mock: HTTPXMock, client_loaded: VU1Client
     httpx_mock.add_response(status_code=400, json=image_body)
     with pytest.raises(HTTPError):
         await client_loaded.set_image(DialType.CPU, image_file)
+
+
+@pytest.mark.asyncio
+async def test_set_image_skips_upload(
+    httpx_mock: HTTPXMock, client_loaded: VU1Client, image_body: dict, image_file: Path
+):
+    """test set_image doesn't upload an image the dial already shows, unless forced"""
+    httpx_mock.add_response(json=image_body)
+    await client_loaded.set_image(DialType.CPU, image_file)
+    assert await client_loaded.set_image(DialType.CPU, image_file) == SUPPRESSED
+    assert client_loaded.writes.stats[Element.IMAGE].suppressed == 1
+
+    # upload record survives a new client
+    reloaded = await VU1Client("test", 5430, "test").__aenter__()
+    assert await reloaded.set_image(DialType.CPU, image_file) == SUPPRESSED
+
+    assert await client_loaded.set_image(DialType.CPU, image_file, force=True) == image_body
+    image_requests = [request for request in httpx_mock.get_requests() if "image/set" in request.url.path]
+    assert len(image_requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_set_image_skips_shown(
+    httpx_mock: HTTPXMock, client_loaded: VU1Client, image_body: dict, image_file: Path
+):
+    """test set_image doesn't upload an image matching the dial's reported image file"""
+    digest = (await prepare_image(image_file)).digest
+    client_loaded.dials[DialType.CPU.value].image_file = f"img_{digest}.png"
+    assert await client_loaded.set_image(DialType.CPU, image_file) == SUPPRESSED
+    assert not [request for request in httpx_mock.get_requests() if "image/set" in request.url.path]
+
+
+@pytest.mark.asyncio
+async def test_set_image_no_image_file(
+    httpx_mock: HTTPXMock, client_loaded: VU1Client, image_body: dict, image_file: Path
+):
+    """test set_image uploads to a dial that reports no image file"""
+    httpx_mock.add_response(json=image_body)
+    client_loaded.dials[DialType.CPU.value].image_file = None
+    assert await client_loaded.set_image(DialType.CPU, image_file) == image_body
+
+
+#######################
+### Bulk operations ###
+#######################
+
+
+@pytest.mark.asyncio
+async def test_reset_dials_bulk(httpx_mock: HTTPXMock, client_loaded: VU1Client, value_body: dict):
+    """test reset_dials resets every discovered dial and reports each one"""
+    httpx_mock.add_response(url=re.compile(r".*/set.*"), json=value_body)
+    report = await client_loaded.reset_dials()
+
+    assert report.ok
+    assert set(report.results) == set(DialType)
+    assert len(httpx_mock.get_requests(url=re.compile(r".*/set.*"))) == len(DialType)
+
+
+@pytest.mark.asyncio
+async def test_reset_images_bulk(
+    httpx_mock: HTTPXMock, client_loaded: VU1Client, image_body: dict, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """test reset_images uploads the bundled default images from any working directory"""
+    monkeypatch.chdir(tmp_path)
+    httpx_mock.add_response(url=re.compile(r".*/image/set.*"), json=image_body)
+    report = await client_loaded.reset_images()
+    assert report.ok
+
+    # images may have been changed outside vu1-monitor since the last reset
+    await client_loaded.reset_images()
+    assert len(httpx_mock.get_requests(url=re.compile(r".*/image/set.*"))) == 2 * len(DialType)
+
+
+@pytest.mark.asyncio
+async def test_bulk_skips_unknown_dials(httpx_mock: HTTPXMock, client_loaded: VU1Client, backlight_body: dict):
+    """test dials missing from the discovered dial map are skipped without a request"""
+    httpx_mock.add_response(url=re.compile(r".*/backlight.*"), json=backlight_body)
+    client_loaded.dials.pop(DialType.GPU)
+
+    report = await client_loaded.set_backlights((10, 10, 10), DialType)
+
+    assert report.skipped == [DialType.GPU]
+    assert DialType.GPU not in report.results
+    assert len(httpx_mock.get_requests(url=re.compile(r".*/backlight.*"))) == len(DialType) - 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_reports_errors(client_loaded: VU1Client):
+    """test a failing dial is reported without stopping the others"""
+
+    async def send(dial: DialType) -> dict:
+        if dial == DialType.MEMORY:
+            raise httpx.HTTPStatusError("bad", request=httpx.Request("GET", "/"), response=httpx.Response(500))
+        return {"status": "ok"}
+
+    report = await client_loaded.bulk(send)
+
+    assert not report.ok
+    assert list(report.errors) == [DialType.MEMORY]
+    assert len(report.results) == len(DialType) - 1
+    assert report.as_dict()["failed"] == {"MEMORY": "bad"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_bounded(client_loaded: VU1Client):
+    """test bulk operations never exceed the concurrency limit"""
+    in_flight, peak = 0, 0
+
+    async def send(dial: DialType) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {}
+
+    await client_loaded.bulk(send, concurrency=2)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_server_not_found(client_loaded: VU1Client):
+    """test an unreachable VU Server is raised rather than reported per dial"""
+
+    async def send(dial: DialType) -> dict:
+        raise ServerNotFound()
+
+    with pytest.raises(ServerNotFound):
+        await client_loaded.bulk(send)
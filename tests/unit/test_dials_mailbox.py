@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+from vu1_monitor.dials.mailbox import DialWriter, Mailbox
+from vu1_monitor.exceptions.dials import DialNotImplemented
+from vu1_monitor.models.models import DialType
+
+
+class FakeServer:
+    """records dial writes, holding each one until released"""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.writes: list[tuple[DialType, int]] = []
+        self.in_flight, self.peak = 0, 0
+
+    async def set_dial(self, dial: DialType, value: int) -> dict:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if dial == DialType.GPU:
+            raise DialNotImplemented("not set up", dial)
+        self.writes.append((dial, value))
+        return {}
+
+
+async def _settle() -> None:
+    """let writer tasks run until they wait for a new value"""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+###############
+### Mailbox ###
+###############
+
+
+@pytest.mark.asyncio
+async def test_mailbox_latest_value_wins() -> None:
+    """test values posted before the mailbox is read are overwritten by the latest"""
+    mailbox: Mailbox[int] = Mailbox()
+    for value in range(5):
+        mailbox.post(value)
+
+    value, posted = await mailbox.take()
+
+    assert value == 4
+    assert posted <= mailbox.clock()
+    assert not mailbox.pending
+    assert (mailbox.stats.posted, mailbox.stats.coalesced) == (5, 4)
+
+
+@pytest.mark.asyncio
+async def test_mailbox_clear() -> None:
+    """test clearing a waiting value counts it as dropped"""
+    mailbox: Mailbox[int] = Mailbox()
+    mailbox.clear()
+    mailbox.post(1)
+    mailbox.clear()
+
+    assert not mailbox.pending
+    assert mailbox.stats.dropped == 1
+
+
+##############
+### Writer ###
+##############
+
+
+@pytest.mark.asyncio
+async def test_writer_sends_values() -> None:
+    """test every posted dial value is written by its dial's writer"""
+    server = FakeServer()
+    writer = DialWriter(server.set_dial, 4)
+    writer.post(DialType.CPU, 10)
+    writer.post(DialType.MEMORY, 20)
+    await _settle()
+    await writer.close()
+
+    assert sorted(server.writes) == [(DialType.CPU, 10), (DialType.MEMORY, 20)]
+    assert writer.stats[DialType.CPU].sent == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_coalesces_slow_writes() -> None:
+    """test a slow server only receives the latest value once its previous write finishes"""
+    server = FakeServer(delay=0.05)
+    writer = DialWriter(server.set_dial, 4)
+    writer.post(DialType.CPU, 1)
+    await _settle()
+    for value in range(2, 10):
+        writer.post(DialType.CPU, value)
+    await asyncio.sleep(0.15)
+    await writer.close()
+
+    assert server.writes == [(DialType.CPU, 1), (DialType.CPU, 9)]
+    assert writer.stats[DialType.CPU].coalesced == 7
+
+
+@pytest.mark.asyncio
+async def test_writer_takes_latest_after_slot() -> None:
+    """test a value replaced while its writer waits for a free slot is never sent"""
+    server = FakeServer()
+    writer = DialWriter(server.set_dial, 1)
+    async with writer._limit:
+        writer.post(DialType.CPU, 1)
+        await _settle()
+        writer.post(DialType.CPU, 2)
+        await _settle()
+    await _settle()
+    await writer.close()
+
+    assert server.writes == [(DialType.CPU, 2)]
+    assert writer.stats[DialType.CPU].coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_drops_old_values() -> None:
+    """test values older than their dial's max age are dropped instead of sent"""
+    server = FakeServer(delay=0.05)
+    writer = DialWriter(server.set_dial, 1, max_age={DialType.MEMORY: 0.01})
+    writer.post(DialType.CPU, 1)
+    await _settle()
+    writer.post(DialType.MEMORY, 2)
+    await asyncio.sleep(0.1)
+    await writer.close()
+
+    assert server.writes == [(DialType.CPU, 1)]
+    assert writer.stats[DialType.MEMORY].dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_collects_errors() -> None:
+    """test a failing dial does not stop the other dials updating, and its error is collected once"""
+    server = FakeServer()
+    writer = DialWriter(server.set_dial, 4)
+    for dial in (DialType.CPU, DialType.GPU, DialType.MEMORY):
+        writer.post(dial, 10)
+    await _settle()
+
+    errors = writer.errors()
+    assert list(errors) == [DialType.GPU]
+    assert isinstance(errors[DialType.GPU], DialNotImplemented)
+    assert writer.errors() == {}
+    assert len(server.writes) == 2
+
+    writer.discard(DialType.GPU)
+    writer.post(DialType.GPU, 20)
+    await _settle()
+    assert DialType.GPU in writer.errors()
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_bounded() -> None:
+    """test writers never exceed the concurrency limit"""
+    server = FakeServer(delay=0.01)
+    writer = DialWriter(server.set_dial, 2)
+    for dial in DialType:
+        writer.post(dial, 10)
+    await asyncio.sleep(0.05)
+    await writer.close()
+
+    assert server.peak == 2
@@ -0,0 +1,225 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from pytest_mock import MockFixture
+
+from vu1_monitor.dials.client import async_handler, sync_handler
+from vu1_monitor.dials.retry import CircuitBreaker, CircuitState, RetryPolicy
+from vu1_monitor.exceptions.dials import CircuitOpen, ServerNotFound
+
+
+class Requester:
+    """minimal object exposing a breaker, as VU1Client does"""
+
+    def __init__(self, breaker: CircuitBreaker) -> None:
+        self.breaker = breaker
+
+    @async_handler(policy=RetryPolicy(retries=0))
+    async def get(self) -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            return await client.get("http://test")
+
+    @async_handler(policy=RetryPolicy(retries=0))
+    async def get_checked(self) -> httpx.Response:
+        async with httpx.AsyncClient() as client:
+            return (await client.get("http://test")).raise_for_status()
+
+    @sync_handler(policy=RetryPolicy(retries=0))
+    def get_checked_sync(self) -> httpx.Response:
+        with httpx.Client() as client:
+            return client.get("http://test").raise_for_status()
+
+
+####################
+### Retry policy ###
+####################
+
+
+def test_policy_backoff() -> None:
+    """test delays grow exponentially and are capped without jitter"""
+    policy = RetryPolicy(retries=5, sleep=1, backoff=2, max_sleep=5, jitter=0)
+    assert list(policy.delays()) == [1, 2, 4, 5, 5]
+
+
+def test_policy_jitter() -> None:
+    """test jitter only ever shortens a delay, within the jitter fraction"""
+    policy = RetryPolicy(retries=50, sleep=1, backoff=1, jitter=0.5)
+    for delay in policy.delays():
+        assert 0.5 <= delay <= 1
+
+
+def test_policy_deadline() -> None:
+    """test remaining time counts down from the deadline"""
+    policy = RetryPolicy(deadline=10)
+    assert policy.remaining(time.monotonic() - 4) == pytest.approx(6, abs=0.1)
+    assert RetryPolicy().remaining(time.monotonic()) is None
+
+
+#######################
+### Circuit breaker ###
+#######################
+
+
+def test_breaker_opens() -> None:
+    """test breaker opens after consecutive failures and refuses requests"""
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_half_open() -> None:
+    """test breaker lets a single probe through after the reset timeout"""
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_half_open_failure() -> None:
+    """test a failed probe opens the breaker again"""
+    breaker = CircuitBreaker(threshold=3, reset_timeout=0)
+    for _ in range(3):
+        breaker.record_failure()
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+
+######################
+### Error handlers ###
+######################
+
+
+@pytest.mark.asyncio
+async def test_async_retry_does_not_block(httpx_mock: HTTPXMock) -> None:
+    """test async retries sleep without blocking other tasks"""
+    httpx_mock.add_exception(httpx.TimeoutException("test"))
+    httpx_mock.add_response(status_code=200)
+    ticks = 0
+
+    @async_handler(policy=RetryPolicy(retries=1, sleep=0.2, jitter=0))
+    async def request_test():
+        async with httpx.AsyncClient() as client:
+            return await client.get("http://test")
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    response = await request_test()
+    task.cancel()
+
+    assert response.status_code == 200
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_async_deadline(httpx_mock: HTTPXMock) -> None:
+    """test retries stop once the next wait would pass the deadline"""
+    httpx_mock.add_exception(httpx.TimeoutException("test"))
+
+    @async_handler(policy=RetryPolicy(retries=3, sleep=1, jitter=0, deadline=0.5))
+    async def request_test():
+        async with httpx.AsyncClient() as client:
+            return await client.get("http://test")
+
+    with pytest.raises(httpx.TimeoutException):
+        await request_test()
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_sync_retry_backoff(httpx_mock: HTTPXMock, mocker: MockFixture) -> None:
+    """test sync retries wait with the policy backoff"""
+    sleep = mocker.patch("vu1_monitor.dials.client.time.sleep")
+    for _ in range(2):
+        httpx_mock.add_exception(httpx.TimeoutException("test"))
+    httpx_mock.add_response(status_code=200)
+
+    @sync_handler(policy=RetryPolicy(retries=2, sleep=1, backoff=3, jitter=0))
+    def request_test():
+        with httpx.Client() as client:
+            return client.get("http://test")
+
+    assert request_test().status_code == 200
+    assert [call.args[0] for call in sleep.call_args_list] == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_async_breaker_opens(httpx_mock: HTTPXMock) -> None:
+    """test handler stops sending requests once the breaker opens"""
+    httpx_mock.add_exception(httpx.ConnectError("test"))
+    requester = Requester(CircuitBreaker(threshold=1, reset_timeout=30))
+
+    with pytest.raises(ServerNotFound):
+        await requester.get()
+    with pytest.raises(CircuitOpen):
+        await requester.get()
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_breaker_recovers(httpx_mock: HTTPXMock) -> None:
+    """test a successful half-open probe closes the breaker"""
+    httpx_mock.add_response(status_code=200)
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    response = await Requester(breaker).get()
+
+    assert response.status_code == 200
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_async_breaker_opens_on_server_errors(httpx_mock: HTTPXMock) -> None:
+    """test a server answering 500 to every request opens the breaker"""
+    httpx_mock.add_response(status_code=500)
+    requester = Requester(CircuitBreaker(threshold=2, reset_timeout=30))
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await requester.get_checked()
+    with pytest.raises(CircuitOpen):
+        await requester.get_checked()
+    assert requester.breaker.state == CircuitState.OPEN
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_sync_breaker_opens_on_server_errors(httpx_mock: HTTPXMock) -> None:
+    """test a server answering 500 to every request opens the breaker (sync)"""
+    httpx_mock.add_response(status_code=500)
+    requester = Requester(CircuitBreaker(threshold=2, reset_timeout=30))
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            requester.get_checked_sync()
+    with pytest.raises(CircuitOpen):
+        requester.get_checked_sync()
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_breaker_ignores_client_errors(httpx_mock: HTTPXMock) -> None:
+    """test 4xx responses don't count towards opening the breaker"""
+    httpx_mock.add_response(status_code=404)
+    requester = Requester(CircuitBreaker(threshold=1, reset_timeout=30))
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await requester.get_checked()
+    assert requester.breaker.state == CircuitState.CLOSED
@@ -0,0 +1,32 @@
+import tarfile
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockFixture
+
+from vu1_monitor.files.assets import _assets, read_asset
+from vu1_monitor.models.models import DialImage
+
+
+def test_read_asset(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """test default dial images are read from the package from any working directory, without extracting"""
+    monkeypatch.chdir(tmp_path)
+    for image in DialImage:
+        assert read_asset(image.value).startswith(b"\x89PNG")
+    assert not list(tmp_path.iterdir())
+
+
+def test_read_asset_decompressed_once(mocker: MockFixture) -> None:
+    """test the asset archive is decompressed at most once per process"""
+    _assets.cache_clear()
+    spy = mocker.spy(tarfile, "open")
+    for _ in range(3):
+        read_asset(DialImage.CPU.value)
+        read_asset(DialImage.GPU.value)
+    assert spy.call_count == 1
+
+
+def test_read_asset_missing() -> None:
+    """test reading an asset that isn't bundled raises FileNotFoundError"""
+    with pytest.raises(FileNotFoundError):
+        read_asset("missing.png")
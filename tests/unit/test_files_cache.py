@@ -0,0 +1,49 @@
+import os
+import time
+from pathlib import Path
+
+from vu1_monitor.files.cache import clear_cache, read_cache, write_cache
+
+
+def test_cache_round_trip(tmp_path: Path) -> None:
+    """test cached data is read back"""
+    path = tmp_path / "nested" / "dials.json"
+    write_cache(path, [{"uid": "1"}])
+    assert read_cache(path, ttl=60) == [{"uid": "1"}]
+
+
+def test_cache_expired(tmp_path: Path) -> None:
+    """test cache files older than the ttl are ignored"""
+    path = tmp_path / "dials.json"
+    write_cache(path, [])
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+    assert read_cache(path, ttl=60) is None
+
+
+def test_cache_missing_or_corrupt(tmp_path: Path) -> None:
+    """test missing and unreadable cache files are ignored"""
+    path = tmp_path / "dials.json"
+    assert read_cache(path, ttl=60) is None
+    path.write_text("{not json")
+    assert read_cache(path, ttl=60) is None
+
+
+def test_clear_cache(tmp_path: Path) -> None:
+    """test clearing removes the cache file"""
+    path = tmp_path / "dials.json"
+    write_cache(path, [])
+    clear_cache(path)
+    clear_cache(path)
+    assert not path.exists()
+
+
+def test_cache_replaced(tmp_path: Path) -> None:
+    """test writing replaces the cache file rather than truncating it in place"""
+    path = tmp_path / "dials.json"
+    write_cache(path, [{"uid": "1"}])
+    with open(path) as reader:
+        write_cache(path, [{"uid": "2"}])
+        assert reader.read() == '[{"uid": "1"}]'
+    assert read_cache(path, ttl=60) == [{"uid": "2"}]
+    assert os.listdir(tmp_path) == ["dials.json"]
@@ -0,0 +1,141 @@
+import asyncio
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from pytest_mock import MockFixture
+
+from vu1_monitor.config import settings
+from vu1_monitor.dials.client import VU1Client
+from vu1_monitor.exceptions.dials import DialNotFound, ServerNotFound
+from vu1_monitor.handlers.dials import start_monitoring, wait_for_server
+from vu1_monitor.metrics.recording import Recorder
+from vu1_monitor.metrics.sampling import Sampler
+from vu1_monitor.models.models import DialType
+from vu1_monitor.scheduler import PolicyEngine
+from vu1_monitor.telemetry.instruments import SERVER_OUTAGES, SERVER_UP
+
+
+@pytest.fixture
+def client() -> VU1Client:
+    return VU1Client("test", 5430, "test", testing=True)
+
+
+@pytest.fixture
+def fast_reconnect() -> Iterator[None]:
+    sleep = settings.server.reconnect.sleep
+    settings.set("server.reconnect.sleep", 0.01)
+    yield
+    settings.set("server.reconnect.sleep", sleep)
+
+
+#################
+### Reconnect ###
+#################
+
+
+@pytest.mark.asyncio
+async def test_wait_for_server(mocker: MockFixture, client: VU1Client, fast_reconnect: None) -> None:
+    """test the VU Server is probed with backoff until it answers with dials"""
+    sleep = mocker.patch("vu1_monitor.handlers.dials.asyncio.sleep")
+    reconnect = mocker.patch.object(
+        VU1Client,
+        "reconnect",
+        side_effect=[ServerNotFound(), ServerNotFound(), DialNotFound("no dials"), {DialType.CPU: None}],
+    )
+
+    outage = await wait_for_server(client)
+
+    assert outage >= 0
+    assert reconnect.await_count == 4
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert delays == sorted(delays)
+    assert delays[0] == 0.01
+    assert delays[-1] <= settings.server.reconnect.max_sleep
+
+
+@pytest.mark.asyncio
+async def test_monitoring_survives_outage(mocker: MockFixture, dial_body: dict, fast_reconnect: None) -> None:
+    """test monitoring pauses on an outage, reconnects and resumes updating instead of exiting"""
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
+    reconnect = mocker.patch.object(VU1Client, "reconnect", return_value={DialType.CPU: None})
+    writes: list[int] = []
+
+    async def set_dial(dial: DialType, value: int) -> dict:
+        if not writes:
+            writes.append(-1)
+            raise ServerNotFound()
+        writes.append(value)
+        return {}
+
+    mocker.patch.object(VU1Client, "set_dial", side_effect=set_dial)
+    outages = SERVER_OUTAGES.labels().value
+
+    task = asyncio.create_task(start_monitoring(0.05, True, False, False, False, False))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    await task
+
+    reconnect.assert_awaited()
+    assert len(writes) > 2
+    assert SERVER_OUTAGES.labels().value == outages + 1
+    assert SERVER_UP.labels().value == 1
+
+
+##############
+### Budget ###
+##############
+
+
+@pytest.mark.asyncio
+async def test_monitoring_plans_connected_dials(mocker: MockFixture, dial_body: dict) -> None:
+    """test the request budget is shared among connected dials, and replanned when dials connect"""
+    resize = mocker.spy(Sampler, "resize")
+    connected = dial_body["data"][:2]
+    mocker.patch.object(VU1Client, "aget_dials", side_effect=[connected] + [dial_body["data"][:3]] * 10)
+    mocker.patch.object(VU1Client, "set_dial", return_value={})
+    plan = mocker.spy(PolicyEngine, "from_settings")
+    previous = (settings.server.budget, settings.server.cache.refresh, settings.server.cache.enabled)
+    settings.set("server.budget", 2)
+    settings.set("server.cache.refresh", 0.2)
+    settings.set("server.cache.enabled", False)
+    try:
+        task = asyncio.create_task(start_monitoring(0.5, False, False, False, False, True))
+        await asyncio.sleep(0.9)
+        task.cancel()
+        await task
+    finally:
+        settings.set("server.budget", previous[0])
+        settings.set("server.cache.refresh", previous[1])
+        settings.set("server.cache.enabled", previous[2])
+
+    first, replanned = plan.spy_return_list
+    assert set(first.intervals) == {DialType.CPU, DialType.MEMORY}
+    assert first.rate == pytest.approx(2)
+    assert first.intervals[DialType.CPU] == pytest.approx(2 / 3)
+    assert set(replanned.intervals) == {DialType.CPU, DialType.MEMORY, DialType.GPU}
+    assert replanned.rate == pytest.approx(2)
+    resized = {call.args[0].dial: call.args[1] for call in resize.call_args_list}
+    assert resized[DialType.CPU] == pytest.approx(replanned.intervals[DialType.CPU])
+
+
+##############
+### Replay ###
+##############
+
+
+@pytest.mark.asyncio
+async def test_monitoring_replays_recording(mocker: MockFixture, dial_body: dict, tmp_path: Path) -> None:
+    """test monitoring replays recorded values to the dials and stops at the end of the recording"""
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
+    set_dial = mocker.patch.object(VU1Client, "set_dial", return_value={})
+    path, now = tmp_path / "load.vu1rec", [0.0]
+    recorder = Recorder(path, clock=lambda: now[0])
+    for second in range(1, 11):
+        now[0] = second / 10
+        recorder.record(DialType.CPU, 60)
+    recorder.close()
+
+    await asyncio.wait_for(start_monitoring(1, True, False, True, False, False, replay=path, speed=10), 5)
+
+    assert {call.args for call in set_dial.await_args_list} == {(DialType.CPU, 60)}
@@ -0,0 +1,97 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from vu1_monitor.config import settings
+from vu1_monitor.images import SIZE, convert_image, prepare_image, prepare_image_sync
+
+
+def _encode(size: tuple[int, int], format: str = "JPEG") -> bytes:
+    """encode a plain image"""
+    output = io.BytesIO()
+    Image.new("RGB", size, "red").save(output, format=format)
+    return output.getvalue()
+
+
+def _cached_name(data: bytes) -> str:
+    """cache filename of the conversion of an encoded image"""
+    return f"{hashlib.sha256(data).hexdigest()}.png"
+
+
+##################
+### Conversion ###
+##################
+
+
+def test_convert_image() -> None:
+    """test images of any size or format are converted to a dial display PNG"""
+    for size in ((400, 400), (100, 72), (1920, 1080)):
+        with Image.open(io.BytesIO(convert_image(_encode(size)))) as image:
+            assert image.format == "PNG"
+            assert image.size == SIZE
+
+
+def test_convert_image_invalid() -> None:
+    """test data that is not an image raises OSError"""
+    with pytest.raises(OSError):
+        convert_image(b"")
+    with pytest.raises(OSError):
+        convert_image(Path("tests/fixtures/image.json").read_bytes())
+
+
+###############
+### Caching ###
+###############
+
+
+def test_prepare_image_cached(dial_cache: Path, tmp_path: Path) -> None:
+    """test conversions are cached by source content and reused"""
+    source = tmp_path / "dial.jpg"
+    source.write_bytes(_encode((400, 300)))
+
+    prepared = prepare_image_sync(source)
+    cached = list((dial_cache / "images").iterdir())
+    assert len(cached) == 1
+
+    cached[0].write_bytes(b"converted")
+    assert prepare_image_sync(source).data == b"converted"
+    assert prepare_image_sync(_encode((400, 300))).data == b"converted"
+    assert prepared.filename == f"{prepared.digest}.png"
+
+
+def test_prepare_image_cache_evicts(dial_cache: Path) -> None:
+    """test only the most recently used conversions are kept"""
+    previous = settings.server.cache.images
+    settings.set("server.cache.images", 2)
+    try:
+        first, second, third = (_encode((100 + size, 100)) for size in range(3))
+        prepare_image_sync(first)
+        prepare_image_sync(second)
+        images = dial_cache / "images"
+        for age, data in enumerate((first, second)):
+            os.utime(images / _cached_name(data), (1000 + age, 1000 + age))
+        # reusing the oldest conversion makes the second the least recently used
+        prepare_image_sync(first)
+        prepare_image_sync(third)
+    finally:
+        settings.set("server.cache.images", previous)
+
+    cached = {path.name for path in images.iterdir()}
+    assert cached == {_cached_name(first), _cached_name(third)}
+
+
+@pytest.mark.asyncio
+async def test_prepare_image_cache_disabled(dial_cache: Path, image_file: Path) -> None:
+    """test nothing is cached when the cache is disabled"""
+    settings.set("server.cache.enabled", False)
+    try:
+        first, second = await prepare_image(image_file), await prepare_image(image_file)
+    finally:
+        settings.set("server.cache.enabled", True)
+
+    assert first == second
+    assert not (dial_cache / "images").exists()
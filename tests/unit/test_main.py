@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 from itertools import product
 
 import pytest
@@ -16,7 +19,7 @@ def runner() -> CliRunner:
 
 def test_backlight_all(mocker: MockFixture, runner: CliRunner, dial_body: dict):
     """Test backlight returns successfully for all dials"""
-    mocker.patch.object(VU1Client, "get_dials", return_value=dial_body["data"])
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
     mocker.patch.object(VU1Client, "set_backlight")
 
     result = runner.invoke(backlight)
@@ -25,7 +28,7 @@ def test_backlight_all(mocker: MockFixture, runner: CliRunner, dial_body: dict):
 
 def test_backlight_args(mocker: MockFixture, runner: CliRunner, dial_body: dict):
     """Test backlight returns successfully with specific args"""
-    mocker.patch.object(VU1Client, "get_dials", return_value=dial_body["data"])
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
     mocker.patch.object(VU1Client, "set_backlight")
 
     for dial, colour, brighness in product(DialType, Colours, Bright):
@@ -38,7 +41,7 @@ def test_backlight_args(mocker: MockFixture, runner: CliRunner, dial_body: dict)
 
 def test_backlight_invalid_args(mocker: MockFixture, runner: CliRunner, dial_body: dict):
     """Test backlight fails with incorrect args"""
-    mocker.patch.object(VU1Client, "get_dials", return_value=dial_body["data"])
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
     mocker.patch.object(VU1Client, "set_backlight")
 
     result = runner.invoke(backlight, ["--dial", "CPU (Hub)"])
@@ -53,7 +56,7 @@ def test_backlight_invalid_args(mocker: MockFixture, runner: CliRunner, dial_bod
 
 def test_image(mocker: MockFixture, runner: CliRunner, dial_body: dict):
     """Test image returns successfully"""
-    mocker.patch.object(VU1Client, "get_dials", return_value=dial_body["data"])
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
     mocker.patch.object(VU1Client, "set_image")
 
     result = runner.invoke(image, ["tests/fixtures/blank.png", "--dial", "CPU"])
@@ -62,7 +65,7 @@ def test_image(mocker: MockFixture, runner: CliRunner, dial_body: dict):
 
 def test_image_bad_image(mocker: MockFixture, runner: CliRunner, dial_body: dict):
     """Test image fails with bad image args / files"""
-    mocker.patch.object(VU1Client, "get_dials", return_value=dial_body["data"])
+    mocker.patch.object(VU1Client, "aget_dials", return_value=dial_body["data"])
     mocker.patch.object(VU1Client, "set_image")
 
     result = runner.invoke(image, ["tests/fixtures/blank-bad.png", "--dial", "CPU"])
@@ -76,3 +79,12 @@ def test_image_bad_image(mocker: MockFixture, runner: CliRunner, dial_body: dict
 
     result = runner.invoke(image, ["tests/fixtures/blank.png", "--dial", "CPU (Hub)"])
     assert result.exit_code > 0
+
+
+def test_cold_start_imports():
+    """Test importing the CLI doesn't load the dependencies of individual commands"""
+    heavy = ["httpx", "psutil", "PIL", "GPUtil", "pyadl"]
+    code = f"import sys, vu1_monitor.main; print([m for m in {heavy!r} if m in sys.modules])"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockFixture
+
+from vu1_monitor.metrics import gpu
+from vu1_monitor.metrics.amdgpu import AMDGPUBackend, amd_devices
+from vu1_monitor.metrics.collectors import GPUCollector
+from vu1_monitor.metrics.gpu import get_gpu_utilisation, get_gpu_vram
+from vu1_monitor.models.models import GPUMetric
+
+GiB = 1024**3
+
+
+def fake_card(
+    root: Path, card: str, vendor: str = "0x1002", busy: int | None = 0, vram: tuple[int, int] | None = None
+) -> Path:
+    """write the sysfs files of a DRM card under a fake root"""
+    device = root / "sys" / "class" / "drm" / card / "device"
+    device.mkdir(parents=True)
+    (device / "vendor").write_text(f"{vendor}\n")
+    if busy is not None:
+        (device / "gpu_busy_percent").write_text(f"{busy}\n")
+    if vram is not None:
+        (device / "mem_info_vram_used").write_text(f"{vram[0]}\n")
+        (device / "mem_info_vram_total").write_text(f"{vram[1]}\n")
+    return device
+
+
+@pytest.fixture
+def sysfs(tmp_path: Path) -> Path:
+    """two amdgpu cards, an integrated intel card and a display connector"""
+    fake_card(tmp_path, "card1", busy=20, vram=(2 * GiB, 8 * GiB))
+    fake_card(tmp_path, "card0", busy=60, vram=(12 * GiB, 16 * GiB))
+    fake_card(tmp_path, "card2", vendor="0x8086", busy=None)
+    (tmp_path / "sys" / "class" / "drm" / "card0-DP-1").mkdir()
+    return tmp_path
+
+
+#################
+### Discovery ###
+#################
+
+
+def test_amd_devices(sysfs: Path) -> None:
+    """test only amdgpu cards are discovered, in card order"""
+    drm = sysfs / "sys" / "class" / "drm"
+    assert amd_devices(sysfs) == [drm / "card0" / "device", drm / "card1" / "device"]
+
+
+def test_amd_devices_none(tmp_path: Path) -> None:
+    """test the backend is unavailable without amdgpu cards"""
+    fake_card(tmp_path, "card0", vendor="0x10de", busy=None)
+    assert amd_devices(tmp_path) == []
+    with pytest.raises(OSError):
+        AMDGPUBackend(tmp_path)
+
+
+###############
+### Backend ###
+###############
+
+
+def test_amdgpu_utilisation(sysfs: Path) -> None:
+    """test utilisation is averaged over all devices and re-read from the open files"""
+    backend = AMDGPUBackend(sysfs)
+    assert backend.utilisation() == 40.0
+
+    (backend.devices[0].path / "gpu_busy_percent").write_text("100\n")
+    assert backend.utilisation() == 60.0
+    backend.close()
+    assert backend.utilisation() == 0.0
+
+
+def test_amdgpu_vram(sysfs: Path) -> None:
+    """test VRAM use is averaged over devices with dedicated memory"""
+    fake_card(sysfs, "card3", busy=0)
+    backend = AMDGPUBackend(sysfs)
+    assert len(backend.devices) == 3
+    assert backend.vram_percent() == pytest.approx(50.0)
+    backend.close()
+
+
+#################
+### Selection ###
+#################
+
+
+def test_amdgpu_backend_selected(mocker: MockFixture, sysfs: Path) -> None:
+    """test the amdgpu backend reads sysfs"""
+    mocker.patch.object(gpu, "_amdgpu_backend", return_value=AMDGPUBackend(sysfs))
+    assert get_gpu_utilisation("amdgpu") == 40.0
+
+
+def test_amdgpu_vram_selected(mocker: MockFixture, sysfs: Path) -> None:
+    """test VRAM use is shown by the GPU collector for AMD backends only"""
+    mocker.patch.object(gpu, "_amdgpu_backend", return_value=AMDGPUBackend(sysfs))
+    assert GPUCollector("amdgpu", GPUMetric.VRAM).sample() == pytest.approx(50.0)
+    assert get_gpu_vram("amd") == pytest.approx(50.0)
+    assert get_gpu_vram("nvidia") == 0.0
+
+
+def test_amdgpu_backend_unavailable(mocker: MockFixture) -> None:
+    """test the amdgpu backend reports 0 without amdgpu cards"""
+    mocker.patch.object(gpu, "_amdgpu_backend", return_value=None)
+    assert get_gpu_utilisation("amdgpu") == 0.0
+
+
+def test_amd_prefers_sysfs(mocker: MockFixture, sysfs: Path) -> None:
+    """test the amd backend reads sysfs when available, without loading pyadl"""
+    mocker.patch.object(gpu, "_amdgpu_backend", return_value=AMDGPUBackend(sysfs))
+    mocker.patch.dict("sys.modules", {"pyadl": None})
+    assert get_gpu_utilisation("amd") == 40.0
+
+
+def test_amd_falls_back_to_pyadl(mocker: MockFixture) -> None:
+    """test the amd backend uses pyadl without amdgpu cards"""
+    devices = [mocker.Mock(**{"getCurrentUsage.return_value": load}) for load in (10, 30)]
+    pyadl = mocker.Mock(**{"ADLManager.getInstance.return_value.getDevices.return_value": devices})
+    mocker.patch.object(gpu, "_amdgpu_backend", return_value=None)
+    mocker.patch.dict("sys.modules", {"pyadl": pyadl})
+    assert get_gpu_utilisation("amd") == 20.0
+
+
+def test_amdgpu_backend_cached(mocker: MockFixture) -> None:
+    """test the sysfs backend is created once per process"""
+    backend = mocker.patch.object(gpu, "AMDGPUBackend", side_effect=OSError("no amdgpu devices"))
+    gpu._amdgpu_backend.cache_clear()
+    assert gpu._amdgpu_backend() is None
+    assert gpu._amdgpu_backend() is None
+    assert backend.call_count == 1
+    gpu._amdgpu_backend.cache_clear()
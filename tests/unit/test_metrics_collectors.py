@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+import pytest
+from pytest_mock import MockFixture
+
+from vu1_monitor.exceptions.metrics import CollectorTimeout
+from vu1_monitor.metrics.collectors import (
+    Collector,
+    CPUCollector,
+    MemoryCollector,
+    NetworkCollector,
+    build_collectors,
+)
+from vu1_monitor.metrics.network import NetworkThroughput
+from vu1_monitor.models.models import DialType
+
+
+class BlockingCollector(Collector):
+    """collector whose sample blocks until released"""
+
+    dial = DialType.GPU
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+
+    def sample(self) -> float:
+        self.release.wait(5)
+        return 50.0
+
+
+@pytest.mark.asyncio
+async def test_collect_off_loop(mocker: MockFixture) -> None:
+    """test samples run in a worker thread and report latency"""
+    main_thread = threading.get_ident()
+    sample_thread = None
+
+    def cpu_percent() -> float:
+        nonlocal sample_thread
+        sample_thread = threading.get_ident()
+        return 42.0
+
+    mocker.patch.object(psutil, "cpu_percent", side_effect=cpu_percent)
+    collector = CPUCollector()
+
+    assert await collector.collect() == 42.0
+    assert sample_thread != main_thread
+    assert collector.latency > 0
+
+
+@pytest.mark.asyncio
+async def test_collect_timeout() -> None:
+    """test a slow sample times out and blocks overlapping samples"""
+    collector = BlockingCollector(timeout=0.05, executor=ThreadPoolExecutor(max_workers=1))
+
+    with pytest.raises(CollectorTimeout, match="timed out"):
+        await collector.collect()
+    with pytest.raises(CollectorTimeout, match="still running"):
+        await collector.collect()
+
+    collector.release.set()
+
+
+def test_network_rate(mocker: MockFixture) -> None:
+    """test network collector reports throughput since the last sample against the link capacity"""
+    counters = mocker.patch.object(psutil, "net_io_counters")
+    clock = mocker.Mock(return_value=10.0)
+    counters.return_value = {"eth0": mocker.Mock(bytes_recv=0, bytes_sent=0)}
+    collector = NetworkCollector(NetworkThroughput(clock=clock), capacity=8)
+
+    counters.return_value = {"eth0": mocker.Mock(bytes_recv=1_500_000, bytes_sent=500_000)}
+    clock.return_value = 12.0
+    assert collector.sample() == 75.0
+
+
+def test_build_collectors() -> None:
+    """test collectors are only built for requested dials"""
+    collectors = build_collectors({DialType.CPU, DialType.MEMORY})
+    assert set(collectors) == {DialType.CPU, DialType.MEMORY}
+    assert isinstance(collectors[DialType.MEMORY], MemoryCollector)
@@ -0,0 +1,132 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockFixture
+
+from vu1_monitor.config import settings
+from vu1_monitor.metrics.collectors import CPUCollector, build_collectors
+from vu1_monitor.metrics.cores import CoreCPU, node_cpus, parse_cpulist
+from vu1_monitor.metrics.procfs import ProcStat, ProcStatCores
+from vu1_monitor.models.models import CPUStatistic, DialType
+
+
+class FakeCores(ProcStatCores):
+    """per-CPU utilisation set by the test"""
+
+    def __init__(self, cpus: list[int], percents: list[float]) -> None:
+        self.cpus, self.percents = cpus, percents
+
+    def cpu_percents(self) -> tuple[list[int], list[float]]:
+        return self.cpus, self.percents
+
+
+@pytest.fixture
+def cores() -> FakeCores:
+    """ten CPUs, two of them saturated"""
+    return FakeCores(list(range(10)), [100.0, 95.0, 50.0, 10.0, 10.0, 10.0, 10.0, 10.0, 5.0, 0.0])
+
+
+#################
+### CPU lists ###
+#################
+
+
+def test_parse_cpulist() -> None:
+    """test CPU lists are parsed as ranges and single CPUs"""
+    assert parse_cpulist("0-3,8, 10-11") == {0, 1, 2, 3, 8, 10, 11}
+    assert parse_cpulist("") == set()
+    with pytest.raises(ValueError):
+        parse_cpulist("4-2")
+    with pytest.raises(ValueError):
+        parse_cpulist("a-b")
+
+
+def test_node_cpus(tmp_path: Path) -> None:
+    """test NUMA node CPUs are read from sysfs"""
+    node = tmp_path / "sys" / "devices" / "system" / "node" / "node1"
+    node.mkdir(parents=True)
+    (node / "cpulist").write_text("64-127\n")
+
+    assert node_cpus(1, tmp_path) == set(range(64, 128))
+    with pytest.raises(ValueError):
+        node_cpus(2, tmp_path)
+
+
+##################
+### Statistics ###
+##################
+
+
+@pytest.mark.parametrize(
+    "statistic, expected",
+    [
+        (CPUStatistic.MEAN, 30.0),
+        (CPUStatistic.MAX, 100.0),
+        (CPUStatistic.P90, 95.0),
+        (CPUStatistic.BUSY, 20.0),
+    ],
+)
+def test_core_statistics(cores: FakeCores, statistic: CPUStatistic, expected: float) -> None:
+    """test each statistic is computed across cores"""
+    assert CoreCPU(statistic, source=cores).cpu_percent() == pytest.approx(expected)
+
+
+def test_core_selection(cores: FakeCores) -> None:
+    """test statistics only cover the selected cores, following CPUs going offline"""
+    cpu = CoreCPU(CPUStatistic.MEAN, cores={2, 3, 42}, source=cores)
+    assert cpu.cpu_percent() == pytest.approx(30.0)
+
+    cores.cpus, cores.percents = [0, 3], [100.0, 60.0]
+    assert cpu.cpu_percent() == pytest.approx(60.0)
+
+    cores.cpus = [0, 1]
+    assert cpu.cpu_percent() == 0.0
+
+
+def test_core_busy_threshold(cores: FakeCores) -> None:
+    """test cores at or above the threshold count as busy"""
+    assert CoreCPU(CPUStatistic.BUSY, threshold=50, source=cores).cpu_percent() == pytest.approx(30.0)
+
+
+def test_core_statistics_psutil(mocker: MockFixture) -> None:
+    """test per-core utilisation is read from psutil without a procfs source"""
+    mocker.patch("vu1_monitor.metrics.cores.psutil.cpu_percent", return_value=[10.0, 90.0])
+    assert CoreCPU(CPUStatistic.MAX).cpu_percent() == 90.0
+    assert CoreCPU(CPUStatistic.MEAN, cores={0}).cpu_percent() == 10.0
+
+
+def test_core_statistics_scale() -> None:
+    """test statistics of thousands of cores"""
+    cores = FakeCores(list(range(4096)), [float(cpu % 100) for cpu in range(4096)])
+    assert CoreCPU(CPUStatistic.P90, source=cores).cpu_percent() == 89.0
+    assert CoreCPU(CPUStatistic.BUSY, source=cores).cpu_percent() == pytest.approx(100 * 406 / 4096)
+
+
+##################
+### Collectors ###
+##################
+
+
+def test_build_collectors_statistic() -> None:
+    """test the CPU collector reports the configured per-core statistic, and the system-wide mean by default"""
+    backend, statistic, cores = settings.metrics.backend, settings.cpu.statistic, settings.cpu.cores
+    try:
+        settings.set("metrics.backend", "procfs")
+        collector = build_collectors({DialType.CPU})[DialType.CPU]
+        assert isinstance(collector, CPUCollector) and isinstance(collector.source, ProcStat)
+
+        settings.set("cpu.statistic", "p90")
+        collector = build_collectors({DialType.CPU})[DialType.CPU]
+        assert isinstance(collector, CPUCollector) and isinstance(collector.source, CoreCPU)
+        assert collector.source.statistic == CPUStatistic.P90
+        assert isinstance(collector.source.source, ProcStatCores)
+
+        settings.set("cpu.statistic", "mean")
+        settings.set("cpu.cores", "0-1")
+        collector = build_collectors({DialType.CPU})[DialType.CPU]
+        assert isinstance(collector, CPUCollector) and isinstance(collector.source, CoreCPU)
+        assert collector.source.cores == {0, 1}
+    finally:
+        settings.set("metrics.backend", backend)
+        settings.set("cpu.statistic", statistic)
+        settings.set("cpu.cores", cores)
@@ -2,6 +2,7 @@ import GPUtil  # type: ignore
 import pytest
 from pytest_mock import MockFixture
 
+from vu1_monitor.metrics import gpu
 from vu1_monitor.metrics.gpu import get_gpu_utilisation
 
 
@@ -25,6 +26,25 @@ def nvidia() -> GPUtil.GPU:
 
 def test_nvidia_utilisation(mocker: MockFixture, nvidia: GPUtil.GPU) -> None:
     """test nvidia gpu utilisation returns correctly"""
+    mocker.patch.object(gpu, "_nvml_backend", return_value=None)
     mocker.patch.object(GPUtil, "getGPUs", return_value=[nvidia])
     response = get_gpu_utilisation("nvidia")
     assert response == nvidia.load * 100
+
+
+def test_nvidia_utilisation_nvml(mocker: MockFixture) -> None:
+    """test nvidia gpu utilisation reads through NVML when available"""
+    backend = mocker.Mock(**{"utilisation.return_value": 75.0})
+    mocker.patch.object(gpu, "_nvml_backend", return_value=backend)
+    get_gpus = mocker.patch.object(GPUtil, "getGPUs")
+
+    assert get_gpu_utilisation("nvidia") == 75.0
+    get_gpus.assert_not_called()
+
+
+def test_nvml_backend_unavailable(mocker: MockFixture) -> None:
+    """test a missing NVML library falls back to GPUtil"""
+    mocker.patch.object(gpu, "NVMLBackend", side_effect=OSError("not found"))
+    gpu._nvml_backend.cache_clear()
+    assert gpu._nvml_backend() is None
+    gpu._nvml_backend.cache_clear()
@@ -0,0 +1,178 @@
+from pathlib import Path
+
+import pytest
+
+from vu1_monitor.config import settings
+from vu1_monitor.metrics.collectors import NetworkCollector, build_collectors
+from vu1_monitor.metrics.network import (
+    DEFAULT_SPEED,
+    WRAP,
+    NetworkThroughput,
+    counter_delta,
+    directional,
+    scale_throughput,
+    selected,
+)
+from vu1_monitor.metrics.procfs import ProcNetDev
+from vu1_monitor.models.models import DialType, NetworkDirection, NetworkScale
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeNetDev(ProcNetDev):
+    """interface counters and link speeds set by the test"""
+
+    def __init__(self, counters: dict[str, tuple[int, int]], speeds: dict[str, int]) -> None:
+        self.values, self.speeds = counters, speeds
+
+    def counters(self) -> dict[str, tuple[int, int]]:
+        return dict(self.values)
+
+    def speed(self, interface: str) -> int | None:
+        return self.speeds.get(interface)
+
+
+@pytest.fixture
+def net_dev() -> FakeNetDev:
+    """a 10GbE interface, a wireless interface without a link speed, loopback and a container veth"""
+    counters = {"eth0": (0, 0), "wlan0": (0, 0), "lo": (0, 0), "veth1a2b": (0, 0)}
+    return FakeNetDev(counters, {"eth0": 10000})
+
+
+################
+### Counters ###
+################
+
+
+def test_counter_delta() -> None:
+    """test counters wrapping at 32 bits and resets are counted"""
+    assert counter_delta(100, 150) == 50
+    assert counter_delta(WRAP - 10, 20) == 30
+    assert counter_delta(WRAP * 4, 20) == 20
+    assert counter_delta(5_000_000, 1000) == 1000
+
+
+def test_selected() -> None:
+    """test interfaces are selected by include and exclude patterns"""
+    exclude = ["lo", "veth*"]
+    assert selected("eth0", [], exclude)
+    assert not selected("lo", [], exclude)
+    assert not selected("veth1a2b", [], exclude)
+    assert selected("eth0", ["eth*", "en*"], exclude)
+    assert not selected("wlan0", ["eth*", "en*"], exclude)
+
+
+##################
+### Throughput ###
+##################
+
+
+def test_throughput_rates(net_dev: FakeNetDev) -> None:
+    """test rates are measured per second between reads of the selected interfaces"""
+    clock = FakeClock()
+    throughput = NetworkThroughput(net_dev, exclude=["lo", "veth*"], clock=clock)
+    assert throughput.interfaces == ["eth0", "wlan0"]
+
+    net_dev.values = {"eth0": (4000, 1000), "wlan0": (2000, 0), "lo": (10**9, 10**9), "veth1a2b": (10**9, 0)}
+    clock.now += 2
+    assert throughput.rates() == (3000.0, 500.0)
+
+    net_dev.values = {"eth0": (4000, 1000), "wlan0": (2000, 0), "eth1": (10**9, 0)}
+    clock.now += 1
+    assert throughput.rates() == (0.0, 0.0)
+    assert throughput.interfaces == ["eth0", "eth1", "wlan0"]
+
+
+def test_throughput_wraparound(net_dev: FakeNetDev) -> None:
+    """test a 32-bit counter wrapping around between reads is not a drop in throughput"""
+    clock = FakeClock()
+    net_dev.values = {"eth0": (WRAP - 1000, 0)}
+    throughput = NetworkThroughput(net_dev, clock=clock)
+
+    net_dev.values = {"eth0": (1000, 0)}
+    clock.now += 1
+    assert throughput.rates() == (2000.0, 0.0)
+
+
+def test_throughput_capacity(net_dev: FakeNetDev) -> None:
+    """test capacity is the link speed of the interfaces measured, with a default for unknown speeds"""
+    assert NetworkThroughput(net_dev, include=["eth0"]).capacity() == 10000 * 1_000_000 / 8
+    assert NetworkThroughput(net_dev, include=["eth0", "wlan0"]).capacity() == (10000 + DEFAULT_SPEED) * 1_000_000 / 8
+    assert NetworkThroughput(net_dev, include=["none"]).capacity() == DEFAULT_SPEED * 1_000_000 / 8
+
+
+###############
+### Scaling ###
+###############
+
+
+def test_scale_linear() -> None:
+    """test the linear scale is the share of capacity used"""
+    assert scale_throughput(250, 1000, NetworkScale.LINEAR) == 25.0
+    assert scale_throughput(5000, 1000, NetworkScale.LINEAR) == 100.0
+
+
+def test_scale_log() -> None:
+    """test the log scale spreads 1 KB/s to capacity by order of magnitude"""
+    capacity = 1024.0 * 10**4
+    assert scale_throughput(100, capacity, NetworkScale.LOG) == 0.0
+    assert scale_throughput(1024.0 * 10**2, capacity, NetworkScale.LOG) == pytest.approx(50.0)
+    assert scale_throughput(capacity * 10, capacity, NetworkScale.LOG) == 100.0
+
+
+def test_directional() -> None:
+    """test the direction shown picks received, sent, both or the busiest"""
+    assert directional(3, 5, NetworkDirection.RX) == 3
+    assert directional(3, 5, NetworkDirection.TX) == 5
+    assert directional(3, 5, NetworkDirection.TOTAL) == 8
+    assert directional(3, 5, NetworkDirection.MAX) == 5
+
+
+##################
+### Collectors ###
+##################
+
+
+def test_network_collector(net_dev: FakeNetDev) -> None:
+    """test the collector maps the busiest direction onto the dial against the link speed"""
+    clock = FakeClock()
+    collector = NetworkCollector(NetworkThroughput(net_dev, include=["eth0"], clock=clock))
+
+    net_dev.values["eth0"] = (625_000_000, 125_000_000)
+    clock.now += 1
+    assert collector.sample() == pytest.approx(50.0)
+
+    collector.direction = NetworkDirection.TOTAL
+    net_dev.values["eth0"] = (1_250_000_000, 250_000_000)
+    clock.now += 1
+    assert collector.sample() == pytest.approx(30.0)
+
+
+def test_build_collectors_network(tmp_path: Path) -> None:
+    """test the network collector is configured from settings"""
+    keys = ["direction", "scale", "capacity", "include", "exclude"]
+    previous = {key: settings.network[key] for key in keys}
+    try:
+        settings.set("network.direction", "rx")
+        settings.set("network.scale", "log")
+        settings.set("network.capacity", 100)
+        settings.set("network.include", "eth*, en*")
+        settings.set("network.exclude", ["lo"])
+        collector = build_collectors({DialType.NETWORK})[DialType.NETWORK]
+
+        assert isinstance(collector, NetworkCollector)
+        assert collector.direction == NetworkDirection.RX
+        assert collector.scale == NetworkScale.LOG
+        assert collector.capacity == 100
+        assert collector.throughput.include == ["eth*", "en*"]
+        assert collector.throughput.exclude == ["lo"]
+    finally:
+        for key, value in previous.items():
+            settings.set(f"network.{key}", value)
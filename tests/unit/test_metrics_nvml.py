@@ -0,0 +1,70 @@
+import ctypes
+
+import pytest
+
+from vu1_monitor.metrics.nvml import NVML_SUCCESS, NVMLBackend, NVMLError, NVMLLibrary
+
+
+class FakeNVML:
+    """stand-in for the NVML shared library, answering the ctypes calls NVMLLibrary makes"""
+
+    def __init__(self, loads: list[int], init_code: int = NVML_SUCCESS) -> None:
+        self.loads = loads
+        self.init_code = init_code
+        self.handle_calls = 0
+        self.shutdown_called = False
+
+    def nvmlInit_v2(self) -> int:
+        return self.init_code
+
+    def nvmlShutdown(self) -> int:
+        self.shutdown_called = True
+        return NVML_SUCCESS
+
+    def nvmlDeviceGetCount_v2(self, count) -> int:
+        count._obj.value = len(self.loads)
+        return NVML_SUCCESS
+
+    def nvmlDeviceGetHandleByIndex_v2(self, index: ctypes.c_uint, handle) -> int:
+        self.handle_calls += 1
+        handle._obj.value = index.value + 1
+        return NVML_SUCCESS
+
+    def nvmlDeviceGetUtilizationRates(self, handle, utilisation) -> int:
+        utilisation._obj.gpu = self.loads[handle.value - 1]
+        return NVML_SUCCESS
+
+
+def test_nvml_utilisation() -> None:
+    """test NVML backend averages utilisation over all devices"""
+    backend = NVMLBackend(NVMLLibrary(FakeNVML([20, 60])))
+    assert backend.utilisation() == 40.0
+
+
+def test_nvml_handles_cached() -> None:
+    """test device handles are looked up once, not per sample"""
+    fake = FakeNVML([50])
+    backend = NVMLBackend(NVMLLibrary(fake))
+    for _ in range(5):
+        backend.utilisation()
+    assert fake.handle_calls == 1
+
+
+def test_nvml_no_devices() -> None:
+    """test NVML backend reports 0 without devices"""
+    assert NVMLBackend(NVMLLibrary(FakeNVML([]))).utilisation() == 0.0
+
+
+def test_nvml_init_error() -> None:
+    """test NVML errors are raised on initialisation"""
+    with pytest.raises(NVMLError, match="nvmlInit_v2"):
+        NVMLBackend(NVMLLibrary(FakeNVML([50], init_code=9)))
+
+
+def test_nvml_close() -> None:
+    """test closing the backend shuts NVML down"""
+    fake = FakeNVML([50])
+    backend = NVMLBackend(NVMLLibrary(fake))
+    backend.close()
+    assert fake.shutdown_called
+    assert backend.handles == []
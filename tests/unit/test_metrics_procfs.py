@@ -0,0 +1,204 @@
+from pathlib import Path
+
+import pytest
+
+from vu1_monitor.config import settings
+from vu1_monitor.metrics.collectors import CPUCollector, MemoryCollector, NetworkCollector, build_collectors
+from vu1_monitor.metrics.procfs import (
+    CgroupCPU,
+    CgroupMemory,
+    ProcFile,
+    ProcMeminfo,
+    ProcNetDev,
+    ProcStat,
+    ProcStatCores,
+    cgroup_dir,
+)
+from vu1_monitor.models.models import DialType
+
+STAT = "cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 1 0 0 1 0 0 0 0 0 0\nintr 1 2 3\n"
+MEMINFO = "MemTotal:       16000000 kB\nMemFree:         2000000 kB\nMemAvailable:    4000000 kB\nBuffers: 1 kB\n"
+NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo: {lo} 10 0 0 0 0 0 0 100 10 0 0 0 0 0 0
+  eth0: {eth0} 20 0 0 0 0 0 0 200 20 0 0 0 0 0 0
+"""
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    """fake filesystem root with /proc and a cgroup v2 hierarchy"""
+    (tmp_path / "proc" / "net").mkdir(parents=True)
+    (tmp_path / "proc" / "self").mkdir()
+    (tmp_path / "proc" / "stat").write_text(STAT.format(busy=100, idle=900))
+    (tmp_path / "proc" / "meminfo").write_text(MEMINFO)
+    (tmp_path / "proc" / "net" / "dev").write_text(NET_DEV.format(lo=1000, eth0=5000))
+    (tmp_path / "proc" / "self" / "cgroup").write_text("0::/app.slice\n")
+
+    cgroup = tmp_path / "sys" / "fs" / "cgroup" / "app.slice"
+    cgroup.mkdir(parents=True)
+    (tmp_path / "sys" / "fs" / "cgroup" / "cgroup.controllers").write_text("cpu memory\n")
+    (cgroup / "cpu.stat").write_text("usage_usec 1000000\nuser_usec 800000\nsystem_usec 200000\n")
+    (cgroup / "cpu.max").write_text("50000 100000\n")
+    (cgroup / "memory.current").write_text("1500000000\n")
+    (cgroup / "memory.max").write_text("2000000000\n")
+    (cgroup / "memory.stat").write_text("anon 1000000000\nactive_file 100\ninactive_file 500000000\n")
+    return tmp_path
+
+
+#################
+### Proc file ###
+#################
+
+
+def test_proc_file_rereads(tmp_path: Path) -> None:
+    """test files are re-read from the start, growing the buffer to fit"""
+    path = tmp_path / "file"
+    path.write_text("small\n")
+    file = ProcFile(path, size=8)
+    assert bytes(file.buffer[: file.read()]) == b"small\n"
+
+    path.write_text("x" * 100)
+    assert file.read() == 100
+    assert len(file.buffer) > 100
+    file.close()
+
+
+def test_proc_file_field(tmp_path: Path) -> None:
+    """test integer fields are parsed after their key, and missing keys raise KeyError"""
+    path = tmp_path / "meminfo"
+    path.write_text(MEMINFO)
+    file = ProcFile(path)
+    size = file.read()
+
+    assert file.field(b"MemAvailable:", size) == 4000000
+    with pytest.raises(KeyError):
+        file.field(b"SwapTotal:", size)
+
+
+############
+### Proc ###
+############
+
+
+def test_proc_stat(root: Path) -> None:
+    """test CPU utilisation is measured between samples"""
+    stat = ProcStat(root)
+    (root / "proc" / "stat").write_text(STAT.format(busy=175, idle=1000))
+    assert stat.cpu_percent() == pytest.approx(100 * 75 / 175)
+    assert stat.cpu_percent() == 0.0
+
+
+def test_proc_stat_cores(tmp_path: Path) -> None:
+    """test utilisation is measured per CPU, skipping the all-CPU line and offline CPUs"""
+    path = tmp_path / "proc" / "stat"
+    path.parent.mkdir()
+    lines = "cpu  0 0 0 0 0 0 0 0 0 0\ncpu0 {a} 0 0 100 0 0 0 0 0 0\ncpu2 {b} 0 0 {idle} 0 0 0 0 0 0\nintr 1 2\n"
+    path.write_text(lines.format(a=0, b=0, idle=100))
+    cores = ProcStatCores(tmp_path)
+    assert cores.cpus == [0, 2]
+
+    path.write_text(lines.format(a=100, b=25, idle=200))
+    cpus, percents = cores.cpu_percents()
+    assert cpus == [0, 2]
+    assert percents == pytest.approx([100.0, 20.0])
+
+    path.write_text(lines.replace("cpu2", "cpu3").format(a=100, b=25, idle=200))
+    assert cores.cpu_percents() == ([0, 3], [0.0, 0.0])
+
+
+def test_proc_meminfo(root: Path) -> None:
+    """test memory utilisation is total less available"""
+    meminfo = ProcMeminfo(root)
+    assert meminfo.memory_percent() == pytest.approx(75.0)
+    assert meminfo.total() == 16000000 * 1024
+
+
+def test_proc_net_dev(root: Path) -> None:
+    """test received and sent bytes are read for each interface"""
+    net = ProcNetDev(root)
+    assert net.counters() == {"lo": (1000, 100), "eth0": (5000, 200)}
+    (root / "proc" / "net" / "dev").write_text(NET_DEV.format(lo=1000, eth0=1234567890123))
+    assert net.counters()["eth0"] == (1234567890123, 200)
+
+
+def test_proc_net_dev_speed(root: Path) -> None:
+    """test link speeds are read from sysfs, and unknown for interfaces without one"""
+    (root / "sys" / "class" / "net" / "eth0").mkdir(parents=True)
+    (root / "sys" / "class" / "net" / "eth0" / "speed").write_text("10000\n")
+    (root / "sys" / "class" / "net" / "wlan0").mkdir()
+    (root / "sys" / "class" / "net" / "wlan0" / "speed").write_text("-1\n")
+
+    net = ProcNetDev(root)
+    assert net.speed("eth0") == 10000
+    assert net.speed("wlan0") is None
+    assert net.speed("lo") is None
+
+
+##############
+### Cgroup ###
+##############
+
+
+def test_cgroup_dir(root: Path) -> None:
+    """test the cgroup v2 directory of the process is found, and None is returned without cgroup v2"""
+    assert cgroup_dir(root) == root / "sys" / "fs" / "cgroup" / "app.slice"
+    (root / "sys" / "fs" / "cgroup" / "cgroup.controllers").unlink()
+    assert cgroup_dir(root) is None
+
+
+def test_cgroup_cpu(root: Path) -> None:
+    """test CPU utilisation is measured against the cgroup's CPU quota"""
+    clock = FakeClock()
+    cpu = CgroupCPU(cgroup_dir(root), clock=clock)  # type: ignore[arg-type]
+    assert cpu.cpus == 0.5
+
+    (cpu.stat.path).write_text("usage_usec 1250000\n")
+    clock.now += 1
+    assert cpu.cpu_percent() == pytest.approx(50.0)
+
+
+def test_cgroup_memory(root: Path) -> None:
+    """test memory utilisation excludes reclaimable cache and is measured against the cgroup limit"""
+    path = cgroup_dir(root)
+    assert path is not None
+    assert CgroupMemory(path, root).memory_percent() == pytest.approx(50.0)
+
+    (path / "memory.max").write_text("max\n")
+    assert CgroupMemory(path, root).limit == 16000000 * 1024
+
+
+##################
+### Collectors ###
+##################
+
+
+def test_build_collectors_backend() -> None:
+    """test collectors read /proc directly with the procfs backend, and psutil otherwise"""
+    dials = {DialType.CPU, DialType.MEMORY, DialType.NETWORK}
+    backend = settings.metrics.backend
+    try:
+        settings.set("metrics.backend", "procfs")
+        collectors = build_collectors(dials)
+        cpu, memory, network = (collectors[dial] for dial in (DialType.CPU, DialType.MEMORY, DialType.NETWORK))
+        assert isinstance(cpu, CPUCollector) and isinstance(cpu.source, ProcStat)
+        assert isinstance(memory, MemoryCollector) and isinstance(memory.source, ProcMeminfo)
+        assert isinstance(network, NetworkCollector) and isinstance(network.throughput.source, ProcNetDev)
+
+        settings.set("metrics.backend", "psutil")
+        collectors = build_collectors(dials)
+        cpu, memory, network = (collectors[dial] for dial in (DialType.CPU, DialType.MEMORY, DialType.NETWORK))
+        assert isinstance(cpu, CPUCollector) and cpu.source is None
+        assert isinstance(memory, MemoryCollector) and memory.source is None
+        assert isinstance(network, NetworkCollector) and network.throughput.source is None
+    finally:
+        settings.set("metrics.backend", backend)
@@ -0,0 +1,143 @@
+import asyncio
+from array import array
+from pathlib import Path
+
+import pytest
+
+from vu1_monitor.metrics.recording import (
+    RECORD,
+    Recorder,
+    Recording,
+    ReplayCollector,
+    build_replay_collectors,
+)
+from vu1_monitor.metrics.sampling import Sampler
+from vu1_monitor.metrics.window import Window
+from vu1_monitor.models.models import Aggregate, DialType
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def recording(tmp_path: Path) -> Path:
+    """recording of cpu and memory samples, one second apart"""
+    path, clock = tmp_path / "load.vu1rec", FakeClock()
+    recorder = Recorder(path, clock)
+    for value in range(3):
+        clock.now += 1
+        recorder.record(DialType.CPU, value * 10)
+        recorder.record(DialType.MEMORY, value * 20)
+    recorder.close()
+    return path
+
+
+#################
+### Recording ###
+#################
+
+
+def test_recording_round_trip(recording: Path) -> None:
+    """test samples are read back in the order recorded"""
+    read = Recording(recording)
+    assert len(read) == 6
+    assert list(read)[:2] == [(1.0, DialType.CPU, 0.0), (1.0, DialType.MEMORY, 0.0)]
+    assert read.duration == 3.0
+    assert read.dials == {DialType.CPU, DialType.MEMORY}
+    assert read.samples(DialType.CPU) == (array("d", [1, 2, 3]), array("d", [0, 10, 20]))
+    read.close()
+
+
+def test_recording_appends(recording: Path) -> None:
+    """test appending to a recording continues after its last sample"""
+    clock = FakeClock()
+    recorder = Recorder(recording, clock)
+    clock.now += 1
+    recorder.record(DialType.CPU, 30)
+    recorder.close()
+
+    read = Recording(recording)
+    assert len(read) == 7
+    assert read.duration == 4.0
+    read.close()
+
+
+def test_recording_partial_record(recording: Path) -> None:
+    """test a partial record at the end of a recording is ignored"""
+    with open(recording, "ab") as file:
+        file.write(RECORD.pack(4.0, 0, 1.0)[:5])
+
+    read = Recording(recording)
+    assert len(read) == 6
+    assert read.duration == 3.0
+    read.close()
+
+
+def test_recording_invalid(tmp_path: Path) -> None:
+    """test files that aren't recordings are rejected"""
+    path = tmp_path / "not-a-recording"
+    path.write_bytes(b"cpu,10\n" * 10)
+    with pytest.raises(ValueError):
+        Recording(path)
+
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        Recording(path)
+
+
+##############
+### Replay ###
+##############
+
+
+def test_replay_collector() -> None:
+    """test replay returns the value recorded at the playback position"""
+    clock = FakeClock()
+    collector = ReplayCollector(DialType.CPU, array("d", [1, 2, 3]), array("d", [10, 20, 30]), speed=2, clock=clock)
+
+    assert collector.sample() == 10
+    clock.now += 0.75
+    assert collector.sample() == 10
+    clock.now += 0.25
+    assert collector.sample() == 20
+    assert not collector.finished
+    clock.now += 1
+    assert collector.sample() == 30
+    assert collector.finished
+
+
+def test_build_replay_collectors(recording: Path) -> None:
+    """test replay collectors are built for recorded dials only"""
+    read = Recording(recording)
+    collectors = build_replay_collectors(read, {DialType.CPU, DialType.GPU}, speed=5)
+    collector = collectors[DialType.CPU]
+    assert list(collectors) == [DialType.CPU]
+    assert isinstance(collector, ReplayCollector)
+    assert collector.speed == 5
+    read.close()
+
+
+@pytest.mark.asyncio
+async def test_sampler_records(tmp_path: Path) -> None:
+    """test samplers append every sample to the recorder"""
+    path = tmp_path / "load.vu1rec"
+    recorder = Recorder(path)
+    collector = ReplayCollector(DialType.CPU, array("d", [0]), array("d", [42]))
+    sampler = Sampler(collector, Window(10, Aggregate.MAX), rate=100, recorder=recorder)
+
+    task = asyncio.create_task(sampler.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    recorder.close()
+
+    read = Recording(path)
+    assert len(read) > 1
+    assert {(dial, value) for _, dial, value in read} == {(DialType.CPU, 42.0)}
+    read.close()
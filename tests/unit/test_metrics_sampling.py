@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from vu1_monitor.metrics.collectors import Collector
+from vu1_monitor.metrics.sampling import Sampler, build_samplers
+from vu1_monitor.metrics.window import Window
+from vu1_monitor.models.models import Aggregate, DialType
+from vu1_monitor.scheduler import DialPolicy
+
+
+class CountingCollector(Collector):
+    """collector returning an increasing count"""
+
+    dial = DialType.CPU
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.count = 0
+
+    def sample(self) -> float:
+        self.count += 1
+        return float(self.count)
+
+
+@pytest.mark.asyncio
+async def test_sampler_fills_window() -> None:
+    """test sampler samples faster than it is published"""
+    collector = CountingCollector()
+    sampler = Sampler(collector, Window(100, Aggregate.MAX), rate=100)
+
+    task = asyncio.create_task(sampler.run())
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    assert collector.count > 3
+    assert sampler.publish() == collector.count
+
+
+def test_build_samplers_window_size() -> None:
+    """test windows hold one publish interval of samples"""
+    policies = {DialType.CPU: DialPolicy.from_settings(DialType.CPU)}
+    samplers = build_samplers({DialType.CPU: CountingCollector()}, policies, {DialType.CPU: 2})
+    assert samplers[DialType.CPU].window.buffer.size == 8
+
+
+def test_build_samplers_from_policy() -> None:
+    """test sample rate and aggregate are taken from the dial policy"""
+    policy = DialPolicy(1, 10, 0, 30.0, Aggregate.PERCENTILE, 1, percentile=99.0, percentile_window=60.0)
+    sampler = build_samplers({DialType.CPU: CountingCollector()}, {DialType.CPU: policy}, {DialType.CPU: 0.5})[
+        DialType.CPU
+    ]
+    assert sampler.rate == 10
+    assert sampler.window.buffer.size == 5
+    assert sampler.window.aggregate == Aggregate.PERCENTILE
+    assert sampler.window.percentile == 99.0
+    assert sampler.window.quantiles is not None and sampler.window.quantiles.window == 60.0
+
+
+def test_sampler_resize() -> None:
+    """test resizing sizes the window to one publish interval of samples"""
+    policies = {DialType.CPU: DialPolicy.from_settings(DialType.CPU)}
+    sampler = build_samplers({DialType.CPU: CountingCollector()}, policies, {DialType.CPU: 2})[DialType.CPU]
+    sampler.resize(5)
+    assert sampler.window.buffer.size == 20
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from vu1_monitor.metrics.sketch import QuantileSketch, SlidingQuantile
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+##############
+### Sketch ###
+##############
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99])
+def test_sketch_accuracy(q: float) -> None:
+    """test quantiles are estimated within the relative accuracy"""
+    generator = random.Random(0)
+    values = [generator.lognormvariate(3, 1) for _ in range(20000)]
+    sketch = QuantileSketch(accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    exact = sorted(values)[int(q * (len(values) - 1))]
+    assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+
+def test_sketch_bounds() -> None:
+    """test small values are reported as 0 and large values are clamped"""
+    sketch = QuantileSketch(minimum=0.01, maximum=100)
+    assert sketch.quantile(0.5) is None
+
+    sketch.add(0)
+    sketch.add(0.001)
+    sketch.add(1e9)
+    assert sketch.quantile(0) == 0.0
+    assert sketch.quantile(1) == pytest.approx(100, rel=0.02)
+
+
+def test_sketch_constant_memory() -> None:
+    """test the sketch never grows with the number of values"""
+    sketch = QuantileSketch()
+    bins = len(sketch.counts)
+    for value in range(100000):
+        sketch.add(value / 7)
+    assert len(sketch.counts) == bins
+    assert sketch.count == 100000
+
+    sketch.clear()
+    assert sketch.quantile(0.5) is None
+
+
+def test_sketch_accuracy_invalid() -> None:
+    """test accuracy must be a fraction"""
+    with pytest.raises(ValueError):
+        QuantileSketch(accuracy=1)
+
+
+######################
+### Sliding window ###
+######################
+
+
+def test_sliding_quantile_expires() -> None:
+    """test values leave the window as time moves on"""
+    clock = FakeClock()
+    quantiles = SlidingQuantile(window=10, slices=5, clock=clock)
+    for _ in range(10):
+        quantiles.add(90)
+    clock.now += 6
+    for _ in range(10):
+        quantiles.add(10)
+
+    assert len(quantiles) == 20
+    assert quantiles.quantile(0.95) == pytest.approx(90, rel=0.01)
+
+    clock.now += 6
+    assert len(quantiles) == 10
+    assert quantiles.quantile(0.95) == pytest.approx(10, rel=0.01)
+
+    clock.now += 100
+    assert quantiles.quantile(0.95) is None
+    quantiles.add(50)
+    assert quantiles.quantile(0.5) == pytest.approx(50, rel=0.01)
+
+
+def test_sliding_quantile_constant_memory() -> None:
+    """test memory is independent of the window length and sample rate"""
+    clock = FakeClock()
+    short, long = SlidingQuantile(60, clock=clock), SlidingQuantile(86400, clock=clock)
+    for _ in range(50000):
+        clock.now += 0.01
+        short.add(clock.now % 100)
+        long.add(clock.now % 100)
+
+    assert len(long) == 50000
+    assert len(short) < 6001
+    assert [len(sketch.counts) for sketch in long.slices] == [len(sketch.counts) for sketch in short.slices]
+    assert long.quantile(0.5) == pytest.approx(50, rel=0.03)
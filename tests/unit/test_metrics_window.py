@@ -0,0 +1,75 @@
+import pytest
+
+from vu1_monitor.metrics.window import RingBuffer, Window
+from vu1_monitor.models.models import Aggregate
+
+
+def test_ring_buffer_wraps() -> None:
+    """test ring buffer keeps only the latest samples"""
+    buffer = RingBuffer(3)
+    for value in [1, 2, 3, 4, 5]:
+        buffer.append(value)
+
+    assert len(buffer) == 3
+    assert buffer.last() == 5
+    assert buffer.mean() == 4
+    assert buffer.max() == 5
+
+
+def test_ring_buffer_partial() -> None:
+    """test aggregates only cover the samples added so far"""
+    buffer = RingBuffer(10)
+    buffer.append(4)
+    buffer.append(8)
+    assert buffer.mean() == 6
+    assert buffer.max() == 8
+
+
+def test_ring_buffer_resize() -> None:
+    """test resizing keeps the latest samples, oldest first"""
+    buffer = RingBuffer(4)
+    for value in [1, 2, 3, 4, 5, 6]:
+        buffer.append(value)
+
+    buffer.resize(2)
+    assert len(buffer) == 2
+    assert (buffer.mean(), buffer.last()) == (5.5, 6)
+
+    buffer.resize(5)
+    for value in [7, 8, 9, 10]:
+        buffer.append(value)
+    assert len(buffer) == 5
+    assert (buffer.mean(), buffer.max()) == (8, 10)
+
+
+def test_ring_buffer_size() -> None:
+    """test ring buffer rejects an empty size"""
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+@pytest.mark.parametrize(
+    "aggregate, expected",
+    [(Aggregate.MEAN, 40.0), (Aggregate.MAX, 90.0), (Aggregate.LAST, 10.0), (Aggregate.EMA, 32.5)],
+)
+def test_window_publish(aggregate: Aggregate, expected: float) -> None:
+    """test window publishes the configured aggregate"""
+    window = Window(3, aggregate, alpha=0.5)
+    for value in [20, 90, 10]:
+        window.add(value)
+    assert window.publish() == pytest.approx(expected)
+
+
+def test_window_empty() -> None:
+    """test window publishes nothing before the first sample"""
+    assert Window(3, Aggregate.MEAN).publish() is None
+
+
+def test_window_percentile() -> None:
+    """test the percentile aggregate covers samples beyond the window size"""
+    window = Window(2, Aggregate.PERCENTILE, percentile=90, horizon=60)
+    for value in range(1, 101):
+        window.add(value)
+
+    assert len(window) == 2
+    assert window.publish() == pytest.approx(90, rel=0.02)
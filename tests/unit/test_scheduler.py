@@ -0,0 +1,114 @@
+import pytest
+from pytest_mock import MockFixture
+
+from vu1_monitor.scheduler import Scheduler
+
+
+class FakeClock:
+    """monotonic clock advanced by sleeps and simulated work"""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.now += delay
+
+
+@pytest.fixture
+def clock(mocker: MockFixture) -> FakeClock:
+    clock = FakeClock()
+    mocker.patch("vu1_monitor.scheduler.scheduler.asyncio.sleep", side_effect=clock.sleep)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_fixed_rate(clock: FakeClock) -> None:
+    """test ticks fire at fixed deadlines regardless of work time"""
+    scheduler = Scheduler({"cpu": 1.0}, clock=clock)
+    fired = []
+
+    async for _ in scheduler.ticks():
+        fired.append(clock.now)
+        clock.now += 0.3  # work
+        if len(fired) == 4:
+            break
+
+    assert fired == [100.0, 101.0, 102.0, 103.0]
+    assert scheduler.stats["cpu"].overruns == 0
+
+
+@pytest.mark.asyncio
+async def test_elapsed(clock: FakeClock) -> None:
+    """test each tick reports the real time since the job's previous tick"""
+    scheduler = Scheduler({"net": 1.0}, clock=clock)
+    elapsed = []
+
+    async for due in scheduler.ticks():
+        elapsed.append(due["net"])
+        clock.now += 1.5 if len(elapsed) == 2 else 0.1
+        if len(elapsed) == 4:
+            break
+
+    assert elapsed == pytest.approx([1.0, 1.0, 1.5, 0.5])
+
+
+@pytest.mark.asyncio
+async def test_overrun_and_missed(clock: FakeClock) -> None:
+    """test overrunning ticks are counted and fully missed deadlines are skipped"""
+    scheduler = Scheduler({"gpu": 1.0}, clock=clock)
+    fired = []
+
+    async for _ in scheduler.ticks():
+        fired.append(clock.now)
+        if len(fired) == 1:
+            clock.now += 2.5  # runs past two deadlines
+        if len(fired) == 3:
+            break
+
+    assert fired == [100.0, 102.5, 103.0]
+    assert scheduler.stats["gpu"].overruns == 1
+    assert scheduler.stats["gpu"].missed == 1
+    assert scheduler.stats["gpu"].ticks == 3
+
+
+@pytest.mark.asyncio
+async def test_multiple_intervals(clock: FakeClock) -> None:
+    """test jobs with different intervals share one loop"""
+    scheduler = Scheduler({"cpu": 0.25, "net": 1.0}, clock=clock)
+    ticks = 0
+
+    async for _ in scheduler.ticks():
+        ticks += 1
+        if ticks == 9:
+            break
+
+    assert scheduler.stats["cpu"].ticks == 9
+    assert scheduler.stats["net"].ticks == 3
+
+
+@pytest.mark.asyncio
+async def test_reschedule(clock: FakeClock) -> None:
+    """test jobs added while ticking are due at the next tick, and removed jobs stop ticking"""
+    scheduler = Scheduler({"cpu": 1.0}, clock=clock)
+    fired = []
+
+    async for due in scheduler.ticks():
+        fired.append((clock.now, sorted(due)))
+        if len(fired) == 1:
+            scheduler.reschedule({"cpu": 1.0, "gpu": 0.5})
+        elif len(fired) == 3:
+            scheduler.reschedule({"gpu": 0.5})
+        elif len(fired) == 5:
+            break
+
+    assert fired == [
+        (100.0, ["cpu"]),
+        (100.0, ["gpu"]),
+        (100.5, ["gpu"]),
+        (101.0, ["gpu"]),
+        (101.5, ["gpu"]),
+    ]
+    assert scheduler.stats["gpu"].ticks == 4
@@ -0,0 +1,52 @@
+import pytest
+
+from vu1_monitor.config import settings
+from vu1_monitor.models.models import Aggregate, DialType
+from vu1_monitor.scheduler import DialPolicy, PolicyEngine
+
+
+def _policy(interval: float, priority: float) -> DialPolicy:
+    return DialPolicy(interval, 1, 0, 30.0, Aggregate.MEAN, priority)
+
+
+def test_policy_from_settings() -> None:
+    """test dial policies are read from settings, falling back to the default interval"""
+    policy = DialPolicy.from_settings(DialType.MEMORY, 2)
+    assert policy.interval == 2
+    assert policy.aggregate == Aggregate.LAST
+    assert policy.priority == settings.memory.priority
+
+
+def test_engine_within_budget() -> None:
+    """test declared intervals are kept when the dials fit the budget, or there is no budget"""
+    policies = {DialType.CPU: _policy(0.5, 3), DialType.MEMORY: _policy(1, 1)}
+    for budget in (0, 3):
+        engine = PolicyEngine(policies, budget)
+        assert engine.intervals == {DialType.CPU: 0.5, DialType.MEMORY: 1}
+        assert not engine.throttled
+
+
+def test_engine_shares_budget_by_priority() -> None:
+    """test low priority dials are slowed down first, and the budget is never exceeded"""
+    policies = {
+        DialType.CPU: _policy(0.5, 3),
+        DialType.NETWORK: _policy(0.5, 2),
+        DialType.MEMORY: _policy(0.5, 1),
+    }
+    engine = PolicyEngine(policies, 4.5)
+
+    assert engine.rate == pytest.approx(4.5)
+    assert engine.intervals[DialType.CPU] == 0.5
+    assert engine.intervals[DialType.NETWORK] > engine.intervals[DialType.CPU]
+    assert engine.intervals[DialType.MEMORY] > engine.intervals[DialType.NETWORK]
+    assert set(engine.throttled) == {DialType.NETWORK, DialType.MEMORY}
+
+
+def test_engine_redistributes_unused_budget() -> None:
+    """test budget left by slow dials goes to the dials that want more"""
+    policies = {DialType.CPU: _policy(0.25, 1), DialType.MEMORY: _policy(10, 1)}
+    engine = PolicyEngine(policies, 2)
+
+    assert engine.intervals[DialType.MEMORY] == 10
+    assert engine.rate == pytest.approx(2)
+    assert engine.intervals[DialType.CPU] == pytest.approx(1 / 1.9)
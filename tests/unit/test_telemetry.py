@@ -0,0 +1,185 @@
+import asyncio
+import re
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from vu1_monitor.dials.client import VU1Client
+from vu1_monitor.exceptions.dials import ServerNotFound
+from vu1_monitor.models import DialType
+from vu1_monitor.telemetry import Exporter, Registry
+from vu1_monitor.telemetry.instruments import HTTP_DURATION, REGISTRY, WRITES
+
+################
+### Registry ###
+################
+
+
+def test_render_counter_and_gauge() -> None:
+    """test counters and gauges render with help, type and labels"""
+    registry = Registry()
+    writes = registry.counter("writes_total", "writes", ("dial",))
+    rss = registry.gauge("rss_bytes", "rss")
+    writes.labels("CPU").inc()
+    writes.labels("CPU").inc(2)
+    rss.set(1024)
+
+    lines = registry.render().splitlines()
+    assert "# HELP writes_total writes" in lines
+    assert "# TYPE writes_total counter" in lines
+    assert 'writes_total{dial="CPU"} 3.0' in lines
+    assert "# TYPE rss_bytes gauge" in lines
+    assert "rss_bytes 1024" in lines
+
+
+def test_render_histogram() -> None:
+    """test histograms render cumulative buckets, sum and count"""
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "latency", ("dial",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.labels("GPU").observe(value)
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{dial="GPU",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{dial="GPU",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{dial="GPU",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{dial="GPU"} 6.05' in lines
+    assert 'latency_seconds_count{dial="GPU"} 4' in lines
+
+
+def test_registry_errors() -> None:
+    """test duplicate metrics and wrong label counts are rejected"""
+    registry = Registry()
+    writes = registry.counter("writes_total", "writes", ("dial",))
+    with pytest.raises(ValueError):
+        registry.counter("writes_total", "writes")
+    with pytest.raises(ValueError):
+        writes.labels("CPU", "dial")
+
+
+def test_render_escapes_labels() -> None:
+    """test backslashes, quotes and newlines in label values and help are escaped"""
+    registry = Registry()
+    writes = registry.counter("writes_total", "writes\nby dial", ("dial",))
+    writes.labels('C:\\"CPU"\n').inc()
+
+    lines = registry.render().splitlines()
+    assert "# HELP writes_total writes\\nby dial" in lines
+    assert 'writes_total{dial="C:\\\\\\"CPU\\"\\n"} 1.0' in lines
+
+
+def test_process_metrics() -> None:
+    """test the daemon's own CPU and memory usage is refreshed on render"""
+    text = REGISTRY.render()
+    assert "# TYPE process_cpu_seconds_total counter" in text.splitlines()
+    rss = next(line for line in text.splitlines() if line.startswith("process_resident_memory_bytes "))
+    assert float(rss.split()[1]) > 0
+
+
+def test_observation_overhead() -> None:
+    """test recording a metric stays within its per-observation budget"""
+    series = HTTP_DURATION.labels("CPU", "dial")
+    count = 10000
+    started = time.perf_counter()
+    for _ in range(count):
+        series.observe(0.004)
+        WRITES.labels("CPU", "dial", "sent").inc()
+    assert (time.perf_counter() - started) / count < 20e-6
+
+
+################
+### Exporter ###
+################
+
+
+def test_exporter_budget() -> None:
+    """test renders are reused until the render budget allows another"""
+    registry = Registry()
+    counter = registry.counter("ticks_total", "ticks")
+    exporter = Exporter(registry, budget=1e-9)
+
+    counter.inc()
+    first = exporter.render()
+    counter.inc()
+    assert exporter.render() == first
+
+    exporter = Exporter(registry, budget=1.0)
+    exporter.render()
+    counter.inc()
+    time.sleep(0.01)
+    assert "ticks_total 3.0" in exporter.render()
+
+
+def test_exporter_textfile(tmp_path: Path) -> None:
+    """test metrics are written for the textfile collector"""
+    registry = Registry()
+    registry.counter("ticks_total", "ticks").inc()
+    path = tmp_path / "textfile" / "vu1_monitor.prom"
+
+    Exporter(registry).write_textfile(path)
+    assert "ticks_total 1.0" in path.read_text()
+    assert [file.name for file in path.parent.iterdir()] == ["vu1_monitor.prom"]
+
+
+@pytest.mark.asyncio
+async def test_exporter_http() -> None:
+    """test metrics are served at /metrics"""
+    registry = Registry()
+    registry.counter("ticks_total", "ticks").inc()
+    server = await Exporter(registry).serve("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def get(target: str) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async with server:
+        metrics = await get("/metrics")
+        missing = await get("/")
+
+    assert metrics.startswith(b"HTTP/1.1 200 OK")
+    assert b"ticks_total 1.0" in metrics
+    assert missing.startswith(b"HTTP/1.1 404")
+
+
+##############################
+### Client instrumentation ###
+##############################
+
+
+@pytest.mark.asyncio
+async def test_client_instrumented(httpx_mock: HTTPXMock, dial_body: dict, value_body: dict) -> None:
+    """test dial writes record latency and sent & suppressed counts"""
+    httpx_mock.add_response(url=re.compile(r".*/dial/list.*"), json=dial_body)
+    httpx_mock.add_response(url=re.compile(r".*/set.*"), json=value_body)
+    client = await VU1Client("test", 5430, "test").__aenter__()
+    latency = HTTP_DURATION.labels(DialType.CPU.value, "dial")
+    sent = WRITES.labels(DialType.CPU.value, "dial", "sent")
+    suppressed = WRITES.labels(DialType.CPU.value, "dial", "suppressed")
+    before = (latency.count, sent.value, suppressed.value)
+
+    await client.set_dial(DialType.CPU, 50)
+    await client.set_dial(DialType.CPU, 50)
+
+    assert (latency.count, sent.value, suppressed.value) == (before[0] + 1, before[1] + 1, before[2] + 1)
+
+
+@pytest.mark.asyncio
+async def test_client_failure_latency(httpx_mock: HTTPXMock, dial_body: dict) -> None:
+    """test failed requests are observed in the latency histogram"""
+    httpx_mock.add_response(url=re.compile(r".*/dial/list.*"), json=dial_body)
+    httpx_mock.add_exception(httpx.ConnectError("test"), url=re.compile(r".*/set.*"))
+    client = await VU1Client("test", 5430, "test").__aenter__()
+    latency = HTTP_DURATION.labels(DialType.CPU.value, "dial")
+    before = latency.count
+
+    with pytest.raises(ServerNotFound):
+        await client.set_dial(DialType.CPU, 50)
+
+    assert latency.count == before + 1